@@ -3,6 +3,7 @@ Serializers for accounts app.
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from bug_tracking.values import ValuesSerializer
 
 User = get_user_model()
 
@@ -17,6 +18,13 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
+class UserValuesSerializer(ValuesSerializer):
+    """
+    Read-only UserSerializer output built from values rows.
+    """
+    serializer_class = UserSerializer
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration.
@@ -0,0 +1,82 @@
+"""
+Building and writing activity feed entries.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from .models import Activity
+
+# Longer text values are cut to this many characters in stored diffs.
+VALUE_MAX_LENGTH = 200
+
+_deferred = contextvars.ContextVar('deferred_activity', default=None)
+
+
+def compact(value):
+    if isinstance(value, str) and len(value) > VALUE_MAX_LENGTH:
+        return value[:VALUE_MAX_LENGTH] + '…'
+    return value
+
+
+def field_changes(model, changes):
+    """
+    Turn {attname: (old, new)} into the stored {field name: [old, new]} form.
+    """
+    return {
+        model._meta.get_field(attname).name: [compact(old), compact(new)]
+        for attname, (old, new) in changes.items()
+    }
+
+
+def tracked_changes(instance, attnames):
+    """
+    Return {attname: (old, new)} for tracked fields changed since load.
+    """
+    changes = {}
+    for attname in attnames:
+        old, new = instance.get_loaded_value(attname), getattr(instance, attname)
+        if old != new:
+            changes[attname] = (old, new)
+    return changes
+
+
+def entry(project_id, target_type, target_id, action, changes=None, issue_id=None):
+    return Activity(
+        project_id=project_id, target_type=target_type, target_id=target_id,
+        issue_id=issue_id, action=action, changes=changes or {},
+    )
+
+
+def record(entries):
+    """
+    Write entries with one INSERT, or hold them while ``deferred()`` is active.
+    """
+    entries = [item for item in entries if item.project_id is not None]
+    if not entries:
+        return
+    pending = _deferred.get()
+    if pending is not None:
+        pending.extend(entries)
+        return
+    Activity.objects.bulk_create(entries)
+
+
+@contextmanager
+def deferred():
+    """
+    Collect entries recorded inside the block and write them with one INSERT at exit.
+
+    Used around bulk operations that send per-row signals, such as
+    ``QuerySet.delete()``.
+    """
+    if _deferred.get() is not None:
+        yield
+        return
+    pending = []
+    token = _deferred.set(pending)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+    if pending:
+        Activity.objects.bulk_create(pending)
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0004_project_issue_stat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Activity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_type', models.CharField(choices=[('project', 'Project'), ('issue', 'Issue'), ('comment', 'Comment')], max_length=10)),
+                ('target_id', models.PositiveBigIntegerField()),
+                ('issue_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=10)),
+                ('changes', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['project', 'id'], name='activity_ac_project_67f264_idx')],
+            },
+        ),
+    ]
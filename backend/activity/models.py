@@ -0,0 +1,42 @@
+"""
+Models for activity app.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class Activity(models.Model):
+    """
+    One append-only entry of a project's activity feed.
+
+    ``changes`` maps field names to ``[old, new]`` pairs, with long text
+    shortened. Targets and issues are plain ids so entries outlive them.
+    """
+    TARGET_CHOICES = [
+        ('project', 'Project'),
+        ('issue', 'Issue'),
+        ('comment', 'Comment'),
+    ]
+
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='activity')
+    target_type = models.CharField(max_length=10, choices=TARGET_CHOICES)
+    target_id = models.PositiveBigIntegerField()
+    issue_id = models.PositiveBigIntegerField(null=True, blank=True)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changes = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['project', 'id']),
+        ]
+
+    def __str__(self):
+        return f'{self.target_type} {self.target_id} {self.action}'
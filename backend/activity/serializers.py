@@ -0,0 +1,15 @@
+"""
+Serializers for activity app.
+"""
+from rest_framework import serializers
+from .models import Activity
+
+
+class ActivitySerializer(serializers.ModelSerializer):
+    """
+    Serializer for activity feed entries.
+    """
+
+    class Meta:
+        model = Activity
+        fields = ('id', 'target_type', 'target_id', 'issue_id', 'action', 'changes', 'created_at')
@@ -0,0 +1,124 @@
+"""
+Signal handlers recording project, issue and comment changes in the activity feed.
+"""
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from comments.models import Comment
+from issues.models import Issue
+from issues.signals import issues_bulk_written
+from projects.models import Project
+from .log import compact, entry, field_changes, record, tracked_changes
+
+# Fields summarized in the entry for a new issue.
+ISSUE_CREATED_FIELDS = ('title', 'status', 'priority', 'assignee_id')
+
+
+def _created_changes(instance, attnames):
+    return field_changes(type(instance), {
+        attname: (None, getattr(instance, attname))
+        for attname in attnames if getattr(instance, attname) not in (None, '')
+    })
+
+
+def _issue_entries(issue, changes):
+    """
+    Entries for an issue update; a move between projects is logged in both.
+    """
+    stored = field_changes(Issue, changes)
+    project_ids = [issue.project_id]
+    if 'project_id' in changes:
+        project_ids.insert(0, changes['project_id'][0])
+    return [entry(project_id, 'issue', issue.pk, 'updated', stored, issue_id=issue.pk) for project_id in project_ids]
+
+
+def _comment_project_id(comment):
+    if Comment.issue.is_cached(comment):
+        return comment.issue.project_id
+    return Issue.objects.filter(pk=comment.issue_id).values_list('project_id', flat=True).first()
+
+
+@receiver(post_save, sender=Project)
+def project_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        record([entry(instance.pk, 'project', instance.pk, 'created', _created_changes(instance, ('name',)))])
+        return
+    changes = tracked_changes(instance, Project.TRACKED_FIELDS)
+    if changes:
+        record([entry(instance.pk, 'project', instance.pk, 'updated', field_changes(Project, changes))])
+
+
+@receiver(post_save, sender=Issue)
+def issue_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        changes = _created_changes(instance, ISSUE_CREATED_FIELDS)
+        record([entry(instance.project_id, 'issue', instance.pk, 'created', changes, issue_id=instance.pk)])
+        return
+    changes = tracked_changes(instance, Issue.TRACKED_FIELDS)
+    if changes:
+        record(_issue_entries(instance, changes))
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted_activity(sender, instance, origin=None, **kwargs):
+    """
+    Log deleted issues, unless the whole project (and its feed) is being deleted.
+    """
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if origin is Project or isinstance(origin, Project) and origin.pk == instance.project_id:
+        return
+    changes = {'title': [compact(instance.title), None]}
+    record([entry(instance.project_id, 'issue', instance.pk, 'deleted', changes, issue_id=instance.pk)])
+
+
+@receiver(issues_bulk_written)
+def issues_bulk_activity(sender, created, updated, **kwargs):
+    """
+    Log a batch of issue writes with one INSERT.
+    """
+    entries = [
+        entry(issue.project_id, 'issue', issue.pk, 'created', _created_changes(issue, ISSUE_CREATED_FIELDS),
+              issue_id=issue.pk)
+        for issue in created
+    ]
+    for issue, changes in updated:
+        if changes:
+            entries.extend(_issue_entries(issue, changes))
+    record(entries)
+
+
+@receiver(post_save, sender=Comment)
+def comment_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        changes = _created_changes(instance, ('content',))
+        action = 'created'
+    else:
+        changes = field_changes(Comment, tracked_changes(instance, Comment.TRACKED_FIELDS))
+        action = 'updated'
+        if not changes:
+            return
+    record([
+        entry(_comment_project_id(instance), 'comment', instance.pk, action, changes, issue_id=instance.issue_id)
+    ])
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted_activity(sender, instance, origin=None, **kwargs):
+    """
+    Log deleted comments, unless their issue or project is being deleted too.
+    """
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if isinstance(origin, (Issue, Project)) or origin in (Issue, Project):
+        return
+    changes = {'content': [compact(instance.content), None]}
+    record([
+        entry(_comment_project_id(instance), 'comment', instance.pk, 'deleted', changes, issue_id=instance.issue_id)
+    ])
@@ -0,0 +1,108 @@
+"""
+Tests for activity app.
+"""
+import pytest
+from rest_framework import status
+from comments.models import Comment
+from issues.models import Issue
+from projects.models import Project
+from .models import Activity
+
+
+@pytest.mark.django_db
+class TestActivityFeed:
+    """
+    Test activity recording and the keyset-paged project feed.
+    """
+
+    def feed(self, api_client, project):
+        response = api_client.get(f'/api/projects/{project.id}/activity/?page_size=100')
+        assert response.status_code == status.HTTP_200_OK
+        return [(row['target_type'], row['action'], row['changes']) for row in response.data['results']]
+
+    def test_changes_are_recorded_with_field_diffs(self, authenticated_client, another_user):
+        """
+        Test project, issue and comment writes through the API, newest first.
+        """
+        api_client, user = authenticated_client
+        project = Project.objects.get(pk=api_client.post('/api/projects/', {'name': 'Feed', 'description': 'Desc'}).data['id'])
+        issue_id = api_client.post('/api/issues/', {
+            'title': 'Crash', 'description': 'x' * 500, 'project': project.id,
+        }).data['id']
+        api_client.patch(f'/api/issues/{issue_id}/update_status/', {'status': 'in_progress'}, format='json')
+        api_client.patch(f'/api/issues/{issue_id}/assign/', {'assignee_id': another_user.id}, format='json')
+        api_client.patch(f'/api/issues/{issue_id}/', {'description': 'y' * 500}, format='json')
+        api_client.patch(f'/api/issues/{issue_id}/', {'title': 'Crash'}, format='json')
+        comment_id = api_client.post('/api/comments/', {'content': 'Seen', 'issue': issue_id}).data['id']
+        api_client.patch(f'/api/projects/{project.id}/', {'name': 'Renamed'}, format='json')
+        api_client.delete(f'/api/comments/{comment_id}/')
+        api_client.delete(f'/api/issues/{issue_id}/')
+
+        assert self.feed(api_client, project) == [
+            ('issue', 'deleted', {'title': ['Crash', None]}),
+            ('comment', 'deleted', {'content': ['Seen', None]}),
+            ('project', 'updated', {'name': ['Feed', 'Renamed']}),
+            ('comment', 'created', {'content': [None, 'Seen']}),
+            ('issue', 'updated', {'description': ['x' * 200 + '…', 'y' * 200 + '…']}),
+            ('issue', 'updated', {'assignee': [None, another_user.id]}),
+            ('issue', 'updated', {'status': ['open', 'in_progress']}),
+            ('issue', 'created', {'title': [None, 'Crash'], 'status': [None, 'open'], 'priority': [None, 'medium']}),
+            ('project', 'created', {'name': [None, 'Feed']}),
+        ]
+        assert Activity.objects.filter(target_type='comment').values_list('issue_id', flat=True).distinct().get() == issue_id
+
+    def test_moves_are_logged_in_both_projects(self, authenticated_client, project, user):
+        """
+        Test that moving an issue shows up in the old and the new project's feed.
+        """
+        api_client, _ = authenticated_client
+        other = Project.objects.create(name='Other', description='', created_by=user)
+        issue = Issue.objects.create(title='Mover', description='', project=project, reporter=user)
+        api_client.patch(f'/api/issues/{issue.id}/', {'project': other.id}, format='json')
+        moved = ('issue', 'updated', {'project': [project.id, other.id]})
+        assert self.feed(api_client, project)[0] == moved
+        assert self.feed(api_client, other)[0] == moved
+
+    def test_bulk_writes_insert_once(self, authenticated_client, project, user):
+        """
+        Test that a bulk request writes its whole activity with one INSERT per kind of work.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        api_client, _ = authenticated_client
+        targets = [Issue.objects.create(title=f'Issue {index}', description='', project=project, reporter=user)
+                   for index in range(6)]
+        Comment.objects.create(content='On a deleted issue', issue=targets[5], author=user)
+        before = Activity.objects.count()
+        payload = {
+            'create': [{'title': f'New {index}', 'description': 'Desc', 'project': project.id} for index in range(5)],
+            'status': [{'id': issue.id, 'status': 'closed'} for issue in targets[:3]],
+            'delete': [issue.id for issue in targets[3:]],
+        }
+        with CaptureQueriesContext(connection) as captured:
+            response = api_client.post('/api/issues/bulk/', payload, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        inserts = [query for query in captured if query['sql'].startswith('INSERT INTO "activity_activity"')]
+        assert len(inserts) == 2
+        assert Activity.objects.count() - before == 5 + 3 + 3
+        assert not Activity.objects.filter(target_type='comment', action='deleted').exists()
+
+    def test_feed_keyset_pages(self, authenticated_client, project, user):
+        """
+        Test next/previous cursors walk the feed without gaps or repeats.
+        """
+        api_client, _ = authenticated_client
+        for index in range(5):
+            Issue.objects.create(title=f'Issue {index}', description='', project=project, reporter=user)
+        expected = list(Activity.objects.filter(project=project).order_by('-id').values_list('id', flat=True))
+
+        seen, url = [], f'/api/projects/{project.id}/activity/?page_size=2'
+        while url:
+            response = api_client.get(url)
+            seen.extend(row['id'] for row in response.data['results'])
+            previous, url = response.data['previous'], response.data['next']
+        assert seen == expected
+        assert [row['id'] for row in api_client.get(previous).data['results']] == expected[2:4]
+
+        response = api_client.get(f'/api/projects/{project.id}/activity/?cursor=bogus')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,16 @@
+"""
+ASGI config for bug_tracking project.
+
+Run with an ASGI server, e.g. ``uvicorn bug_tracking.asgi:application``.
+"""
+
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bug_tracking.settings')
+django.setup(set_prefix=False)
+
+from bug_tracking.asyncviews import AsyncReadASGIHandler  # noqa: E402
+
+application = AsyncReadASGIHandler()
@@ -0,0 +1,9 @@
+"""
+URL configuration for the ASGI entry point.
+
+The routes of ``bug_tracking.urls``, with viewset reads served by async views.
+"""
+from .asyncviews import async_read_patterns
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = async_read_patterns(sync_urlpatterns)
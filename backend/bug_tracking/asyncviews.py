@@ -0,0 +1,172 @@
+"""
+Async views for the hot read endpoints, served by the ASGI entry point.
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.urls import URLPattern, URLResolver
+from django.utils.decorators import classonlymethod
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+ASYNC_ACTIONS = {'list': 'alist', 'retrieve': 'aretrieve'}
+
+
+async def jwt_authenticate(authenticator, request):
+    """
+    Async version of ``JWTAuthentication.authenticate()``.
+
+    Token validation is CPU-only; the user is loaded with the async ORM.
+    """
+    header = authenticator.get_header(request)
+    if header is None:
+        return None
+    raw_token = authenticator.get_raw_token(header)
+    if raw_token is None:
+        return None
+    validated_token = authenticator.get_validated_token(raw_token)
+    try:
+        user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise exceptions.AuthenticationFailed(_('Token contained no recognizable user identification'))
+    user_model = authenticator.user_model
+    try:
+        user = await user_model.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+    except user_model.DoesNotExist:
+        raise exceptions.AuthenticationFailed(_('User not found'), code='user_not_found')
+    if not user.is_active:
+        raise exceptions.AuthenticationFailed(_('User is inactive'), code='user_inactive')
+    return user, validated_token
+
+
+async def aauthenticate(request):
+    """
+    Async version of ``Request._authenticate()``: set request.user and request.auth.
+
+    JWT authenticators run on the async ORM; any other authenticator runs
+    in the request's worker thread.
+    """
+    for authenticator in request.authenticators:
+        try:
+            if type(authenticator) is JWTAuthentication:
+                user_auth_tuple = await jwt_authenticate(authenticator, request)
+            else:
+                user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+        except exceptions.APIException:
+            request._not_authenticated()
+            raise
+        if user_auth_tuple is not None:
+            request._authenticator = authenticator
+            request.user, request.auth = user_auth_tuple
+            return
+    request._not_authenticated()
+
+
+class AsyncReadView:
+    """
+    Serve a viewset's ``list`` / ``retrieve`` on the async ORM, everything else as before.
+
+    ``AsyncReadView.as_view(IssueViewSet, {'get': 'list', 'post': 'create'})``
+    returns a coroutine view for the same URL as the router's. GET requests
+    the viewset can answer asynchronously (``supports_async_read()``: no
+    ``?stream=1``, no object-level permission on retrieve, and not the
+    browsable API) run ``alist`` / ``aretrieve`` on the event loop, so a
+    request waiting on the database no longer holds a worker thread. Every
+    other request is handed to the regular sync view in a worker thread.
+    """
+
+    def __init__(self, viewset_class, actions, initkwargs):
+        self.viewset_class = viewset_class
+        self.actions = actions
+        self.initkwargs = initkwargs
+        self.sync_view = viewset_class.as_view(dict(actions), **initkwargs)
+
+    @classonlymethod
+    def as_view(cls, viewset_class, actions, **initkwargs):
+        handler = cls(viewset_class, actions, initkwargs)
+
+        async def view(request, *args, **kwargs):
+            return await handler.dispatch(request, *args, **kwargs)
+
+        view.cls = viewset_class
+        view.initkwargs = initkwargs
+        view.actions = actions
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        viewset = self.async_viewset(request, args, kwargs)
+        if viewset is None:
+            return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+        request = viewset.request
+        try:
+            await aauthenticate(request)
+            viewset.check_permissions(request)
+            response = await getattr(viewset, ASYNC_ACTIONS[viewset.action])(request, *args, **kwargs)
+        except Exception as exc:
+            response = viewset.handle_exception(exc)
+        viewset.response = viewset.finalize_response(request, response, *args, **kwargs)
+        return viewset.response
+
+    def async_viewset(self, request, args, kwargs):
+        """
+        Return a viewset ready to run its async read, or None to use the sync view.
+
+        Mirrors ``ViewSetMixin.as_view()`` and ``APIView.initial()`` up to
+        authentication; anything that fails here is left for the sync view
+        to report the usual way.
+        """
+        action = self.actions.get(request.method.lower())
+        if request.method != 'GET' or action not in ASYNC_ACTIONS:
+            return None
+        viewset = self.viewset_class(**self.initkwargs)
+        viewset.action_map = self.actions
+        viewset.args, viewset.kwargs = args, kwargs
+        try:
+            viewset.request = request = viewset.initialize_request(request, *args, **kwargs)
+            viewset.headers = viewset.default_response_headers
+            viewset.format_kwarg = viewset.get_format_suffix(**kwargs)
+            request.accepted_renderer, request.accepted_media_type = viewset.perform_content_negotiation(request)
+            request.version, request.versioning_scheme = viewset.determine_version(request, *args, **kwargs)
+            if isinstance(request.accepted_renderer, BrowsableAPIRenderer) or viewset.get_throttles():
+                return None
+            if not viewset.supports_async_read():
+                return None
+        except Exception:
+            return None
+        return viewset
+
+
+def async_read_patterns(patterns):
+    """
+    Return a copy of patterns with viewset routes that have ``alist`` served by AsyncReadView.
+    """
+    rewritten = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            pattern = URLResolver(
+                pattern.pattern, async_read_patterns(pattern.url_patterns), pattern.default_kwargs,
+                pattern.app_name, pattern.namespace,
+            )
+        else:
+            viewset_class = getattr(pattern.callback, 'cls', None)
+            actions = getattr(pattern.callback, 'actions', None) or {}
+            if hasattr(viewset_class, 'alist') and set(actions.values()) & set(ASYNC_ACTIONS):
+                callback = AsyncReadView.as_view(viewset_class, actions, **pattern.callback.initkwargs)
+                pattern = URLPattern(pattern.pattern, callback, pattern.default_args, pattern.name)
+        rewritten.append(pattern)
+    return rewritten
+
+
+class AsyncReadASGIHandler(ASGIHandler):
+    """
+    ASGI handler resolving requests against ``urlconf`` instead of ``ROOT_URLCONF``.
+    """
+    urlconf = 'bug_tracking.asgi_urls'
+
+    async def get_response_async(self, request):
+        request.urlconf = self.urlconf
+        return await super().get_response_async(request)
@@ -0,0 +1,125 @@
+"""
+Batch endpoint that runs many API sub-requests in one round trip.
+"""
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
+from django.test.client import RequestFactory
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+ALLOWED_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+FORWARDED_HEADERS = ('Content-Type', 'Location', 'ETag', 'Last-Modified', 'Allow')
+# Sub-requests run synchronously, so they resolve against the sync views even
+# when the batch itself arrives through the ASGI URL configuration.
+SUB_REQUEST_URLCONF = 'bug_tracking.urls'
+
+
+class BatchView(APIView):
+    """
+    Run a list of sub-requests through the API's own views in one request.
+
+    Body: ``{"requests": [{"id": .., "method": "GET", "path": "/api/issues/1/",
+    "body": {...}}], "atomic": false}``. Sub-requests are dispatched to the
+    resolved view functions directly, skipping HTTP and middleware, and reuse
+    the batch's authenticated user instead of re-authenticating. With
+    ``atomic`` every sub-request runs in one transaction that is rolled back
+    if any of them fails.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        entries = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return Response({'error': 'requests must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(entries) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {'error': f'At most {settings.BATCH_MAX_REQUESTS} requests per batch.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        atomic = request.data.get('atomic', False) is True
+
+        if not atomic:
+            return Response({'responses': [self.run(request, entry) for entry in entries]})
+
+        responses = []
+        with transaction.atomic():
+            for entry in entries:
+                result = self.run(request, entry)
+                responses.append(result)
+                if result['status'] >= 400:
+                    transaction.set_rollback(True)
+                    break
+        rolled_back = bool(responses) and responses[-1]['status'] >= 400
+        return Response({'responses': responses, 'rolled_back': rolled_back})
+
+    def run(self, request, entry):
+        """
+        Execute one sub-request and return its status, headers and body.
+        """
+        if not isinstance(entry, dict):
+            return self.failure(None, status.HTTP_400_BAD_REQUEST, 'Each request must be an object.')
+        entry_id = entry.get('id')
+        method = str(entry.get('method', 'GET')).upper()
+        path = entry.get('path')
+        if method not in ALLOWED_METHODS:
+            return self.failure(entry_id, status.HTTP_405_METHOD_NOT_ALLOWED, f'Method {method} is not allowed.')
+        if not isinstance(path, str) or not path.startswith('/api/') or path.startswith(request.path):
+            return self.failure(entry_id, status.HTTP_400_BAD_REQUEST, 'path must be an API path other than the batch endpoint.')
+
+        try:
+            match = resolve(path.split('?', 1)[0], urlconf=SUB_REQUEST_URLCONF)
+        except (Resolver404, Http404):
+            return self.failure(entry_id, status.HTTP_404_NOT_FOUND, 'The requested resource was not found.')
+
+        sub_request = self.build_request(request, method, path, entry.get('body'))
+        response = match.func(sub_request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return {
+            'id': entry_id,
+            'status': response.status_code,
+            'headers': {name: response[name] for name in FORWARDED_HEADERS if response.has_header(name)},
+            'body': self.decode_body(response),
+        }
+
+    def build_request(self, request, method, path, body):
+        """
+        Build an in-process request that carries the batch's authentication.
+        """
+        headers = {
+            key: value for key, value in request.META.items()
+            if key.startswith('HTTP_') or key in ('REMOTE_ADDR', 'SERVER_NAME', 'SERVER_PORT', 'wsgi.url_scheme')
+        }
+        # Bodies are collected as data and rendered once in the batch's own format.
+        headers['HTTP_ACCEPT'] = 'application/json'
+        factory = RequestFactory(**headers)
+        if method == 'GET' or body is None:
+            sub_request = factory.generic(method, path, **headers)
+        else:
+            sub_request = factory.generic(
+                method, path, json.dumps(body), content_type='application/json', **headers
+            )
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+        sub_request.user = request.user
+        return sub_request
+
+    def decode_body(self, response):
+        if getattr(response, 'streaming', False):
+            content = b''.join(response.streaming_content)
+        else:
+            content = response.content
+        if not content:
+            return None
+        if response.get('Content-Type', '').startswith('application/json'):
+            return json.loads(content)
+        return content.decode(response.charset or 'utf-8', errors='replace')
+
+    def failure(self, entry_id, status_code, message):
+        return {'id': entry_id, 'status': status_code, 'headers': {}, 'body': {'error': message}}
@@ -0,0 +1,233 @@
+"""
+Negotiated response compression (zstd, gzip, deflate).
+"""
+import gzip
+import hashlib
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from caching.store import get_cache
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bodies of these types are already compressed or must reach the client unbuffered.
+SKIPPED_CONTENT_TYPES = ('image/', 'video/', 'audio/', 'application/zip', 'application/gzip', 'text/event-stream')
+
+# Suffix of the entity tag a coded copy of a representation is sent with.
+_CODING_SUFFIX = re.compile(r'-(?:zstd|gzip|deflate)"')
+
+
+class ZlibStream:
+    """
+    Incremental zlib compressor; wbits selects the gzip (31) or zlib/deflate (15) container.
+    """
+
+    def __init__(self, level, wbits):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data):
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush(zlib.Z_FINISH)
+
+
+class ZstdStream:
+    """
+    Incremental zstd compressor flushing a block per chunk.
+    """
+
+    def __init__(self, level):
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self.compressor.compress(data) + self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+CODECS = {
+    'gzip': (lambda body, level: gzip.compress(body, level, mtime=0), lambda level: ZlibStream(level, 31)),
+    'deflate': (lambda body, level: zlib.compress(body, level), lambda level: ZlibStream(level, 15)),
+}
+if zstandard is not None:
+    CODECS['zstd'] = (lambda body, level: zstandard.ZstdCompressor(level=level).compress(body), ZstdStream)
+
+
+def parse_accept_encoding(header):
+    """
+    Return {coding: q} from an Accept-Encoding header; malformed q-values count as 0.
+    """
+    qualities = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.lower().startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def choose_encoding(header, encodings):
+    """
+    Return the acceptable coding from encodings (server preference order) with the highest q, or None.
+    """
+    qualities = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for coding in encodings:
+        quality = qualities.get(coding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def coding_etag(etag, encoding):
+    """
+    Return the strong tag of a representation's coded copy: ``"abc"`` becomes ``"abc-gzip"``.
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def strip_coding_suffixes(header):
+    """
+    Map the coded-copy tags in an If-Match / If-None-Match header back to the representation's tags.
+    """
+    return _CODING_SUFFIX.sub('"', header)
+
+
+def compress_body(body, encoding, level):
+    return CODECS[encoding][0](body, level)
+
+
+def compress_stream(chunks, encoding, level):
+    stream = CODECS[encoding][1](level)
+    for chunk in chunks:
+        if chunk:
+            yield stream.compress(chunk)
+    yield stream.finish()
+
+
+async def acompress_stream(chunks, encoding, level):
+    """
+    Async version of compress_stream() for async streaming responses.
+    """
+    stream = CODECS[encoding][1](level)
+    async for chunk in chunks:
+        if chunk:
+            yield stream.compress(chunk)
+    yield stream.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with the best coding the client accepts.
+
+    Codings are tried in ``COMPRESSION_ENCODINGS`` order (zstd only when
+    ``zstandard`` is installed) at ``COMPRESSION_LEVELS``. Bodies under
+    ``COMPRESSION_MIN_SIZE`` bytes are sent as is; streaming responses are
+    compressed chunk by chunk with a flush after each, so clients still get
+    rows as they are produced. ``COMPRESSION_ROUTES`` overrides ``min_size``,
+    ``levels`` and ``encodings`` per URL name. Responses from the response
+    cache keep their compressed body next to the cached data, so repeated
+    hits skip recompression.
+
+    A coded body keeps a strong ETag with the coding appended (``"abc-gzip"``),
+    so it stays usable in ``If-Match``; ConditionalRequestMixin strips the
+    suffix before comparing.
+    """
+
+    def route_options(self, request):
+        """
+        Return (min_size, levels, encodings) for the resolved route.
+        """
+        match = getattr(request, 'resolver_match', None)
+        override = settings.COMPRESSION_ROUTES.get(match.url_name, {}) if match else {}
+        levels = {**settings.COMPRESSION_LEVELS, **override.get('levels', {})}
+        encodings = [
+            coding for coding in override.get('encodings', settings.COMPRESSION_ENCODINGS) if coding in CODECS
+        ]
+        return override.get('min_size', settings.COMPRESSION_MIN_SIZE), levels, encodings
+
+    def process_response(self, request, response):
+        if not settings.COMPRESSION_ENABLED or response.has_header('Content-Encoding'):
+            return response
+        if response.status_code == 304:
+            return self.not_modified(request, response)
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return response
+        if response.get('Content-Type', '').startswith(SKIPPED_CONTENT_TYPES):
+            return response
+        min_size, levels, encodings = self.route_options(request)
+        if not encodings:
+            return response
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), encodings)
+        if encoding is None:
+            return response
+        level = levels[encoding]
+
+        if response.streaming:
+            compress = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = compress(response.streaming_content, encoding, level)
+            del response.headers['Content-Length']
+        else:
+            compressed = self.compressed_content(response, encoding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # The compressed body is not byte-identical to the one the tag describes.
+            response.headers['ETag'] = coding_etag(etag, encoding)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def not_modified(self, request, response):
+        """
+        Give a 304 the coded-copy tag the client validated with, as its 200 carried.
+        """
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+            for encoding in CODECS:
+                if coding_etag(etag, encoding) in if_none_match:
+                    response.headers['ETag'] = coding_etag(etag, encoding)
+                    break
+        return response
+
+    def compressed_content(self, response, encoding, level):
+        """
+        Compress response.content, reusing the copy stored for a cached response.
+        """
+        key = getattr(response, 'response_cache_key', None)
+        if key is None or response.get('Content-Type', '').startswith('text/html'):
+            return compress_body(response.content, encoding, level)
+
+        # Keyed by body digest as well, so a copy is never served for different bytes.
+        digest = hashlib.sha1(response.content).hexdigest()
+        compressed_key = f'{key}:{encoding}:{level}:{digest}'
+        cache = get_cache()
+        compressed = cache.get(compressed_key)
+        if compressed is None:
+            compressed = compress_body(response.content, encoding, level)
+            cache.set(compressed_key, compressed, settings.RESPONSE_CACHE_TTL)
+        return compressed
@@ -0,0 +1,403 @@
+"""
+Custom pagination classes for the API.
+"""
+import base64
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """
+    Paginator whose count is exact for small result sets and estimated above.
+
+    The exact check is a bounded ``COUNT(*)`` over at most ``threshold + 1``
+    rows. Above the threshold the count comes from planner statistics on
+    PostgreSQL, or from a cached full count (keyed by the filtered SQL and
+    expiring after ``cache_ttl`` seconds) on other backends.
+    """
+    cache_key_prefix = 'estimated-count'
+
+    def __init__(self, *args, threshold=None, cache_ttl=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threshold = settings.PAGINATION_EXACT_COUNT_THRESHOLD if threshold is None else threshold
+        self.cache_ttl = settings.PAGINATION_COUNT_CACHE_TTL if cache_ttl is None else cache_ttl
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        bounded = queryset[:self.threshold + 1].count()
+        if bounded <= self.threshold:
+            self.count_is_exact = True
+            return bounded
+        self.count_is_exact = False
+        if connections[queryset.db].vendor == 'postgresql':
+            return max(self.planner_estimate(queryset), bounded)
+        return self.cached_count(queryset)
+
+    async def acount(self):
+        """
+        Async version of ``count``; the planner estimate runs in a worker thread.
+        """
+        queryset = self.object_list.order_by()
+        bounded = await queryset[:self.threshold + 1].acount()
+        if bounded <= self.threshold:
+            self.count_is_exact = True
+            return bounded
+        self.count_is_exact = False
+        if connections[queryset.db].vendor == 'postgresql':
+            return max(await sync_to_async(self.planner_estimate)(queryset), bounded)
+        key = self.count_cache_key(queryset)
+        count = await cache.aget(key)
+        if count is None:
+            count = await queryset.acount()
+            await cache.aset(key, count, self.cache_ttl)
+        return count
+
+    def planner_estimate(self, queryset):
+        """
+        Read the planner's row estimate from ``EXPLAIN (FORMAT JSON)``.
+        """
+        sql, params = queryset.query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def cached_count(self, queryset):
+        """
+        Return a full count, cached per filter combination for ``cache_ttl`` seconds.
+        """
+        key = self.count_cache_key(queryset)
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.cache_ttl)
+        return count
+
+    def count_cache_key(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.sha1(f'{queryset.db}|{sql}|{params!r}'.encode('utf-8')).hexdigest()
+        return f'{self.cache_key_prefix}:{digest}'
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Opt-in page-number pagination that avoids full COUNT(*) on large tables.
+
+    Responses carry ``count_is_exact`` so clients can render "about N".
+    """
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_is_exact': self.page.paginator.count_is_exact,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_exact'] = {'type': 'boolean'}
+        return response_schema
+
+
+def supports_async_pagination(pagination):
+    """
+    Return whether apaginate_queryset() can page with pagination.
+    """
+    if pagination is None or hasattr(pagination, 'apaginate_queryset'):
+        return True
+    return isinstance(pagination, PageNumberPagination)
+
+
+async def apaginate_queryset(pagination, queryset, request, view=None):
+    """
+    Async version of ``pagination.paginate_queryset()`` reading with the async ORM.
+
+    Paginators with their own ``apaginate_queryset`` are delegated to; DRF's
+    page-number pagination is handled here by counting ahead of
+    ``Paginator.page()``, whose slice is then read asynchronously.
+    """
+    if pagination is None:
+        return None
+    if hasattr(pagination, 'apaginate_queryset'):
+        return await pagination.apaginate_queryset(queryset, request, view=view)
+
+    page_size = pagination.get_page_size(request)
+    if not page_size:
+        return None
+    paginator = pagination.django_paginator_class(queryset, page_size)
+    if hasattr(paginator, 'acount'):
+        paginator.count = await paginator.acount()
+    else:
+        paginator.count = await queryset.acount()
+    page_number = pagination.get_page_number(request, paginator)
+    try:
+        pagination.page = paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(pagination.invalid_page_message.format(page_number=page_number, message=str(exc)))
+    pagination.page.object_list = [row async for row in pagination.page.object_list]
+    if paginator.num_pages > 1 and pagination.template is not None:
+        pagination.display_page_controls = True
+    pagination.request = request
+    return list(pagination.page)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    Requests carrying a ``cursor`` query parameter (an empty value means the
+    first page) are paged with ``WHERE (created_at, id) < (...)`` against the
+    composite indexes, so every page costs the same no matter how deep it is
+    and concurrent writes never shift rows between pages. Requests without a
+    cursor fall back to ``fallback_class`` so existing clients keep working.
+    Rows may be model instances or named ``values_list`` rows with
+    ``created_at`` and ``id``.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor.'
+    fallback_class = PageNumberPagination
+
+    def __init__(self):
+        self.fallback = None
+
+    def is_requested(self, request):
+        """
+        Return whether the client asked for keyset pagination.
+        """
+        return self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if not self.is_requested(request):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view=view)
+
+        position, reverse, queryset = self.start_page(queryset, request)
+        return self.finish_page(list(queryset[:self.page_size + 1]), position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async version of paginate_queryset().
+        """
+        self.request = request
+        if not self.is_requested(request):
+            self.fallback = self.fallback_class()
+            return await apaginate_queryset(self.fallback, queryset, request, view=view)
+
+        position, reverse, queryset = self.start_page(queryset, request)
+        return self.finish_page([row async for row in queryset[:self.page_size + 1]], position, reverse)
+
+    def start_page(self, queryset, request):
+        """
+        Return (position, reverse, queryset ordered and seeked past position).
+        """
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+        return position, reverse, self.seek(queryset, position, reverse)
+
+    def finish_page(self, rows, position, reverse):
+        """
+        Trim the page_size + 1 rows read to one page and record its links.
+        """
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        if not rows:
+            self.has_next = self.has_previous = False
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def seek(self, queryset, position, reverse):
+        """
+        Order queryset by the key and keep rows after position (before it when reverse).
+
+        The redundant ``created_at`` bound lets the database start the index
+        scan at position; the OR alone would only be applied as a filter.
+        """
+        if reverse:
+            queryset = queryset.order_by('created_at', 'id')
+            if position is not None:
+                created_at, pk = position
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk), created_at__gte=created_at
+                )
+        else:
+            queryset = queryset.order_by('-created_at', '-id')
+            if position is not None:
+                created_at, pk = position
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk), created_at__lte=created_at
+                )
+        return queryset
+
+    def position_of(self, row):
+        return row.created_at, row.id
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if requested <= 0:
+            return self.page_size
+        return min(requested, self.max_page_size)
+
+    def decode_cursor(self, request):
+        """
+        Decode the opaque cursor into (row key or None, reverse).
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            position = self.parse_position(payload)
+            reverse = bool(payload.get('r', False))
+        except (TypeError, ValueError, KeyError, UnicodeError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def parse_position(self, payload):
+        """
+        Return the row key stored in a cursor payload; raise ValueError if invalid.
+        """
+        created_at = parse_datetime(payload['t'])
+        if created_at is None:
+            raise ValueError(payload['t'])
+        return created_at, int(payload['i'])
+
+    def position_payload(self, position):
+        created_at, pk = position
+        return {'t': created_at.isoformat(), 'i': pk}
+
+    def encode_cursor(self, position, reverse=False):
+        """
+        Build the URL for a page starting after (or before) the given row key.
+        """
+        payload = self.position_payload(position)
+        if reverse:
+            payload['r'] = True
+        raw = json.dumps(payload, separators=(',', ':')).encode('ascii')
+        encoded = base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.position_of(self.last_row))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.position_of(self.first_row), reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque keyset cursor; pass an empty value for the first page.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ] + self.fallback_class().get_schema_operation_parameters(view)
+
+
+class EstimatedKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination whose page-number fallback estimates large counts.
+    """
+    fallback_class = EstimatedCountPagination
+
+
+class IdKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination over the primary key alone, newest first.
+
+    Meant for append-only tables where id order is insertion order: pages
+    are read with ``WHERE id < ...`` against an index ending in ``id``.
+    Every request is a keyset page; without a cursor it is the first one.
+    """
+
+    def is_requested(self, request):
+        return True
+
+    def seek(self, queryset, position, reverse):
+        if reverse:
+            queryset = queryset.order_by('id')
+            if position is not None:
+                queryset = queryset.filter(id__gt=position)
+        else:
+            queryset = queryset.order_by('-id')
+            if position is not None:
+                queryset = queryset.filter(id__lt=position)
+        return queryset
+
+    def position_of(self, row):
+        return row.id
+
+    def parse_position(self, payload):
+        return int(payload['i'])
+
+    def position_payload(self, position):
+        return {'i': position}
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view)[:2]
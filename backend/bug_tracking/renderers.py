@@ -0,0 +1,188 @@
+"""
+Fast JSON, MessagePack, columnar and export renderers.
+"""
+import csv
+import io
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def encode_default(obj):
+    """
+    Convert what orjson/msgpack cannot encode the same way DRF's JSONEncoder does.
+    """
+    return JSONEncoder().default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same compact UTF-8 output with orjson.
+
+    Indented output (browsable API, ``; indent=``) and values orjson rejects,
+    such as integers beyond 64 bits, fall back to the stdlib encoder. The
+    only visible difference is the exponent spelling of very large or small
+    floats (``1e-6`` rather than ``1e-06``), which parses to the same number.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escape U+2028/U+2029 as JSONRenderer does, keeping output a JavaScript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer for ``application/msgpack``, carrying the same values as the JSON output.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True, datetime=False)
+
+
+def _same(value, other):
+    return type(value) is type(other) and value == other
+
+
+def to_columnar(rows):
+    """
+    Encode a list of same-keyed dicts as a column table.
+
+    Returns None when rows are not uniform records. Columns whose value is
+    the same on every row move to ``constants``. String columns where each
+    value repeats on average are dictionary-encoded: ``dictionaries[name]``
+    lists the distinct values and rows hold indexes into it (None stays
+    None). The remaining ``fields`` are emitted once, with ``rows`` as arrays.
+    """
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return None
+    if not rows:
+        return {'fields': [], 'rows': [], 'constants': {}, 'dictionaries': {}}
+    names = list(rows[0])
+    if any(len(row) != len(names) or any(name not in row for name in names) for row in rows):
+        return None
+
+    constants, dictionaries, fields, columns = {}, {}, [], []
+    for name in names:
+        column = [row[name] for row in rows]
+        first = column[0]
+        if len(column) > 1 and all(_same(value, first) for value in column):
+            constants[name] = first
+            continue
+        if all(value is None or type(value) is str for value in column):
+            index = {}
+            for value in column:
+                if value is not None and value not in index:
+                    index[value] = len(index)
+            if index and len(index) * 2 <= len(column):
+                dictionaries[name] = list(index)
+                column = [None if value is None else index[value] for value in column]
+        fields.append(name)
+        columns.append(column)
+    return {
+        'fields': fields,
+        'rows': [list(row) for row in zip(*columns)] if columns else [[] for _ in rows],
+        'constants': constants,
+        'dictionaries': dictionaries,
+    }
+
+
+class ColumnarJSONRenderer(ORJSONRenderer):
+    """
+    Opt-in compact shape for list responses, selected with ``?format=columnar``.
+
+    Successful list payloads (or the ``results`` of a paginated one) are
+    replaced by the table from ``to_columnar``; pagination keys are kept.
+    Anything else, such as a single object, an error, or records with
+    differing keys, is rendered as plain JSON.
+    """
+    media_type = 'application/vnd.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if response is None or response.status_code < 400:
+            data = self.columnar(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def columnar(self, data):
+        if isinstance(data, dict) and isinstance(data.get('results'), list):
+            table = to_columnar(data['results'])
+            return data if table is None else {**data, 'results': table}
+        table = to_columnar(data)
+        return data if table is None else table
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer for ``application/x-ndjson`` endpoints that stream their own body.
+
+    Only non-streamed bodies, such as errors, reach ``render``; they become one line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return ORJSONRenderer().render(data) + b'\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renderer for ``text/csv`` endpoints that stream their own body.
+
+    Only non-streamed bodies, such as errors, reach ``render``; a dict becomes
+    ``field,message`` rows.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['field', 'message'])
+        items = data.items() if isinstance(data, dict) else [('', data)]
+        for field, messages in items:
+            for message in messages if isinstance(messages, list) else [messages]:
+                writer.writerow([field, message])
+        return output.getvalue().encode(self.charset)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer for ``text/event-stream`` endpoints that stream their own body.
+
+    Only non-streamed bodies, such as errors, reach ``render``; they become one ``error`` event.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return b'event: error\ndata: ' + ORJSONRenderer().render(data) + b'\n\n'
@@ -4,7 +4,7 @@ Django settings for bug_tracking project.
 
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -42,10 +42,16 @@ INSTALLED_APPS = [
     'projects',
     'issues',
     'comments',
+    'search',
+    'caching',
+    'activity',
+    'events',
+    'graph',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'bug_tracking.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -119,12 +125,113 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'bug_tracking.renderers.ORJSONRenderer',
+        'bug_tracking.renderers.MessagePackRenderer',
+        'bug_tracking.renderers.ColumnarJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'bug_tracking.parsers.ORJSONParser',
+        'bug_tracking.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'bug_tracking.exception_handler.custom_exception_handler',
 }
 
+# Estimated-count pagination (bug_tracking.pagination.EstimatedCountPagination):
+# counts above the threshold are estimated instead of running COUNT(*).
+PAGINATION_EXACT_COUNT_THRESHOLD = config('PAGINATION_EXACT_COUNT_THRESHOLD', default=10000, cast=int)
+PAGINATION_COUNT_CACHE_TTL = config('PAGINATION_COUNT_CACHE_TTL', default=60, cast=int)
+
+# Build list/retrieve responses from values_list() rows instead of model
+# instances on viewsets that declare a values_serializer_class.
+FAST_READ_SERIALIZATION = config('FAST_READ_SERIALIZATION', default=False, cast=bool)
+
+# Streamed lists (bug_tracking.streaming.StreamingListMixin, ?stream=1):
+# rows fetched from the database per round trip.
+STREAMING_CHUNK_SIZE = config('STREAMING_CHUNK_SIZE', default=500, cast=int)
+
+# Compound documents (issues.includes, ?include=comments): newest comments
+# embedded per issue unless ?comments_limit= asks for fewer or more.
+INCLUDE_COMMENTS_LIMIT = config('INCLUDE_COMMENTS_LIMIT', default=20, cast=int)
+
+# Issue import (issues.importer.IssueImporter): issues inserted per transaction.
+IMPORT_BATCH_SIZE = config('IMPORT_BATCH_SIZE', default=1000, cast=int)
+
+# Live events (events.broker, /events/ SSE endpoints). LocalBackend only
+# reaches watchers in the same process; with several workers use
+# 'events.backends.RedisBackend' and EVENTS_REDIS_URL. Streams send a
+# heartbeat every EVENTS_HEARTBEAT seconds and end after
+# EVENTS_STREAM_TIMEOUT so clients reconnect; a watcher further behind than
+# EVENTS_MAX_PENDING events gets a reset event instead.
+EVENTS_BACKEND = config('EVENTS_BACKEND', default='events.backends.LocalBackend')
+EVENTS_REDIS_URL = config('EVENTS_REDIS_URL', default='redis://localhost:6379/0')
+EVENTS_HEARTBEAT = config('EVENTS_HEARTBEAT', default=15, cast=float)
+EVENTS_STREAM_TIMEOUT = config('EVENTS_STREAM_TIMEOUT', default=300, cast=float)
+EVENTS_MAX_PENDING = config('EVENTS_MAX_PENDING', default=1000, cast=int)
+
+# Response compression (bug_tracking.compression.CompressionMiddleware).
+# Codings in server preference order; zstd needs the zstandard package.
+COMPRESSION_ENABLED = config('COMPRESSION_ENABLED', default=True, cast=bool)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_ENCODINGS = config('COMPRESSION_ENCODINGS', default='zstd,gzip,deflate', cast=Csv())
+COMPRESSION_LEVELS = {
+    'zstd': config('COMPRESSION_ZSTD_LEVEL', default=3, cast=int),
+    'gzip': config('COMPRESSION_GZIP_LEVEL', default=6, cast=int),
+    'deflate': config('COMPRESSION_DEFLATE_LEVEL', default=6, cast=int),
+}
+# Per-route overrides of 'levels', 'min_size' and 'encodings', keyed by URL
+# name. Whole-project issue lists are large, so they trade some ratio for CPU.
+COMPRESSION_ROUTES = {
+    'project-issues': {'levels': {'gzip': 4, 'deflate': 4, 'zstd': 1}},
+}
+
+# Full-text search: dotted path to a search.backends class, or empty to pick
+# one from the database vendor (FTS5 on SQLite, tsvector on PostgreSQL).
+# Searches return at most SEARCH_RESULT_LIMIT of the best-ranked issues, and
+# so does a project's issue list filtered with ?search=.
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='')
+SEARCH_RESULT_LIMIT = config('SEARCH_RESULT_LIMIT', default=500, cast=int)
+
+# Batch endpoint (bug_tracking.batch.BatchView): maximum sub-requests per call.
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=25, cast=int)
+
+# GraphQL endpoint (graph.views.GraphQLView): queries nested deeper than
+# GRAPHQL_MAX_DEPTH or able to return more than GRAPHQL_MAX_COST objects are
+# rejected before they run. Compiled operations kept per process.
+GRAPHQL_MAX_DEPTH = config('GRAPHQL_MAX_DEPTH', default=6, cast=int)
+GRAPHQL_MAX_COST = config('GRAPHQL_MAX_COST', default=5000, cast=int)
+GRAPHQL_OPERATION_CACHE_SIZE = config('GRAPHQL_OPERATION_CACHE_SIZE', default=500, cast=int)
+
+# Response cache (caching app): list/retrieve data keyed by per-project
+# version counters. Set RESPONSE_CACHE_URL to a redis:// URL (any server
+# speaking the Redis protocol) to share it between processes; otherwise it
+# lives in each process's memory.
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+RESPONSE_CACHE_URL = config('RESPONSE_CACHE_URL', default='')
+RESPONSE_CACHE_TTL = config('RESPONSE_CACHE_TTL', default=300, cast=int)
+RESPONSE_CACHE_LOCK_TIMEOUT = config('RESPONSE_CACHE_LOCK_TIMEOUT', default=10, cast=int)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': (
+            'django.core.cache.backends.redis.RedisCache' if RESPONSE_CACHE_URL
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': RESPONSE_CACHE_URL or 'responses',
+        'TIMEOUT': RESPONSE_CACHE_TTL,
+        'OPTIONS': {} if RESPONSE_CACHE_URL else {'MAX_ENTRIES': 10000},
+    },
+}
+
 # Simple JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -0,0 +1,95 @@
+"""
+Sparse fieldsets (``?fields=`` / ``?exclude=``) for read endpoints.
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import ListSerializer
+
+
+def _split(value):
+    return [name.strip() for name in value.split(',') if name.strip()] if value else []
+
+
+def restrict_fields(serializer, fields):
+    """
+    Drop every field not in fields from a serializer or list serializer.
+    """
+    target = serializer.child if isinstance(serializer, ListSerializer) else serializer
+    for name in list(target.fields):
+        if name not in fields:
+            target.fields.pop(name)
+    return serializer
+
+
+class SparseFieldsMixin:
+    """
+    Narrow list and retrieve responses to ``?fields=a,b`` minus ``?exclude=c``.
+
+    The selection is pushed into the queryset as well. Only the columns the
+    kept fields read are loaded, and ``select_related`` / ``prefetch_related``
+    lookups no kept field needs are dropped. Column paths come from the
+    viewset's ``values_serializer_class``, which already knows them for the
+    values read path.
+    """
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+    sparse_actions = ('list', 'retrieve')
+
+    def parse_sparse_fields(self, serializer_class):
+        """
+        Return the ordered field names to keep for serializer_class, or None for all.
+        """
+        requested = _split(self.request.query_params.get(self.fields_query_param))
+        excluded = _split(self.request.query_params.get(self.exclude_query_param))
+        if not requested and not excluded:
+            return None
+        available = [name for name, field in serializer_class().fields.items() if not field.write_only]
+        unknown = sorted(set(requested + excluded) - set(available))
+        if unknown:
+            raise ValidationError({'fields': [f'Unknown field(s): {", ".join(unknown)}.']})
+        fields = [
+            name for name in available
+            if (not requested or name in requested) and name not in excluded
+        ]
+        if not fields:
+            raise ValidationError({'fields': ['At least one field must be selected.']})
+        return fields
+
+    def get_sparse_fields(self):
+        if self.action not in self.sparse_actions:
+            return None
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self.parse_sparse_fields(self.get_serializer_class())
+        return self._sparse_fields
+
+    def get_values_fields(self):
+        return self.get_sparse_fields()
+
+    def narrow_queryset(self, queryset, values_serializer):
+        """
+        Load only values_serializer's columns and the relations they go through.
+        """
+        relations = {path.rsplit('__', 1)[0] for path in values_serializer.columns if '__' in path}
+        prefetches = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if getattr(lookup, 'prefetch_through', lookup).split('__', 1)[0] in relations
+        ]
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if relations:
+            queryset = queryset.select_related(*sorted(relations))
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset.only(*values_serializer.columns)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        return self.narrow_queryset(queryset, self.values_serializer_class(fields=fields))
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            restrict_fields(serializer, fields)
+        return serializer
@@ -0,0 +1,898 @@
+"""
+Tests for project-level API endpoints.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from issues.models import Issue
+
+
+@pytest.mark.django_db
+class TestBatchEndpoint:
+    """
+    Test the batch sub-request endpoint.
+    """
+
+    def test_batch_requires_authentication(self, api_client):
+        """
+        Test that anonymous batches are rejected.
+        """
+        response = api_client.post('/api/batch/', {'requests': []}, format='json')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_batch_reads_issue_and_comments(self, authenticated_client, issue, comment):
+        """
+        Test fetching an issue and its comments in one round trip.
+        """
+        client, user = authenticated_client
+        response = client.post('/api/batch/', {'requests': [
+            {'id': 'issue', 'method': 'GET', 'path': f'/api/issues/{issue.id}/'},
+            {'id': 'comments', 'method': 'GET', 'path': f'/api/comments/?issue_id={issue.id}'},
+            {'id': 'missing', 'method': 'GET', 'path': '/api/nowhere/'},
+        ]}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        issue_res, comments_res, missing_res = response.data['responses']
+        assert issue_res['id'] == 'issue'
+        assert issue_res['status'] == 200
+        assert issue_res['body']['title'] == issue.title
+        assert comments_res['status'] == 200
+        assert [row['id'] for row in comments_res['body']['results']] == [comment.id]
+        assert missing_res['status'] == 404
+
+    def test_batch_authenticates_once(self, authenticated_client, issue):
+        """
+        Test that sub-requests reuse the batch's user instead of re-authenticating.
+        """
+        client, user = authenticated_client
+        requests = [{'method': 'GET', 'path': f'/api/issues/{issue.id}/'}]
+        with CaptureQueriesContext(connection) as single:
+            client.post('/api/batch/', {'requests': requests}, format='json')
+        with CaptureQueriesContext(connection) as double:
+            client.post('/api/batch/', {'requests': requests * 2}, format='json')
+        user_queries = [q for q in double.captured_queries if 'FROM "accounts_user"' in q['sql']
+                        and 'INNER JOIN' not in q['sql'] and 'LEFT OUTER JOIN' not in q['sql']]
+        assert len(user_queries) <= 1
+        assert len(double) < 2 * len(single)
+
+    def test_batch_writes_as_user(self, authenticated_client, project):
+        """
+        Test that write sub-requests run as the authenticated user.
+        """
+        client, user = authenticated_client
+        response = client.post('/api/batch/', {'requests': [
+            {'method': 'POST', 'path': '/api/issues/', 'body': {
+                'title': 'Batched', 'description': 'Created in a batch', 'project': project.id,
+            }},
+        ]}, format='json')
+
+        assert response.data['responses'][0]['status'] == 201
+        assert Issue.objects.get(title='Batched').reporter == user
+
+    def test_batch_atomic_rolls_back(self, authenticated_client, project):
+        """
+        Test that an atomic batch undoes earlier writes when one sub-request fails.
+        """
+        client, user = authenticated_client
+        response = client.post('/api/batch/', {'atomic': True, 'requests': [
+            {'method': 'POST', 'path': '/api/issues/', 'body': {
+                'title': 'Rolled back', 'description': 'x', 'project': project.id,
+            }},
+            {'method': 'POST', 'path': '/api/issues/', 'body': {'title': ''}},
+        ]}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['rolled_back'] is True
+        assert [entry['status'] for entry in response.data['responses']] == [201, 400]
+        assert not Issue.objects.filter(title='Rolled back').exists()
+
+    def test_batch_rejects_invalid_requests(self, authenticated_client, settings):
+        """
+        Test request validation and the size limit.
+        """
+        client, user = authenticated_client
+        response = client.post('/api/batch/', {'requests': [
+            {'method': 'GET', 'path': '/api/batch/'},
+            {'method': 'TRACE', 'path': '/api/issues/'},
+            {'method': 'GET', 'path': '/admin/'},
+        ]}, format='json')
+        assert [entry['status'] for entry in response.data['responses']] == [400, 405, 400]
+
+        settings.BATCH_MAX_REQUESTS = 1
+        response = client.post('/api/batch/', {'requests': [
+            {'method': 'GET', 'path': '/api/issues/'},
+        ] * 2}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestValuesSerializationParity:
+    """
+    Test that the values_list read path renders byte-identical responses.
+    """
+
+    @pytest.fixture
+    def dataset(self, user, another_user):
+        from django.contrib.auth import get_user_model
+        from comments.models import Comment
+        from projects.models import Project
+        nameless = get_user_model().objects.create_user(
+            email='nameless@example.com', username='nameless', password='x', first_name='', last_name=''
+        )
+        unicode_user = get_user_model().objects.create_user(
+            email='zoe@example.com', username='zoe', password='x', first_name='Zoë', last_name='  Ødegård '
+        )
+        projects = [
+            Project.objects.create(name='Alpha', description='First', created_by=user),
+            Project.objects.create(name='Béta ✓', description='', created_by=nameless),
+        ]
+        issues = []
+        for index in range(6):
+            issues.append(Issue.objects.create(
+                title=f'Issue {index} "quoted" <b>',
+                description='Line one\nLine two' if index % 2 else '',
+                status=Issue.STATUS_CHOICES[index % len(Issue.STATUS_CHOICES)][0],
+                priority=Issue.PRIORITY_CHOICES[index % len(Issue.PRIORITY_CHOICES)][0],
+                project=projects[index % 2],
+                reporter=[user, unicode_user, nameless][index % 3],
+                assignee=[None, another_user, unicode_user][index % 3],
+            ))
+        for index, issue in enumerate(issues):
+            Comment.objects.create(content=f'Comment {index} ✓', issue=issue, author=[user, unicode_user][index % 2])
+        return projects, issues
+
+    def fetch_both(self, client, settings, url):
+        settings.RESPONSE_CACHE_ENABLED = False
+        settings.FAST_READ_SERIALIZATION = True
+        fast = client.get(url)
+        settings.FAST_READ_SERIALIZATION = False
+        slow = client.get(url)
+        return fast, slow
+
+    def test_endpoints_match(self, authenticated_client, settings, dataset):
+        """
+        Test every list/retrieve endpoint with the fast path on and off.
+        """
+        client, user = authenticated_client
+        projects, issues = dataset
+        urls = [
+            '/api/issues/',
+            '/api/issues/?page=1&status=open',
+            f'/api/issues/?project_id={projects[1].id}',
+            '/api/issues/?cursor=&page_size=4',
+            f'/api/issues/{issues[0].id}/',
+            f'/api/issues/{issues[1].id}/',
+            '/api/comments/',
+            f'/api/comments/?issue_id={issues[2].id}',
+            '/api/comments/?cursor=',
+            '/api/projects/',
+            f'/api/projects/{projects[1].id}/',
+            f'/api/projects/{projects[0].id}/issues/',
+            f'/api/projects/{projects[0].id}/issues/?status=open',
+            f'/api/projects/{projects[0].id}/issues/?cursor=&page_size=2',
+            f'/api/projects/{projects[0].id}/issues/?search=Issue',
+        ]
+        for url in urls:
+            fast, slow = self.fetch_both(client, settings, url)
+            assert fast.status_code == slow.status_code == 200, url
+            assert fast.content == slow.content, url
+
+    def test_missing_objects_match(self, authenticated_client, settings):
+        """
+        Test that 404s look the same on both paths.
+        """
+        client, user = authenticated_client
+        for url in ('/api/issues/999/', '/api/issues/abc/', '/api/projects/999/', '/api/comments/999/'):
+            fast, slow = self.fetch_both(client, settings, url)
+            assert fast.status_code == slow.status_code == 404, url
+            assert fast.content == slow.content, url
+
+    def test_serializers_match_in_other_timezones(self, dataset):
+        """
+        Test datetime rendering under an active non-UTC timezone.
+        """
+        import json
+        import zoneinfo
+        from django.utils import timezone
+        from comments.models import Comment
+        from comments.serializers import CommentSerializer, CommentValuesSerializer
+        from issues.serializers import IssueSerializer, IssueValuesSerializer
+        from projects.models import Project
+        from projects.serializers import ProjectSerializer, ProjectValuesSerializer
+        pairs = [
+            (Issue, IssueSerializer, IssueValuesSerializer),
+            (Comment, CommentSerializer, CommentValuesSerializer),
+            (Project, ProjectSerializer, ProjectValuesSerializer),
+        ]
+        with timezone.override(zoneinfo.ZoneInfo('America/New_York')):
+            for model, serializer_class, values_class in pairs:
+                queryset = model.objects.all()
+                values_serializer = values_class()
+                expected = json.dumps(serializer_class(queryset, many=True).data)
+                assert json.dumps(values_serializer.serialize(values_serializer.prepare(queryset))) == expected
+
+
+def data_queries(captured, table):
+    """
+    Return the SQL of row-fetching queries against table, skipping counts and aggregates.
+    """
+    return [
+        query['sql'] for query in captured.captured_queries
+        if f'FROM "{table}"' in query['sql'] and 'COUNT(' not in query['sql'] and 'MAX(' not in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fast', [True, False], ids=['values', 'model'])
+class TestSparseFieldsets:
+    """
+    Test ?fields= / ?exclude= narrowing of responses and queries.
+    """
+
+    @pytest.fixture(autouse=True)
+    def configure(self, settings, fast):
+        settings.FAST_READ_SERIALIZATION = fast
+        settings.RESPONSE_CACHE_ENABLED = False
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK, response.content
+        return response, captured
+
+    def test_fields_drop_columns_and_joins(self, authenticated_client, issue, comment, project):
+        """
+        Test that fields without relations select no joins and fewer bytes.
+        """
+        client, user = authenticated_client
+        full, _ = self.get(client, '/api/issues/')
+        cases = [
+            ('/api/issues/?fields=id,title', 'issues_issue', ['id', 'title']),
+            (f'/api/issues/{issue.id}/?fields=title,id', 'issues_issue', ['id', 'title']),
+            (f'/api/projects/{project.id}/issues/?fields=id,title', 'issues_issue', ['id', 'title']),
+            ('/api/comments/?fields=id,content', 'comments_comment', ['id', 'content']),
+            ('/api/projects/?fields=id,name', 'projects_project', ['id', 'name']),
+        ]
+        for url, table, keys in cases:
+            response, captured = self.get(client, url)
+            body = response.json()
+            row = body['results'][0] if 'results' in body else body[0] if isinstance(body, list) else body
+            assert list(row) == keys, url
+            assert data_queries(captured, table), url
+            for sql in data_queries(captured, table):
+                assert 'JOIN' not in sql, url
+                assert 'description' not in sql.split(' FROM ')[0], url
+        narrow, _ = self.get(client, '/api/issues/?fields=id,title')
+        assert len(narrow.content) < len(full.content) / 2
+
+    def test_exclude_drops_column_keeps_joins(self, authenticated_client, issue):
+        """
+        Test that excluding description leaves the name joins but not the column.
+        """
+        client, user = authenticated_client
+        response, captured = self.get(client, '/api/issues/?exclude=description')
+        row = response.json()['results'][0]
+        assert 'description' not in row
+        assert row['reporter_name'] == 'Test User'
+        queries = data_queries(captured, 'issues_issue')
+        assert queries
+        for sql in queries:
+            assert '"issues_issue"."description"' not in sql
+            assert 'JOIN' in sql
+
+    def test_related_field_joins_only_its_relation(self, authenticated_client, issue, comment):
+        """
+        Test that a name field joins just the relation it reads, without extra queries.
+        """
+        client, user = authenticated_client
+        _, full = self.get(client, '/api/issues/')
+        response, captured = self.get(client, '/api/issues/?fields=title,reporter_name')
+        assert response.json()['results'] == [{'title': issue.title, 'reporter_name': 'Test User'}]
+        assert len(captured) == len(full)
+        assert data_queries(captured, 'issues_issue')
+        for sql in data_queries(captured, 'issues_issue'):
+            assert sql.count('JOIN') == 1
+            assert '"projects_project"' not in sql
+
+        response, captured = self.get(client, '/api/comments/?fields=author_name,author_email')
+        assert response.json()['results'] == [{'author_name': 'Test User', 'author_email': user.email}]
+        for sql in data_queries(captured, 'comments_comment'):
+            assert sql.count('JOIN') == 1
+
+    def test_unknown_fields_are_rejected(self, authenticated_client, project):
+        """
+        Test that unknown or empty selections return 400.
+        """
+        client, user = authenticated_client
+        for url in (
+            '/api/issues/?fields=id,bogus',
+            '/api/comments/?exclude=nope',
+            f'/api/projects/{project.id}/issues/?fields=bogus',
+            '/api/projects/?fields=id&exclude=id',
+        ):
+            assert client.get(url).status_code == status.HTTP_400_BAD_REQUEST, url
+
+
+@pytest.mark.django_db
+class TestRenderersAndParsers:
+    """
+    Test orjson and MessagePack content negotiation.
+    """
+
+    def test_json_matches_stdlib_renderer(self, authenticated_client, project, user):
+        """
+        Test that the orjson renderer's bytes equal DRF's JSONRenderer output.
+        """
+        from rest_framework.renderers import JSONRenderer
+        from .renderers import ORJSONRenderer
+        client, user = authenticated_client
+        Issue.objects.create(
+            title='Ünïcode ✓ \u2028\u2029 "quotes" \\ slash', description='Line\nbreak\ttab',
+            project=project, reporter=user,
+        )
+        response = client.get('/api/issues/')
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == JSONRenderer().render(response.data)
+
+        import datetime
+        import decimal
+        import uuid
+        data = {
+            'when': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2024, 5, 1),
+            'amount': decimal.Decimal('12.50'),
+            'uuid': uuid.UUID(int=1),
+            'nested': [{'a': None, 'b': True}, (1, 2)],
+            'big': 2 ** 70,
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent_is_honoured(self, authenticated_client, issue):
+        """
+        Test that an indent media type parameter still pretty-prints.
+        """
+        client, user = authenticated_client
+        response = client.get(f'/api/issues/{issue.id}/', HTTP_ACCEPT='application/json; indent=2')
+        assert response.content.startswith(b'{\n  "id"')
+
+    def test_msgpack_round_trip(self, authenticated_client, project):
+        """
+        Test MessagePack responses and request bodies.
+        """
+        import json
+        import msgpack
+        client, user = authenticated_client
+        response = client.post(
+            '/api/issues/',
+            msgpack.packb({'title': 'Packed', 'description': 'Sent as msgpack', 'project': project.id}),
+            content_type='application/msgpack',
+            HTTP_ACCEPT='application/msgpack',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response['Content-Type'] == 'application/msgpack'
+        created = msgpack.unpackb(response.content)
+        assert created['title'] == 'Packed'
+
+        packed = client.get('/api/issues/', HTTP_ACCEPT='application/msgpack')
+        plain = client.get('/api/issues/')
+        assert msgpack.unpackb(packed.content) == json.loads(plain.content)
+        assert len(packed.content) < len(plain.content)
+        assert packed['ETag'] != plain['ETag']
+
+    def test_malformed_bodies_are_rejected(self, authenticated_client):
+        """
+        Test that malformed JSON and MessagePack bodies return 400.
+        """
+        client, user = authenticated_client
+        for body, content_type in (
+            (b'{"title": ', 'application/json'),
+            (b'{"n": NaN}', 'application/json'),
+            (b'\xc1', 'application/msgpack'),
+        ):
+            response = client.post('/api/issues/', body, content_type=content_type)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, body
+
+    def test_batch_renders_in_negotiated_format(self, authenticated_client, issue):
+        """
+        Test that a msgpack batch carries decoded sub-response bodies.
+        """
+        import msgpack
+        client, user = authenticated_client
+        response = client.post(
+            '/api/batch/',
+            msgpack.packb({'requests': [{'method': 'GET', 'path': f'/api/issues/{issue.id}/'}]}),
+            content_type='application/msgpack',
+            HTTP_ACCEPT='application/msgpack',
+        )
+        body = msgpack.unpackb(response.content)
+        assert body['responses'][0]['body']['title'] == issue.title
+
+
+def decode_columnar(table):
+    """
+    Rebuild records from a columnar table as a client would.
+    """
+    dictionaries = table['dictionaries']
+    records = []
+    for row in table['rows']:
+        record = dict(table['constants'])
+        for name, value in zip(table['fields'], row):
+            if name in dictionaries and value is not None:
+                value = dictionaries[name][value]
+            record[name] = value
+        records.append(record)
+    return records
+
+
+@pytest.mark.django_db
+class TestColumnarFormat:
+    """
+    Test the ``?format=columnar`` list shape.
+    """
+
+    @pytest.fixture
+    def issues(self, project, user, another_user):
+        return Issue.objects.bulk_create([
+            Issue(
+                title=f'Issue {index}', description='Same description', project=project, reporter=user,
+                assignee=another_user if index % 2 else None,
+                status=Issue.STATUS_CHOICES[index % 2][0], priority='high',
+            )
+            for index in range(8)
+        ])
+
+    def test_project_issues_round_trip(self, authenticated_client, project, issues, another_user):
+        """
+        Test that decoding the columnar shape yields the regular JSON records.
+        """
+        import json
+        client, user = authenticated_client
+        plain = client.get(f'/api/projects/{project.id}/issues/')
+        columnar = client.get(f'/api/projects/{project.id}/issues/?format=columnar')
+        assert columnar.status_code == status.HTTP_200_OK
+        assert columnar['Content-Type'] == 'application/vnd.columnar+json'
+        table = json.loads(columnar.content)
+        assert decode_columnar(table) == json.loads(plain.content)
+        assert len(columnar.content) < len(plain.content)
+
+        assert table['constants']['project'] == project.id
+        assert table['constants']['project_name'] == project.name
+        assert table['constants']['priority'] == 'high'
+        assert 'project' not in table['fields']
+        assert sorted(table['dictionaries']['status']) == sorted(
+            choice for choice, label in Issue.STATUS_CHOICES[:2]
+        )
+        assert table['dictionaries']['assignee_name'] == [another_user.get_full_name()]
+        assert 'title' in table['fields'] and 'title' not in table['dictionaries']
+
+    def test_paginated_list_keeps_pagination_keys(self, authenticated_client, issues):
+        """
+        Test that only ``results`` is reshaped in paginated responses.
+        """
+        import json
+        client, user = authenticated_client
+        body = json.loads(client.get('/api/issues/?format=columnar').content)
+        assert body['count'] == len(issues)
+        assert 'next' in body
+        plain = json.loads(client.get('/api/issues/').content)
+        assert decode_columnar(body['results']) == plain['results']
+
+    def test_non_list_responses_are_plain_json(self, authenticated_client, issue):
+        """
+        Test that single objects and errors render unchanged.
+        """
+        import json
+        client, user = authenticated_client
+        response = client.get(f'/api/issues/{issue.id}/?format=columnar')
+        assert json.loads(response.content)['title'] == issue.title
+        response = client.get('/api/issues/999999/?format=columnar')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert 'rows' not in json.loads(response.content)
+
+    def test_irregular_and_small_lists(self):
+        """
+        Test tables for empty, single-row and mixed-key lists.
+        """
+        from .renderers import to_columnar
+        assert to_columnar([]) == {'fields': [], 'rows': [], 'constants': {}, 'dictionaries': {}}
+        assert to_columnar([{'a': 'x', 'b': 1}]) == {
+            'fields': ['a', 'b'], 'rows': [['x', 1]], 'constants': {}, 'dictionaries': {},
+        }
+        assert to_columnar([{'a': 1}, {'b': 1}]) is None
+        table = to_columnar([{'a': 1, 'b': None}, {'a': True, 'b': None}])
+        assert table['fields'] == ['a'] and table['constants'] == {'b': None}
+        assert decode_columnar(table) == [{'a': 1, 'b': None}, {'a': True, 'b': None}]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fast', [True, False], ids=['values', 'model'])
+class TestStreamingLists:
+    """
+    Test ``?stream=1`` JSON array streaming of list endpoints.
+    """
+
+    @pytest.fixture(autouse=True)
+    def configure(self, settings, fast, monkeypatch):
+        settings.FAST_READ_SERIALIZATION = fast
+        settings.STREAMING_CHUNK_SIZE = 3
+        monkeypatch.setattr('bug_tracking.streaming.STREAM_BUFFER_SIZE', 256)
+
+    @pytest.fixture
+    def issues(self, project, user, another_user):
+        return Issue.objects.bulk_create([
+            Issue(title=f'Streamed {index}', description='Body', project=project, reporter=user,
+                  assignee=another_user if index % 2 else None)
+            for index in range(12)
+        ])
+
+    def stream(self, client, url, **extra):
+        import json
+        response = client.get(url, **extra)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        chunks = list(response.streaming_content)
+        return json.loads(b''.join(chunks)), chunks, response
+
+    def test_project_issues_stream_matches_list(self, authenticated_client, project, issues):
+        """
+        Test that the streamed project issue list equals the buffered one, in chunks.
+        """
+        import json
+        client, user = authenticated_client
+        url = f'/api/projects/{project.id}/issues/'
+        body, chunks, response = self.stream(client, f'{url}?stream=1&status=open')
+        assert body == json.loads(client.get(f'{url}?status=open').content)
+        assert len(body) == len(issues)
+        assert len(chunks) > 1
+        assert response['Content-Type'] == 'application/json'
+        assert not response.has_header('X-Cache')
+
+        narrowed, _, _ = self.stream(client, f'{url}?stream=true&fields=id,title')
+        assert narrowed == [{'id': row['id'], 'title': row['title']} for row in body]
+
+    def test_list_endpoints_stream_every_row(self, authenticated_client, project, issues, comment):
+        """
+        Test that streamed lists skip pagination and return every row.
+        """
+        import json
+        client, user = authenticated_client
+        body, _, _ = self.stream(client, f'/api/issues/?stream=1&project_id={project.id}')
+        assert sorted(row['id'] for row in body) == list(project.issues.order_by('id').values_list('id', flat=True))
+        assert len(body) > 10
+        first = json.loads(client.get(f'/api/issues/{body[0]["id"]}/').content)
+        assert body[0] == first
+
+        comments, _, _ = self.stream(client, '/api/comments/?stream=1')
+        assert [row['id'] for row in comments] == [comment.id]
+        projects, _, _ = self.stream(client, '/api/projects/?stream=1')
+        assert [row['id'] for row in projects] == [project.id]
+
+    def test_stream_keeps_validators_and_ignores_other_formats(self, authenticated_client, project, issues):
+        """
+        Test 304 answers for streamed lists and buffered MessagePack output.
+        """
+        client, user = authenticated_client
+        url = f'/api/projects/{project.id}/issues/?stream=1'
+        _, _, response = self.stream(client, url)
+        again = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert again.status_code == status.HTTP_304_NOT_MODIFIED
+
+        packed = client.get(url, HTTP_ACCEPT='application/msgpack')
+        assert not packed.streaming
+        assert packed['Content-Type'] == 'application/msgpack'
+        searched = client.get(f'{url}&search=Streamed')
+        assert not searched.streaming
+
+
+@pytest.mark.django_db
+class TestCompression:
+    """
+    Test negotiated response compression.
+    """
+
+    @pytest.fixture
+    def issues(self, project, user):
+        return Issue.objects.bulk_create([
+            Issue(title=f'Compressed {index}', description='Steps to reproduce. ' * 20, project=project, reporter=user)
+            for index in range(30)
+        ])
+
+    def test_gzip_round_trip_and_validators(self, authenticated_client, project, issues):
+        """
+        Test that gzip bodies decompress to the plain body and get a coded strong ETag that still matches.
+        """
+        import gzip
+        client, user = authenticated_client
+        url = f'/api/projects/{project.id}/issues/'
+        plain = client.get(url)
+        assert not plain.has_header('Content-Encoding')
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert gzip.decompress(response.content) == plain.content
+        assert int(response['Content-Length']) == len(response.content) < len(plain.content)
+        assert response['ETag'] == plain['ETag'][:-1] + '-gzip"'
+        again = client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert again.status_code == status.HTTP_304_NOT_MODIFIED
+        assert again['ETag'] == response['ETag']
+
+    def test_compressed_etag_guards_updates(self, authenticated_client, issue, settings):
+        """
+        Test that the ETag of a compressed GET works as If-Match for a PATCH.
+        """
+        settings.COMPRESSION_MIN_SIZE = 0
+        client, user = authenticated_client
+        url = f'/api/issues/{issue.id}/'
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip'
+        etag = response['ETag']
+        assert not etag.startswith('W/')
+
+        response = client.patch(url, {'title': 'First'}, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        response = client.patch(url, {'title': 'Second'}, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    def test_negotiation_and_threshold(self, authenticated_client, project, issue, issues, settings):
+        """
+        Test q-value negotiation, refusals and the minimum size.
+        """
+        import zlib
+        from .compression import choose_encoding
+        settings.COMPRESSION_ENCODINGS = ['gzip', 'deflate']
+        client, user = authenticated_client
+        url = f'/api/projects/{project.id}/issues/'
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0.5, deflate')
+        assert response['Content-Encoding'] == 'deflate'
+        assert zlib.decompress(response.content) == client.get(url).content
+        for header in ('identity', 'gzip;q=0, deflate;q=0', '*;q=0', 'br'):
+            assert not client.get(url, HTTP_ACCEPT_ENCODING=header).has_header('Content-Encoding'), header
+        assert client.get(url, HTTP_ACCEPT_ENCODING='*')['Content-Encoding'] == 'gzip'
+
+        small = client.get(f'/api/issues/{issue.id}/', HTTP_ACCEPT_ENCODING='gzip')
+        assert len(small.content) < settings.COMPRESSION_MIN_SIZE
+        assert not small.has_header('Content-Encoding')
+        assert choose_encoding('gzip;q=bogus, deflate;q=0.1', ['gzip', 'deflate']) == 'deflate'
+
+    def test_zstd_when_available(self, authenticated_client, project, issues):
+        """
+        Test that zstd is preferred when the client and server both support it.
+        """
+        zstandard = pytest.importorskip('zstandard')
+        client, user = authenticated_client
+        url = f'/api/projects/{project.id}/issues/'
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate, zstd')
+        assert response['Content-Encoding'] == 'zstd'
+        assert zstandard.ZstdDecompressor().decompress(response.content) == client.get(url).content
+
+    def test_streaming_responses_compress_incrementally(self, authenticated_client, project, issues, monkeypatch):
+        """
+        Test that streamed lists are compressed chunk by chunk.
+        """
+        import zlib
+        monkeypatch.setattr('bug_tracking.streaming.STREAM_BUFFER_SIZE', 1024)
+        client, user = authenticated_client
+        url = f'/api/projects/{project.id}/issues/?stream=1'
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response.streaming
+        assert response['Content-Encoding'] == 'gzip'
+        assert not response.has_header('Content-Length')
+        chunks = list(response.streaming_content)
+        assert len(chunks) > 2
+        decompressor = zlib.decompressobj(31)
+        # Every chunk ends on a flush, so each one decodes on its own.
+        assert decompressor.decompress(chunks[0]).startswith(b'[{')
+        body = decompressor.decompress(b''.join(chunks[1:]))
+        plain = b''.join(client.get(url).streaming_content)
+        assert plain.endswith(body) and len(body) < len(plain)
+
+    def test_route_overrides(self, authenticated_client, project, issues, settings):
+        """
+        Test per-route levels, thresholds and opting a route out.
+        """
+        client, user = authenticated_client
+        url = f'/api/projects/{project.id}/issues/'
+        settings.COMPRESSION_ROUTES = {'project-issues': {'levels': {'gzip': 1}}}
+        fast = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        settings.COMPRESSION_ROUTES = {'project-issues': {'levels': {'gzip': 9}}}
+        small = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert len(small.content) < len(fast.content)
+        settings.COMPRESSION_ROUTES = {'project-issues': {'encodings': []}}
+        assert not client.get(url, HTTP_ACCEPT_ENCODING='gzip').has_header('Content-Encoding')
+        settings.COMPRESSION_ROUTES = {'project-issues': {'min_size': 10 ** 7}}
+        assert not client.get(url, HTTP_ACCEPT_ENCODING='gzip').has_header('Content-Encoding')
+
+    def test_cached_responses_reuse_compressed_body(self, authenticated_client, project, issues, monkeypatch):
+        """
+        Test that response cache hits serve the stored compressed body.
+        """
+        import gzip
+        from . import compression
+        calls = []
+        original = compression.compress_body
+        monkeypatch.setattr(compression, 'compress_body', lambda *args: calls.append(args) or original(*args))
+        client, user = authenticated_client
+        url = f'/api/projects/{project.id}/issues/'
+        first = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        second = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert (first['X-Cache'], second['X-Cache']) == ('MISS', 'HIT')
+        assert second.content == first.content
+        assert len(calls) == 1
+        client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_ACCEPT='application/json; indent=2')
+        assert len(calls) == 2
+
+        Issue.objects.create(title='New', description='', project=project, reporter=user)
+        third = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert third['X-Cache'] == 'MISS'
+        assert b'"New"' in gzip.decompress(third.content)
+        assert len(calls) == 3
+
+
+
+@pytest.mark.django_db
+class TestAsyncReads:
+    """
+    Test the async read views served through the ASGI URL configuration.
+    """
+
+    @pytest.fixture
+    def async_get(self, settings, user):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+        from rest_framework_simplejwt.tokens import RefreshToken
+        settings.ROOT_URLCONF = 'bug_tracking.asgi_urls'
+        client = AsyncClient()
+
+        def get(path, token=RefreshToken.for_user(user).access_token, headers=None):
+            headers = dict(headers or {})
+            if token is not None:
+                headers['Authorization'] = f'Bearer {token}'
+
+            async def request():
+                return await client.get(path, headers=headers)
+            return async_to_sync(request)()
+        return get
+
+    def disable_sync_reads(self, monkeypatch):
+        from comments.views import CommentViewSet
+        from issues.views import IssueViewSet
+        from projects.views import ProjectViewSet
+        for viewset in (IssueViewSet, CommentViewSet, ProjectViewSet):
+            for name in ('list', 'retrieve'):
+                monkeypatch.setattr(viewset, name, lambda *args, **kwargs: pytest.fail('sync view used'))
+
+    @pytest.mark.parametrize('fast', [False, True])
+    def test_reads_match_sync_responses(
+        self, authenticated_client, async_get, project, issue, comment, monkeypatch, settings, fast
+    ):
+        """
+        Test that async list and retrieve return the sync views' bodies without running them.
+        """
+        client, user = authenticated_client
+        settings.FAST_READ_SERIALIZATION = fast
+        paths = [
+            '/api/issues/', f'/api/issues/?project_id={project.id}&page_size=1', '/api/issues/?cursor=',
+            f'/api/issues/{issue.id}/', f'/api/issues/{issue.id}/?fields=id,title',
+            '/api/issues/?include=comments,reporter', f'/api/issues/{issue.id}/?include=project,assignee',
+            '/api/projects/', f'/api/projects/{project.id}/',
+            f'/api/comments/?issue_id={issue.id}', '/api/comments/?cursor=', f'/api/comments/{comment.id}/',
+        ]
+        expected = {path: client.get(path).json() for path in paths}
+        self.disable_sync_reads(monkeypatch)
+        for path in paths:
+            response = async_get(path)
+            assert response.status_code == status.HTTP_200_OK, path
+            assert response.json() == expected[path], path
+        assert async_get(f'/api/issues/{issue.id}/?page=abc').status_code == status.HTTP_200_OK
+        assert async_get('/api/issues/?page=9').status_code == status.HTTP_404_NOT_FOUND
+        assert async_get('/api/issues/abc/').status_code == status.HTTP_404_NOT_FOUND
+        assert async_get('/api/issues/?cursor=bogus').status_code == status.HTTP_404_NOT_FOUND
+
+    def test_authentication_and_permissions(self, async_get, issue, user, monkeypatch):
+        """
+        Test that missing, invalid and stale credentials are refused on the async path.
+        """
+        from rest_framework_simplejwt.tokens import RefreshToken
+        self.disable_sync_reads(monkeypatch)
+        anonymous = async_get('/api/issues/', token=None)
+        assert anonymous.status_code == status.HTTP_401_UNAUTHORIZED
+        assert anonymous['WWW-Authenticate'] == 'Bearer realm="api"'
+        assert async_get(f'/api/issues/{issue.id}/', token='garbage').status_code == status.HTTP_401_UNAUTHORIZED
+
+        token = RefreshToken.for_user(user).access_token
+        user.is_active = False
+        user.save()
+        assert async_get('/api/projects/', token=token).status_code == status.HTTP_401_UNAUTHORIZED
+        user.delete()
+        assert async_get('/api/comments/', token=token).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_validators_and_response_cache(self, async_get, project, issue, user):
+        """
+        Test conditional requests, cache hits and invalidation on the async path.
+        """
+        url = f'/api/issues/{issue.id}/'
+        first = async_get(url)
+        second = async_get(url)
+        assert (first['X-Cache'], second['X-Cache']) == ('MISS', 'HIT')
+        assert second['ETag'] == first['ETag']
+        assert async_get(url, headers={'If-None-Match': first['ETag']}).status_code == status.HTTP_304_NOT_MODIFIED
+
+        Issue.objects.filter(pk=issue.pk).update(title='Renamed')
+        Issue.objects.get(pk=issue.pk).save()
+        third = async_get(url)
+        assert third['X-Cache'] == 'MISS'
+        assert third.json()['title'] == 'Renamed'
+        assert third['ETag'] != first['ETag']
+
+    def test_other_requests_use_sync_views(self, async_get, project, issue, user):
+        """
+        Test that writes, streamed lists, the browsable API and custom actions still work.
+        """
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+        from rest_framework_simplejwt.tokens import RefreshToken
+        token = RefreshToken.for_user(user).access_token
+        headers = {'Authorization': f'Bearer {token}'}
+
+        async def create():
+            return await AsyncClient().post(
+                '/api/issues/', {'title': 'Async', 'description': 'Desc', 'project': project.id},
+                content_type='application/json', headers=headers,
+            )
+        assert async_to_sync(create)().status_code == status.HTTP_201_CREATED
+
+        streamed = async_get('/api/issues/?stream=1')
+        assert streamed.streaming
+        html = async_get('/api/issues/', headers={'Accept': 'text/html'})
+        assert html.status_code == status.HTTP_200_OK
+        assert html['Content-Type'].startswith('text/html')
+        history = async_get(f'/api/issues/{issue.id}/history/')
+        assert [row['to_status'] for row in history.json()] == ['open']
+
+    def test_batch_runs_sync_views(self, async_get, user, issue):
+        """
+        Test that a batch posted through the ASGI entry point runs its reads on the sync views.
+        """
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+        from rest_framework_simplejwt.tokens import RefreshToken
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        payload = {'requests': [{'id': 'issue', 'method': 'GET', 'path': f'/api/issues/{issue.id}/'}]}
+
+        async def request():
+            return await AsyncClient().post('/api/batch/', payload, content_type='application/json', headers=headers)
+        response = async_to_sync(request)()
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['responses'][0]['status'] == status.HTTP_200_OK
+        assert response.json()['responses'][0]['body']['title'] == issue.title
+
+    def test_streams_are_sent_asynchronously(self, settings, project, issue, user, recwarn):
+        """
+        Test that streamed lists and exports reach ASGI clients as async streams, compressed or not.
+        """
+        import gzip
+        import json
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+        from rest_framework_simplejwt.tokens import RefreshToken
+        settings.ROOT_URLCONF = 'bug_tracking.asgi_urls'
+        token = RefreshToken.for_user(user).access_token
+
+        def stream(path, **headers):
+            async def request():
+                response = await AsyncClient().get(path, headers={'Authorization': f'Bearer {token}', **headers})
+                return response, b''.join([part async for part in response])
+            response, body = async_to_sync(request)()
+            assert response.status_code == status.HTTP_200_OK, path
+            assert response.is_async, path
+            return response, body
+
+        for path in ('/api/issues/?stream=1', f'/api/projects/{project.id}/issues/?stream=1'):
+            assert [row['id'] for row in json.loads(stream(path)[1])] == [issue.id]
+        _, body = stream(f'/api/projects/{project.id}/export/?format=ndjson')
+        assert json.loads(body.splitlines()[0])['id'] == issue.id
+        response, body = stream('/api/issues/?stream=1', **{'Accept-Encoding': 'gzip'})
+        assert response['Content-Encoding'] == 'gzip'
+        assert [row['id'] for row in json.loads(gzip.decompress(body))] == [issue.id]
+        assert not [warning for warning in recwarn if 'synchronous iterators' in str(warning.message)]
@@ -5,6 +5,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from graph.views import GraphQLView
+from .batch import BatchView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -20,4 +22,6 @@ urlpatterns = [
     path('api/projects/', include('projects.urls')),
     path('api/issues/', include('issues.urls')),
     path('api/comments/', include('comments.urls')),
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('api/graphql/', GraphQLView.as_view(), name='graphql'),
 ]
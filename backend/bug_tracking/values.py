@@ -0,0 +1,218 @@
+"""
+Read-only serialization from ``values_list()`` rows.
+"""
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.http import Http404
+from rest_framework import serializers
+from rest_framework.permissions import BasePermission
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from .pagination import apaginate_queryset, supports_async_pagination
+
+# DRF fields whose to_representation returns database values unchanged.
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.EmailField, serializers.IntegerField, serializers.ChoiceField)
+
+
+def full_name(first_name, last_name):
+    """
+    Match ``AbstractUser.get_full_name()``; None when the user is missing.
+    """
+    if first_name is None:
+        return None
+    return ('%s %s' % (first_name, last_name)).strip()
+
+
+def _datetime_converter(field):
+    """
+    Return a fast equivalent of ``DateTimeField.to_representation``.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != 'iso-8601':
+        return field.to_representation
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+class ValuesSerializer:
+    """
+    Produce the output of ``serializer_class`` from tuple rows.
+
+    The serializer's readable fields are compiled once into column paths for
+    ``values_list()`` and per-field extractors, so rows are rendered without
+    building model instances or walking dotted sources. Sources that call
+    methods (``reporter.get_full_name``) must be listed in ``computed_fields``
+    as ``name: (column paths, function)``. ``fields`` limits the output to
+    the given names; ``key_columns`` are always loaded for pagination.
+    """
+    serializer_class = None
+    computed_fields = {}
+    key_columns = ('id', 'created_at')
+
+    def __init__(self, context=None, fields=None):
+        self.serializer = self.serializer_class(context=context or {})
+        self.fields = fields
+        self.columns = []
+        self.extractors = []
+        self.compile()
+
+    def column(self, path):
+        if path not in self.columns:
+            self.columns.append(path)
+        return self.columns.index(path)
+
+    def compile(self):
+        for name, field in self.serializer.fields.items():
+            if field.write_only or (self.fields is not None and name not in self.fields):
+                continue
+            self.extractors.append((name, self.compile_field(name, field)))
+        for path in self.key_columns:
+            self.column(path)
+
+    def compile_field(self, name, field):
+        """
+        Return a function mapping a row to the field's representation.
+        """
+        if name in self.computed_fields:
+            paths, function = self.computed_fields[name]
+            positions = [self.column(path) for path in paths]
+            return lambda row: function(*[row[position] for position in positions])
+
+        if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            raise ImproperlyConfigured(f'{type(self).__name__} needs a computed_fields entry for {name!r}.')
+        position = self.column('__'.join(field.source_attrs))
+        if isinstance(field, PrimaryKeyRelatedField) or type(field) in PASSTHROUGH_FIELDS:
+            return itemgetter(position)
+        if isinstance(field, serializers.DateTimeField):
+            convert = _datetime_converter(field)
+        else:
+            convert = field.to_representation
+
+        def extract(row):
+            value = row[position]
+            return None if value is None else convert(value)
+        return extract
+
+    def prepare(self, queryset):
+        """
+        Return queryset as named rows carrying every column the fields need.
+        """
+        return queryset.values_list(*self.columns, named=True)
+
+    def to_representation(self, row):
+        return {name: extract(row) for name, extract in self.extractors}
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class ValuesReadMixin:
+    """
+    Serve ``list`` and ``retrieve`` through ``values_serializer_class``.
+
+    Opt-in per viewset, and only active with ``FAST_READ_SERIALIZATION = True``;
+    otherwise the regular serializer is used everywhere. Retrieve also falls
+    back when a permission class checks objects, since there is no model
+    instance to check. ``alist`` / ``aretrieve`` are the same reads on the
+    async ORM, used by the ASGI views (``bug_tracking.asyncviews``) when
+    ``supports_async_read()``; without values serialization they load model
+    instances and run the regular serializer on them.
+    """
+    values_serializer_class = None
+
+    def get_values_serializer(self):
+        if self.values_serializer_class is None or not settings.FAST_READ_SERIALIZATION:
+            return None
+        return self.values_serializer_class(context=self.get_serializer_context(), fields=self.get_values_fields())
+
+    def get_values_fields(self):
+        """
+        Return the field names to render, or None for all of them.
+        """
+        return None
+
+    def checks_object_permissions(self):
+        return any(
+            type(permission).has_object_permission is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = values_serializer.prepare(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None or self.checks_object_permissions():
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            row = values_serializer.prepare(queryset).first()
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        if row is None:
+            raise Http404
+        return Response(values_serializer.to_representation(row))
+
+    def supports_async_read(self):
+        """
+        Return whether ``alist`` / ``aretrieve`` can answer the current request.
+        """
+        if self.action not in ('list', 'retrieve'):
+            return False
+        if self.action == 'retrieve':
+            return not self.checks_object_permissions()
+        return supports_async_pagination(self.paginator)
+
+    def get_async_read(self):
+        """
+        Return (prepare, serialize many, serialize one) for ``alist`` / ``aretrieve``.
+        """
+        values_serializer = self.get_values_serializer()
+        if values_serializer is not None:
+            return values_serializer.prepare, values_serializer.serialize, values_serializer.to_representation
+        return (
+            lambda queryset: queryset,
+            lambda instances: self.get_serializer(instances, many=True).data,
+            lambda instance: self.get_serializer(instance).data,
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        prepare, serialize, _ = self.get_async_read()
+        queryset = prepare(self.filter_queryset(self.get_queryset()))
+        page = await apaginate_queryset(self.paginator, queryset, request, view=self)
+        if page is not None:
+            return self.get_paginated_response(serialize(page))
+        return Response(serialize([row async for row in queryset]))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        prepare, _, serialize_one = self.get_async_read()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            row = await prepare(queryset).afirst()
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        if row is None:
+            raise Http404
+        return Response(serialize_one(row))
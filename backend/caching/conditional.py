@@ -0,0 +1,253 @@
+"""
+ViewSet mixin for conditional requests (ETag / Last-Modified).
+"""
+import hashlib
+from calendar import timegm
+from contextlib import contextmanager
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.urls import NoReverseMatch, reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from bug_tracking.compression import strip_coding_suffixes
+from .store import ALL_SCOPE, USERS_SCOPE, aget_versions, get_versions
+
+SINGLE_OBJECT_ACTIONS = ('retrieve', 'update', 'partial_update')
+SAFE_METHODS = ('GET', 'HEAD')
+PRECONDITION_HEADERS = ('HTTP_IF_MATCH', 'HTTP_IF_NONE_MATCH')
+
+
+@contextmanager
+def coding_neutral_preconditions(request):
+    """
+    Compare If-Match / If-None-Match against the representation's tags, not its coded copies'.
+
+    CompressionMiddleware sends compressed bodies as ``"<tag>-gzip"``; the
+    headers are restored afterwards so the middleware can still see which
+    tag the client sent.
+    """
+    original = {key: request.META[key] for key in PRECONDITION_HEADERS if key in request.META}
+    request.META.update({key: strip_coding_suffixes(value) for key, value in original.items()})
+    try:
+        yield
+    finally:
+        request.META.update(original)
+
+
+def evaluate_preconditions(request, etag, last_modified):
+    with coding_neutral_preconditions(request):
+        return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+class ConditionalRequestMixin:
+    """
+    Answer conditional reads with 304 and guard writes with If-Match.
+
+    A single object's validators come from one aggregate over its row,
+    ``COUNT``, ``MAX`` of each field in ``conditional_timestamp_fields`` and
+    ``SUM`` of each denormalized counter in ``conditional_counter_fields``,
+    so updates of the row or of the related rows it embeds change them.
+    Lists are tagged with the response cache versions of their scopes
+    instead, which every write they depend on bumps, so validating a list
+    costs no query however many rows it covers. Either way a match
+    short-circuits before the serializer runs. Lists only get an ETag, since
+    ``Last-Modified`` cannot express deletions. ``update`` / ``partial_update`` honour ``If-Match`` and
+    ``If-Unmodified-Since`` and answer 412 when the object has changed; other
+    writes opt in by listing their action in ``conditional_object_actions``
+    and running through ``conditional_response()``. A write locks the object
+    row and checks its preconditions in the same transaction as the change,
+    so two clients holding the same ETag cannot both succeed.
+    """
+    conditional_timestamp_fields = ('updated_at',)
+    conditional_counter_fields = ()
+    conditional_object_actions = SINGLE_OBJECT_ACTIONS
+
+    def get_conditional_queryset(self):
+        """
+        Return the rows the current response is built from, or None to skip validation.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action in self.conditional_object_actions:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_conditional_timestamp_fields(self):
+        """
+        Return the timestamp fields whose maxima change with the response body.
+        """
+        return self.conditional_timestamp_fields
+
+    def get_conditional_counter_fields(self):
+        """
+        Return the denormalized counters the response shows, which change without touching ``updated_at``.
+        """
+        return self.conditional_counter_fields
+
+    def get_conditional_scopes(self):
+        """
+        Return the response cache scopes whose versions validate a list.
+        """
+        if hasattr(self, 'get_cache_scopes'):
+            return self.get_cache_scopes()
+        return [ALL_SCOPE, USERS_SCOPE]
+
+    def get_validator_aggregates(self):
+        aggregates = {f'max_{index}': Max(field) for index, field in enumerate(self.get_conditional_timestamp_fields())}
+        aggregates.update(
+            {f'sum_{index}': Sum(field) for index, field in enumerate(self.get_conditional_counter_fields())}
+        )
+        return aggregates
+
+    def get_validators(self):
+        """
+        Return (etag, last_modified timestamp), or (None, None) when there is nothing to validate.
+        """
+        aggregates = self.get_validator_aggregates()
+        try:
+            queryset = self.get_conditional_queryset()
+            if queryset is None:
+                return None, None
+            if self.action not in self.conditional_object_actions:
+                return self.build_list_validators(get_versions(self.get_conditional_scopes()))
+            row = queryset.order_by().aggregate(count=Count('pk'), **aggregates)
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookups are left to the handler to answer with a 404.
+            return None, None
+        return self.build_validators(row, aggregates)
+
+    async def aget_validators(self):
+        """
+        Async version of get_validators().
+        """
+        aggregates = self.get_validator_aggregates()
+        try:
+            queryset = self.get_conditional_queryset()
+            if queryset is None:
+                return None, None
+            if self.action not in self.conditional_object_actions:
+                return self.build_list_validators(await aget_versions(self.get_conditional_scopes()))
+            row = await queryset.order_by().aaggregate(count=Count('pk'), **aggregates)
+        except (TypeError, ValueError, ValidationError):
+            return None, None
+        return self.build_validators(row, aggregates)
+
+    def build_list_validators(self, versions):
+        """
+        Turn scope versions into (etag, None) for the current list.
+        """
+        return self.make_etag(self.request.get_full_path(), versions), None
+
+    def make_etag(self, location, parts):
+        # Tie the tag to the representation: its location and renderer format.
+        parts = [location, self.request.accepted_renderer.format, *parts]
+        return '"%s"' % hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+    def build_validators(self, row, aggregates):
+        """
+        Turn a single object's validator aggregate row into (etag, last_modified timestamp).
+        """
+        if not row['count']:
+            return None, None
+
+        timestamps = [row[name] for name in aggregates if name.startswith('max_') and row[name] is not None]
+        counters = [row[name] for name in aggregates if name.startswith('sum_')]
+        # Reads include the query string, writes use the object's detail
+        # path so If-Match compares against a plain GET.
+        location = self.request.get_full_path()
+        if self.request.method not in SAFE_METHODS:
+            location = self.get_detail_path()
+        parts = [row['count']]
+        parts.extend(timestamp.isoformat() for timestamp in timestamps)
+        parts.extend(counters)
+        etag = self.make_etag(location, parts)
+        last_modified = None
+        if timestamps:
+            last_modified = timegm(max(timestamps).utctimetuple())
+        return etag, last_modified
+
+    def get_detail_path(self):
+        """
+        Return the path of the object a write targets, whichever action URL it came in on.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return reverse(f'{self.basename}-detail', kwargs={lookup_url_kwarg: self.kwargs[lookup_url_kwarg]})
+        except (AttributeError, KeyError, NoReverseMatch):
+            return self.request.path
+
+    def lock_conditional_object(self):
+        """
+        Lock the object row until the surrounding transaction ends.
+        """
+        try:
+            queryset = self.get_conditional_queryset()
+            if queryset is not None:
+                list(queryset.order_by().select_for_update(of=('self',)).values_list('pk', flat=True))
+        except (TypeError, ValueError, ValidationError):
+            pass
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """
+        Run handler unless the request's preconditions short-circuit it.
+
+        Writes lock the object and evaluate preconditions in the handler's transaction.
+        """
+        if request.method in SAFE_METHODS:
+            return self.evaluate_conditional(handler, request, *args, **kwargs)
+        with transaction.atomic():
+            self.lock_conditional_object()
+            return self.evaluate_conditional(handler, request, *args, **kwargs)
+
+    def evaluate_conditional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        response = evaluate_preconditions(request, etag, last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if request.method not in SAFE_METHODS and 200 <= response.status_code < 300:
+                etag, last_modified = self.get_validators()
+        if response.status_code == 304 or 200 <= response.status_code < 300:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    async def aconditional_response(self, handler, request, *args, **kwargs):
+        """
+        Async version of conditional_response() for reads; handler is a coroutine function.
+        """
+        etag, last_modified = await self.aget_validators()
+        if etag is None:
+            return await handler(request, *args, **kwargs)
+
+        response = evaluate_preconditions(request, etag, last_modified)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        if response.status_code == 304 or 200 <= response.status_code < 300:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def set_validators(self, response, etag, last_modified):
+        if etag is not None:
+            response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        return self.conditional_response(super().update, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aconditional_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(super().aretrieve, request, *args, **kwargs)
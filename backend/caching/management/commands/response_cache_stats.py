@@ -0,0 +1,27 @@
+"""
+Report response cache hit/miss counters.
+"""
+from django.core.management.base import BaseCommand
+from caching.store import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    """
+    Print the shared hit, miss and coalesced counters of the response cache.
+    """
+    help = 'Show response cache hit/miss counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        lookups = sum(stats.values())
+        served = stats['hits'] + stats['coalesced']
+        for name, value in stats.items():
+            self.stdout.write(f'{name:<10} {value}')
+        ratio = served / lookups if lookups else 0
+        self.stdout.write(f'hit ratio  {ratio:.1%}')
+        if options['reset']:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
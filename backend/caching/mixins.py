@@ -0,0 +1,76 @@
+"""
+ViewSet mixin that serves list and retrieve responses from the response cache.
+"""
+from django.conf import settings
+from rest_framework.response import Response
+from .store import ALL_SCOPE, USERS_SCOPE, aget_or_compute, aresponse_key, get_or_compute, response_key
+
+
+class CachedResponseMixin:
+    """
+    Cache the data of successful ``list`` and ``retrieve`` responses.
+
+    Keys combine the full request URL with the versions of the scopes
+    returned by ``get_cache_scopes``; writes bump those versions through
+    signals instead of deleting keys. Authentication and permission checks
+    still run on every request. Responses carry ``X-Cache: HIT|MISS|COALESCED``.
+    """
+
+    def get_cache_scopes(self):
+        """
+        Return the version scopes the current response depends on.
+        """
+        return [ALL_SCOPE, USERS_SCOPE]
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """
+        Return handler's response, or a cached copy of its data.
+        """
+        if not settings.RESPONSE_CACHE_ENABLED or request.method != 'GET':
+            return handler(request, *args, **kwargs)
+
+        produced = {}
+
+        def compute():
+            response = produced['response'] = handler(request, *args, **kwargs)
+            return response.data, response.status_code == 200
+
+        key = response_key(request, self.get_cache_scopes())
+        data, state = get_or_compute(key, compute)
+        return self.mark_cached(produced.get('response') or Response(data), key, state)
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        """
+        Async version of cached_response(); handler is a coroutine function.
+        """
+        if not settings.RESPONSE_CACHE_ENABLED or request.method != 'GET':
+            return await handler(request, *args, **kwargs)
+
+        produced = {}
+
+        async def compute():
+            response = produced['response'] = await handler(request, *args, **kwargs)
+            return response.data, response.status_code == 200
+
+        key = await aresponse_key(request, self.get_cache_scopes())
+        data, state = await aget_or_compute(key, compute)
+        return self.mark_cached(produced.get('response') or Response(data), key, state)
+
+    def mark_cached(self, response, key, state):
+        response['X-Cache'] = state.upper()
+        if response.status_code == 200:
+            # Lets CompressionMiddleware store the compressed body alongside the data.
+            response.response_cache_key = key
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(super().aretrieve, request, *args, **kwargs)
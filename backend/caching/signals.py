@@ -0,0 +1,85 @@
+"""
+Signal handlers that bump response cache versions on writes.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from comments.models import Comment
+from issues.models import Issue
+from issues.signals import is_bulk_deleting, issues_bulk_written
+from projects.models import Project
+from .store import ALL_SCOPE, USERS_SCOPE, bump_versions, project_scope
+
+User = get_user_model()
+
+
+def issue_project_ids(*issue_ids):
+    return Issue.objects.filter(pk__in=[pk for pk in issue_ids if pk is not None]).values_list(
+        'project_id', flat=True
+    )
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_written(sender, instance, **kwargs):
+    bump_versions(ALL_SCOPE, project_scope(instance.pk))
+
+
+@receiver(post_save, sender=Issue)
+def issue_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_versions(
+        ALL_SCOPE,
+        project_scope(instance.project_id),
+        project_scope(instance.get_loaded_value('project_id') or instance.project_id),
+    )
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted(sender, instance, **kwargs):
+    if is_bulk_deleting():
+        return
+    bump_versions(ALL_SCOPE, project_scope(instance.project_id))
+
+
+@receiver(issues_bulk_written)
+def issues_bulk_written_invalidated(sender, created, updated, deleted=(), **kwargs):
+    project_ids = {issue.project_id for issue in [*created, *deleted]}
+    for issue, changes in updated:
+        project_ids.add(issue.project_id)
+        if 'project_id' in changes:
+            project_ids.add(changes['project_id'][0])
+    bump_versions(ALL_SCOPE, *(project_scope(project_id) for project_id in project_ids))
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    project_ids = issue_project_ids(instance.issue_id, instance.get_loaded_value('issue_id'))
+    bump_versions(ALL_SCOPE, *(project_scope(project_id) for project_id in project_ids))
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    """
+    Invalidate the comment's project, unless its issue or project is being deleted too.
+    """
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if isinstance(origin, (Issue, Project)) or origin in (Issue, Project):
+        return
+    bump_versions(ALL_SCOPE, *(project_scope(project_id) for project_id in issue_project_ids(instance.issue_id)))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_written(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidate responses embedding user details, except for login timestamp updates.
+    """
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_versions(USERS_SCOPE)
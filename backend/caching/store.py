@@ -0,0 +1,275 @@
+"""
+Versioned response cache with single-flight fills and hit/miss counters.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+CACHE_ALIAS = 'responses'
+
+# Scopes a cached response can depend on. ALL_SCOPE changes on any project,
+# issue or comment write; project scopes only on writes inside that project.
+ALL_SCOPE = 'all'
+USERS_SCOPE = 'users'
+
+STATS = ('hits', 'misses', 'coalesced')
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+# Async fills in flight, keyed by (event loop, key); only touched from the loop.
+_async_inflight = {}
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def project_scope(project_id):
+    return f'project:{project_id}'
+
+
+def _version_key(scope):
+    return f'rc:version:{scope}'
+
+
+def _seed():
+    # A version recreated after eviction starts from the clock rather than 1,
+    # so it can never line up with entries cached under an older value.
+    return time.time_ns() // 1000
+
+
+def _incr(cache, key, initial):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, initial, timeout=None):
+            return initial
+        return cache.incr(key)
+
+
+async def _aincr(cache, key, initial):
+    try:
+        return await cache.aincr(key)
+    except ValueError:
+        if await cache.aadd(key, initial, timeout=None):
+            return initial
+        return await cache.aincr(key)
+
+
+def get_versions(scopes):
+    """
+    Return the current version of each scope, creating missing ones.
+    """
+    cache = get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _seed(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+async def aget_versions(scopes):
+    """
+    Async version of get_versions().
+    """
+    cache = get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, _seed(), timeout=None)
+            found[key] = await cache.aget(key)
+    return [found[key] for key in keys]
+
+
+def _bump_now(scopes):
+    cache = get_cache()
+    for scope in scopes:
+        _incr(cache, _version_key(scope), _seed())
+
+
+def bump_versions(*scopes):
+    """
+    Invalidate every response cached under any of the given scopes.
+
+    Versions are bumped immediately and again on commit, so a request that
+    re-cached pre-commit data in between is invalidated as well.
+    """
+    scopes = {scope for scope in scopes if scope is not None}
+    if not scopes:
+        return
+    _bump_now(scopes)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump_now(scopes))
+
+
+def response_key(request, scopes):
+    """
+    Build the cache key for a request from its full URL and scope versions.
+    """
+    return _response_key(request, scopes, get_versions(scopes))
+
+
+async def aresponse_key(request, scopes):
+    """
+    Async version of response_key().
+    """
+    return _response_key(request, scopes, await aget_versions(scopes))
+
+
+def _response_key(request, scopes, versions):
+    parts = [request.build_absolute_uri()]
+    parts.extend(f'{scope}={version}' for scope, version in zip(scopes, versions))
+    return 'rc:response:' + hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def record(stat):
+    _incr(get_cache(), f'rc:stats:{stat}', 1)
+
+
+async def arecord(stat):
+    await _aincr(get_cache(), f'rc:stats:{stat}', 1)
+
+
+def get_stats():
+    cache = get_cache()
+    values = cache.get_many([f'rc:stats:{stat}' for stat in STATS])
+    return {stat: values.get(f'rc:stats:{stat}', 0) for stat in STATS}
+
+
+def reset_stats():
+    get_cache().delete_many([f'rc:stats:{stat}' for stat in STATS])
+
+
+def _wait_for(cache, key, timeout):
+    """
+    Poll for a value another process is filling, up to timeout seconds.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        delay = min(delay * 2, 0.1)
+    return None
+
+
+async def _await_for(cache, key, timeout):
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while time.monotonic() < deadline:
+        await asyncio.sleep(delay)
+        value = await cache.aget(key)
+        if value is not None:
+            return value
+        delay = min(delay * 2, 0.1)
+    return None
+
+
+def get_or_compute(key, compute):
+    """
+    Return (value, state) for key, calling compute() at most once per miss.
+
+    compute returns (value, cacheable). State is ``hit``, ``miss`` or
+    ``coalesced`` (another caller filled the key while this one waited).
+    Concurrent callers in this process wait on the first one; other processes
+    are held off by a lock key added to the cache itself.
+    """
+    cache = get_cache()
+    value = cache.get(key)
+    if value is not None:
+        record('hits')
+        return value, 'hit'
+
+    timeout = settings.RESPONSE_CACHE_LOCK_TIMEOUT
+    with _inflight_lock:
+        event = _inflight.get(key)
+        leader = event is None
+        if leader:
+            event = _inflight[key] = threading.Event()
+    if not leader:
+        event.wait(timeout)
+        value = cache.get(key)
+        if value is not None:
+            record('coalesced')
+            return value, 'coalesced'
+
+    record('misses')
+    lock_key = f'{key}:lock'
+    locked = cache.add(lock_key, 1, timeout=timeout)
+    try:
+        if not locked:
+            value = _wait_for(cache, key, timeout)
+            if value is not None:
+                return value, 'coalesced'
+        value, cacheable = compute()
+        if cacheable:
+            cache.set(key, value, settings.RESPONSE_CACHE_TTL)
+        return value, 'miss'
+    finally:
+        if locked:
+            cache.delete(lock_key)
+        if leader:
+            with _inflight_lock:
+                del _inflight[key]
+            event.set()
+
+
+async def aget_or_compute(key, compute):
+    """
+    Async version of get_or_compute(); compute is a coroutine function.
+
+    Waiting callers sleep on the event loop instead of blocking a thread.
+    Callers in the same event loop wait on the first one; everyone else,
+    including sync callers in this process, on the cache lock key.
+    """
+    cache = get_cache()
+    value = await cache.aget(key)
+    if value is not None:
+        await arecord('hits')
+        return value, 'hit'
+
+    timeout = settings.RESPONSE_CACHE_LOCK_TIMEOUT
+    loop = asyncio.get_running_loop()
+    inflight_key = (loop, key)
+    event = _async_inflight.get(inflight_key)
+    leader = event is None
+    if leader:
+        event = _async_inflight[inflight_key] = asyncio.Event()
+    else:
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        value = await cache.aget(key)
+        if value is not None:
+            await arecord('coalesced')
+            return value, 'coalesced'
+
+    await arecord('misses')
+    lock_key = f'{key}:lock'
+    locked = await cache.aadd(lock_key, 1, timeout=timeout)
+    try:
+        if not locked:
+            value = await _await_for(cache, key, timeout)
+            if value is not None:
+                return value, 'coalesced'
+        value, cacheable = await compute()
+        if cacheable:
+            await cache.aset(key, value, settings.RESPONSE_CACHE_TTL)
+        return value, 'miss'
+    finally:
+        if locked:
+            await cache.adelete(lock_key)
+        if leader:
+            del _async_inflight[inflight_key]
+            event.set()
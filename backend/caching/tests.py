@@ -0,0 +1,288 @@
+"""
+Tests for caching app.
+"""
+import threading
+import time
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from comments.models import Comment
+from issues.models import Issue
+from projects.models import Project
+from .store import get_or_compute, get_stats
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """
+    Test versioned caching of project and issue responses.
+    """
+
+    def test_repeat_list_is_served_from_cache(self, authenticated_client, issue):
+        """
+        Test that a repeated list skips the queries of the first one.
+        """
+        client, user = authenticated_client
+        with CaptureQueriesContext(connection) as cold:
+            first = client.get('/api/projects/')
+        with CaptureQueriesContext(connection) as warm:
+            second = client.get('/api/projects/')
+
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT'
+        assert second.json() == first.json()
+        assert len(warm) < len(cold)
+
+    def test_write_invalidates_only_its_project(self, authenticated_client, project, user):
+        """
+        Test that an issue write bumps its own project's version and leaves others cached.
+        """
+        client, user = authenticated_client
+        other = Project.objects.create(name='Other', description='', created_by=user)
+        client.get(f'/api/projects/{project.id}/issues/')
+        client.get(f'/api/projects/{other.id}/issues/')
+
+        Issue.objects.create(title='New', description='', project=project, reporter=user)
+
+        response = client.get(f'/api/projects/{project.id}/issues/')
+        assert response['X-Cache'] == 'MISS'
+        assert [row['title'] for row in response.json()] == ['New']
+        assert client.get(f'/api/projects/{other.id}/issues/')['X-Cache'] == 'HIT'
+        assert client.get('/api/projects/')['X-Cache'] == 'MISS'
+
+    def test_comment_and_bulk_writes_invalidate(self, authenticated_client, issue, user):
+        """
+        Test that comment writes and bulk issue writes refresh cached issues.
+        """
+        client, user = authenticated_client
+        url = f'/api/issues/?project_id={issue.project_id}'
+        client.get(url)
+
+        Comment.objects.create(content='Hi', issue=issue, author=user)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['comment_count'] == 1
+
+        client.post('/api/issues/bulk/', {'status': [{'id': issue.id, 'status': 'closed'}]}, format='json')
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['status'] == 'closed'
+
+    def test_user_changes_invalidate(self, authenticated_client, issue, user):
+        """
+        Test that profile edits refresh responses embedding users but logins do not.
+        """
+        client, user = authenticated_client
+        client.get(f'/api/issues/{issue.id}/')
+
+        user.save(update_fields=['last_login'])
+        assert client.get(f'/api/issues/{issue.id}/')['X-Cache'] == 'HIT'
+
+        user.first_name = 'Renamed'
+        user.save()
+        response = client.get(f'/api/issues/{issue.id}/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['reporter_name'] == 'Renamed User'
+
+    def test_errors_are_not_cached(self, authenticated_client):
+        """
+        Test that missing objects are looked up again every time.
+        """
+        client, user = authenticated_client
+        assert client.get('/api/issues/999/').status_code == status.HTTP_404_NOT_FOUND
+        assert get_stats()['misses'] == 1
+        client.get('/api/issues/999/')
+        assert get_stats() == {'hits': 0, 'misses': 2, 'coalesced': 0}
+
+    def test_cache_can_be_disabled(self, authenticated_client, settings):
+        """
+        Test that RESPONSE_CACHE_ENABLED turns caching off.
+        """
+        settings.RESPONSE_CACHE_ENABLED = False
+        client, user = authenticated_client
+        client.get('/api/projects/')
+        assert 'X-Cache' not in client.get('/api/projects/')
+
+    def test_stats_command(self, authenticated_client, capsys):
+        """
+        Test the response_cache_stats command.
+        """
+        client, user = authenticated_client
+        client.get('/api/projects/')
+        client.get('/api/projects/')
+        call_command('response_cache_stats', '--reset')
+        output = capsys.readouterr().out
+        assert 'hits       1' in output
+        assert 'hit ratio  50.0%' in output
+        assert get_stats()['hits'] == 0
+
+
+class TestSingleFlight:
+    """
+    Test stampede protection on cold keys.
+    """
+
+    def test_concurrent_misses_compute_once(self):
+        """
+        Test that concurrent callers of a cold key share one computation.
+        """
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'value': 42}, True
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute('rc:test:cold', compute)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(value == {'value': 42} for value, _ in results)
+        assert sorted(state for _, state in results).count('miss') == 1
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+    """
+    Test ETag / Last-Modified validation on issue, comment and project endpoints.
+    """
+
+    def test_unchanged_issue_is_not_modified(self, authenticated_client, issue, django_assert_num_queries):
+        """
+        Test that a matching If-None-Match answers 304 after one aggregate query.
+        """
+        client, user = authenticated_client
+        response = client.get(f'/api/issues/{issue.id}/')
+        etag = response['ETag']
+        assert response['Last-Modified']
+
+        # user lookup, validator aggregate
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/issues/{issue.id}/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+
+        response = client.get(f'/api/issues/{issue.id}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_related_changes_change_etag(self, authenticated_client, issue, user):
+        """
+        Test that new comments and reporter edits produce a new ETag without touching ``updated_at``.
+        """
+        client, user = authenticated_client
+        etag = client.get(f'/api/issues/{issue.id}/')['ETag']
+
+        updated_at = issue.updated_at
+        Comment.objects.create(content='Hi', issue=issue, author=user)
+        response = client.get(f'/api/issues/{issue.id}/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['comment_count'] == 1
+        issue.refresh_from_db()
+        assert issue.updated_at == updated_at
+
+        etag = response['ETag']
+        user.first_name = 'Renamed'
+        user.save()
+        assert client.get(f'/api/issues/{issue.id}/', HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_list_validation_runs_no_query(self, authenticated_client, issue, django_assert_num_queries):
+        """
+        Test that a list is validated from scope versions, without aggregating its rows.
+        """
+        client, user = authenticated_client
+        etag = client.get('/api/issues/')['ETag']
+        # user lookup only
+        with django_assert_num_queries(1):
+            assert client.get('/api/issues/', HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+        issue.assignee.first_name = 'Renamed'
+        issue.assignee.save()
+        assert client.get('/api/issues/', HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_list_etag_tracks_deletes_and_query(self, authenticated_client, issue, comment):
+        """
+        Test list ETags across deletes and different query strings.
+        """
+        client, user = authenticated_client
+        url = f'/api/comments/?issue_id={issue.id}'
+        response = client.get(url)
+        etag = response['ETag']
+        assert 'Last-Modified' not in response
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+        assert client.get(url + '&cursor=', HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+        comment.delete()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_project_endpoints(self, authenticated_client, project, issue):
+        """
+        Test 304s on the project list and the project issues action.
+        """
+        client, user = authenticated_client
+        for url in ('/api/projects/', f'/api/projects/{project.id}/', f'/api/projects/{project.id}/issues/'):
+            etag = client.get(url)['ETag']
+            assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        etag = client.get(f'/api/projects/{project.id}/issues/')['ETag']
+        Issue.objects.create(title='Another', description='', project=project, reporter=user)
+        response = client.get(f'/api/projects/{project.id}/issues/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 2
+
+    def test_if_match_guards_updates(self, authenticated_client, issue):
+        """
+        Test that PATCH with a stale If-Match fails and a current one succeeds.
+        """
+        client, user = authenticated_client
+        etag = client.get(f'/api/issues/{issue.id}/')['ETag']
+
+        response = client.patch(f'/api/issues/{issue.id}/', {'title': 'First'}, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        new_etag = response['ETag']
+        assert new_etag != etag
+
+        response = client.patch(f'/api/issues/{issue.id}/', {'title': 'Second'}, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        issue.refresh_from_db()
+        assert issue.title == 'First'
+        assert client.get(f'/api/issues/{issue.id}/')['ETag'] == new_etag
+
+    def test_if_match_guards_status_and_assignee_actions(self, authenticated_client, issue, another_user, monkeypatch):
+        """
+        Test that update_status and assign honour If-Match, checking it under a row lock in the write's transaction.
+        """
+        from django.db import connection
+        from issues.views import IssueViewSet
+        client, user = authenticated_client
+        calls = []
+        lock = IssueViewSet.lock_conditional_object
+
+        def recording_lock(view):
+            calls.append((view.action, bool(connection.savepoint_ids)))
+            return lock(view)
+        monkeypatch.setattr(IssueViewSet, 'lock_conditional_object', recording_lock)
+
+        url = f'/api/issues/{issue.id}/'
+        etag = client.get(url)['ETag']
+        response = client.patch(url + 'update_status/', {'status': 'closed'}, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] == client.get(url)['ETag'] != etag
+        response = client.patch(url + 'assign/', {'assignee_id': user.id}, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        issue.refresh_from_db()
+        assert issue.assignee_id == another_user.id
+
+        response = client.patch(url + 'assign/', {'assignee_id': user.id}, format='json', HTTP_IF_MATCH=client.get(url)['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+        assert client.patch(url + 'update_status/', {'status': 'open'}, format='json').status_code == status.HTTP_200_OK
+        assert calls == [('update_status', True), ('assign', True), ('assign', True), ('update_status', True)]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0002_rename_comments_co_issue_idx_comments_co_issue_i_25b7b6_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['issue', '-created_at', '-id'], name='comments_co_issue_i_710a88_idx'),
+        ),
+    ]
@@ -1,7 +1,7 @@
 """
 Models for comments app.
 """
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -17,9 +17,13 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Values remembered at load time so signal handlers can tell what changed.
+    TRACKED_FIELDS = ('issue_id', 'content')
+
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         indexes = [
+            models.Index(fields=['issue', '-created_at', '-id']),
             models.Index(fields=['issue']),
             models.Index(fields=['author']),
             models.Index(fields=['created_at']),
@@ -27,3 +31,32 @@ class Comment(models.Model):
 
     def __str__(self):
         return f'Comment by {self.author} on {self.issue}'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember tracked field values so changes can be detected on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_fields()
+        return instance
+
+    def _remember_tracked_fields(self):
+        self._loaded_values = {name: self.__dict__[name] for name in self.TRACKED_FIELDS if name in self.__dict__}
+
+    def get_loaded_value(self, attname):
+        """
+        Return the value a tracked field had when last loaded or saved.
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        if attname in loaded:
+            return loaded[attname]
+        return getattr(self, attname)
+
+    def save(self, *args, **kwargs):
+        """
+        Save the comment and its counter updates in one transaction.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._remember_tracked_fields()
@@ -2,6 +2,7 @@
 Serializers for comments app.
 """
 from rest_framework import serializers
+from bug_tracking.values import ValuesSerializer, full_name
 from .models import Comment
 
 
@@ -16,3 +17,13 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ('id', 'content', 'issue', 'author', 'author_name', 'author_email', 'created_at', 'updated_at')
         read_only_fields = ('id', 'author', 'created_at', 'updated_at')
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """
+    Read-only CommentSerializer output built from values rows.
+    """
+    serializer_class = CommentSerializer
+    computed_fields = {
+        'author_name': (('author__first_name', 'author__last_name'), full_name),
+    }
@@ -0,0 +1,48 @@
+"""
+Signal handlers for comments app.
+"""
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from issues.models import Issue
+from projects.models import Project
+from .models import Comment
+
+
+def adjust_comment_count(issue_id, delta):
+    """
+    Atomically shift an issue's denormalized comment counter.
+    """
+    if issue_id is None or not delta:
+        return
+    Issue.objects.filter(pk=issue_id).update(comment_count=F('comment_count') + delta)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    """
+    Count new comments and move the count along with comments changing issue.
+    """
+    if raw:
+        return
+    if created:
+        adjust_comment_count(instance.issue_id, 1)
+        return
+    previous_issue_id = instance.get_loaded_value('issue_id')
+    if previous_issue_id != instance.issue_id:
+        adjust_comment_count(previous_issue_id, -1)
+        adjust_comment_count(instance.issue_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    """
+    Uncount deleted comments, unless their issue or project is going away too.
+    """
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if isinstance(origin, Issue) and origin.pk == instance.issue_id:
+        return
+    if isinstance(origin, Project) or origin in (Issue, Project):
+        return
+    adjust_comment_count(instance.issue_id, -1)
@@ -102,6 +102,26 @@ class TestCommentEndpoints:
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert not Comment.objects.filter(id=comment.id).exists()
 
+    def test_queryset_deletes_skip_per_comment_work(self, user):
+        """
+        Test that comments removed with a bulk issue or project delete cost no queries of their own.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def delete_cost(model, comments):
+            project = Project.objects.create(name='Doomed', description='', created_by=user)
+            target = Issue.objects.create(title='Target', description='', project=project, reporter=user)
+            Comment.objects.bulk_create([Comment(content='Hi', issue=target, author=user) for _ in range(comments)])
+            pk = project.pk if model is Project else target.pk
+            with CaptureQueriesContext(connection) as captured:
+                model.objects.filter(pk=pk).delete()
+            assert not Comment.objects.filter(issue=target).exists()
+            return len(captured)
+
+        assert delete_cost(Issue, 1) == delete_cost(Issue, 4)
+        assert delete_cost(Project, 1) == delete_cost(Project, 4)
+
     def test_create_comment_for_issue(self, authenticated_client, issue):
         """
         Test creating a comment for a specific issue via standard endpoint.
@@ -134,6 +154,22 @@ class TestCommentEndpoints:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] == 2
 
+    def test_list_comments_by_issue_cursor(self, authenticated_client, issue, user):
+        """
+        Test keyset pagination of an issue's comments.
+        """
+        api_client, _ = authenticated_client
+        comments = [
+            Comment.objects.create(content=f'Comment {index}', issue=issue, author=user)
+            for index in range(3)
+        ]
+        response = api_client.get(f'/api/comments/?issue_id={issue.id}&cursor=&page_size=2')
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['id'] for row in response.data['results']] == [comments[2].id, comments[1].id]
+        response = api_client.get(response.data['next'])
+        assert [row['id'] for row in response.data['results']] == [comments[0].id]
+        assert response.data['next'] is None
+
     def test_create_comment_unauthenticated(self, api_client, issue):
         """
         Test creating a comment without authentication.
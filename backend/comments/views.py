@@ -6,17 +6,27 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
+from bug_tracking.pagination import KeysetPagination
+from bug_tracking.sparse import SparseFieldsMixin
+from bug_tracking.streaming import StreamingListMixin
+from bug_tracking.values import ValuesReadMixin
+from caching.conditional import ConditionalRequestMixin
 from .models import Comment
-from .serializers import CommentSerializer
+from .serializers import CommentSerializer, CommentValuesSerializer
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ConditionalRequestMixin, StreamingListMixin, SparseFieldsMixin, ValuesReadMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for Comment model.
     Provides CRUD operations for comments.
     """
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    conditional_timestamp_fields = ('updated_at', 'author__updated_at')
 
     def get_queryset(self):
         """
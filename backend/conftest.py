@@ -3,12 +3,22 @@ Pytest configuration and fixtures.
 """
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start every test with empty caches so cached responses never leak between tests.
+    """
+    for cache in caches.all():
+        cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """
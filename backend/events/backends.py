@@ -0,0 +1,70 @@
+"""
+Cross-worker transports for the event broker.
+
+``EVENTS_BACKEND`` names the class by dotted path. A backend is built with
+the broker's ``deliver(topics, event)`` and must call it in every worker
+that should see a published event.
+"""
+import threading
+import time
+
+import orjson
+from django.conf import settings
+
+
+class LocalBackend:
+    """
+    Deliver events inside this process only; enough for a single worker.
+    """
+    remote = False
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+
+    def subscribed(self, topics):
+        """
+        Called after a local subscription is added.
+        """
+
+    def publish(self, topics, event):
+        self.deliver(topics, event)
+
+
+class RedisBackend(LocalBackend):
+    """
+    Relay events between workers through one Redis pub/sub channel.
+
+    Each worker runs a single listener thread, started with its first
+    subscription, and fans out locally, so Redis load does not grow with
+    the number of watchers. Needs the ``redis`` package and ``EVENTS_REDIS_URL``.
+    """
+    remote = True
+    channel = 'bug-tracking:events'
+
+    def __init__(self, deliver):
+        super().__init__(deliver)
+        import redis
+        self.errors = redis.RedisError
+        self.client = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+        self.listener = None
+        self.lock = threading.Lock()
+
+    def subscribed(self, topics):
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target=self.listen, name='events-redis', daemon=True)
+                self.listener.start()
+
+    def publish(self, topics, event):
+        self.client.publish(self.channel, orjson.dumps({'topics': topics, 'event': event}))
+
+    def listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    payload = orjson.loads(message['data'])
+                    self.deliver(payload['topics'], payload['event'])
+            except self.errors:
+                time.sleep(1)
@@ -0,0 +1,165 @@
+"""
+In-process publish/subscribe for live issue and comment events.
+"""
+import asyncio
+import threading
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Sent in place of the events a subscription dropped for falling behind.
+RESET_EVENT = {'type': 'reset'}
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def issue_topic(issue_id):
+    return f'issue:{issue_id}'
+
+
+def project_topic(project_id):
+    return f'project:{project_id}'
+
+
+class Subscription:
+    """
+    Events waiting for one listener, pushed by the broker.
+
+    A listener more than ``max_pending`` events behind loses them and gets a
+    single ``reset`` event instead, telling the client to refetch.
+    """
+
+    def __init__(self, broker, topics, max_pending):
+        self.broker = broker
+        self.topics = tuple(topics)
+        self.max_pending = max_pending
+        self.pending = deque()
+        self.overflowed = False
+        self.ready = threading.Event()
+        # Set while an async listener waits: wakes its event loop on push.
+        self.wakeup = None
+        self.closed = False
+
+    def push(self, event):
+        if len(self.pending) >= self.max_pending:
+            self.pending.clear()
+            self.overflowed = True
+        else:
+            self.pending.append(event)
+        self.ready.set()
+        wakeup = self.wakeup
+        if wakeup is not None:
+            wakeup()
+
+    def drain(self):
+        """
+        Return and forget the pending events.
+        """
+        self.ready.clear()
+        events = []
+        if self.overflowed:
+            self.overflowed = False
+            events.append(RESET_EVENT)
+        while self.pending:
+            events.append(self.pending.popleft())
+        return events
+
+    def wait(self, timeout):
+        """
+        Block until events arrive or timeout seconds pass, then drain.
+        """
+        self.ready.wait(timeout)
+        return self.drain()
+
+    async def await_events(self, timeout):
+        """
+        Async version of wait(): sleep on the event loop instead of a thread.
+        """
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        self.wakeup = lambda: loop.call_soon_threadsafe(ready.set)
+        try:
+            if not self.ready.is_set():
+                await asyncio.wait_for(ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.wakeup = None
+        return self.drain()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Broker:
+    """
+    Fan events out to the local subscriptions of their topics.
+
+    ``publish`` goes through the ``EVENTS_BACKEND``, which calls ``deliver``
+    in every worker that should see the event. An idle subscription costs
+    one set entry per topic; topics nobody watches cost nothing.
+    """
+
+    def __init__(self, backend_path=None):
+        self.lock = threading.Lock()
+        self.subscribers = defaultdict(set)
+        self.backend = import_string(backend_path or settings.EVENTS_BACKEND)(self.deliver)
+
+    def subscribe(self, topics, max_pending=None):
+        subscription = Subscription(self, topics, max_pending or settings.EVENTS_MAX_PENDING)
+        with self.lock:
+            for topic in subscription.topics:
+                self.subscribers[topic].add(subscription)
+        self.backend.subscribed(subscription.topics)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for topic in subscription.topics:
+                listeners = self.subscribers.get(topic)
+                if listeners is not None:
+                    listeners.discard(subscription)
+                    if not listeners:
+                        del self.subscribers[topic]
+
+    def has_listeners(self, topics):
+        """
+        Return whether publishing to topics could reach anyone.
+        """
+        return self.backend.remote or any(topic in self.subscribers for topic in topics)
+
+    def publish(self, topics, event):
+        self.backend.publish(list(topics), event)
+
+    def deliver(self, topics, event):
+        """
+        Push event once to every local subscription of any of topics.
+        """
+        with self.lock:
+            targets = set()
+            for topic in topics:
+                targets.update(self.subscribers.get(topic, ()))
+        for subscription in targets:
+            subscription.push(event)
+
+
+def get_broker():
+    """
+    Return the process-wide broker, creating it on first use.
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = Broker()
+    return _broker
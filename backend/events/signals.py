@@ -0,0 +1,127 @@
+"""
+Signal handlers publishing committed issue and comment changes as live events.
+"""
+from functools import partial
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from comments.models import Comment
+from comments.serializers import CommentValuesSerializer
+from issues.models import Issue
+from issues.serializers import IssueValuesSerializer
+from issues.signals import issues_bulk_written
+from projects.models import Project
+from .broker import get_broker, issue_topic, project_topic
+
+
+def _issue_topics(issue_id, *project_ids):
+    return [issue_topic(issue_id)] + [project_topic(project_id) for project_id in dict.fromkeys(project_ids)]
+
+
+def publish_issues(action, targets):
+    """
+    Publish ``issue.<action>`` with the committed row of each (issue_id, topics) target.
+
+    Rows are read with one query, and only when someone may be listening.
+    """
+    broker = get_broker()
+    targets = [(issue_id, topics) for issue_id, topics in targets if broker.has_listeners(topics)]
+    if not targets:
+        return
+    serializer = IssueValuesSerializer()
+    rows = serializer.prepare(Issue.objects.filter(pk__in=[issue_id for issue_id, _ in targets]))
+    data = {row.id: serializer.to_representation(row) for row in rows}
+    for issue_id, topics in targets:
+        if issue_id in data:
+            row = data[issue_id]
+            broker.publish(topics, {'type': f'issue.{action}', 'issue': issue_id, 'project': row['project'], 'data': row})
+
+
+def publish_comment(action, comment_id, issue_id, project_id=None):
+    """
+    Publish ``comment.<action>`` to the comment's issue and project topics.
+    """
+    broker = get_broker()
+    if not broker.backend.remote and not broker.subscribers:
+        return
+    if project_id is None:
+        project_id = Issue.objects.filter(pk=issue_id).values_list('project_id', flat=True).first()
+    topics = _issue_topics(issue_id, project_id)
+    if not broker.has_listeners(topics):
+        return
+    event = {'type': f'comment.{action}', 'comment': comment_id, 'issue': issue_id, 'project': project_id}
+    if action != 'deleted':
+        serializer = CommentValuesSerializer()
+        row = serializer.prepare(Comment.objects.filter(pk=comment_id)).first()
+        if row is None:
+            return
+        event['data'] = serializer.to_representation(row)
+    broker.publish(topics, event)
+
+
+def publish(event, topics):
+    broker = get_broker()
+    if broker.has_listeners(topics):
+        broker.publish(topics, event)
+
+
+def _cached_project_id(comment):
+    """
+    Return the comment's project id if its issue is already loaded, else None.
+    """
+    return comment.issue.project_id if Comment.issue.is_cached(comment) else None
+
+
+@receiver(post_save, sender=Issue)
+def issue_saved_event(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    topics = _issue_topics(instance.pk, instance.get_loaded_value('project_id'), instance.project_id)
+    action = 'created' if created else 'updated'
+    transaction.on_commit(partial(publish_issues, action, [(instance.pk, topics)]))
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted_event(sender, instance, **kwargs):
+    event = {'type': 'issue.deleted', 'issue': instance.pk, 'project': instance.project_id}
+    transaction.on_commit(partial(publish, event, _issue_topics(instance.pk, instance.project_id)))
+
+
+@receiver(issues_bulk_written)
+def issues_bulk_event(sender, created, updated, **kwargs):
+    """
+    Publish a batch of issue writes after commit, reading their rows with one query per action.
+    """
+    if created:
+        targets = [(issue.pk, _issue_topics(issue.pk, issue.project_id)) for issue in created]
+        transaction.on_commit(partial(publish_issues, 'created', targets))
+    if updated:
+        targets = [
+            (issue.pk, _issue_topics(issue.pk, changes.get('project_id', (issue.project_id,))[0], issue.project_id))
+            for issue, changes in updated
+        ]
+        transaction.on_commit(partial(publish_issues, 'updated', targets))
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved_event(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    action = 'created' if created else 'updated'
+    project_id = _cached_project_id(instance)
+    transaction.on_commit(partial(publish_comment, action, instance.pk, instance.issue_id, project_id))
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted_event(sender, instance, origin=None, **kwargs):
+    """
+    Publish deleted comments, unless their issue or project is being deleted too.
+    """
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if isinstance(origin, (Issue, Project)) or origin in (Issue, Project):
+        return
+    project_id = _cached_project_id(instance)
+    transaction.on_commit(partial(publish_comment, 'deleted', instance.pk, instance.issue_id, project_id))
@@ -0,0 +1,97 @@
+"""
+Server-Sent Events responses fed by broker subscriptions.
+"""
+import time
+
+import orjson
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from bug_tracking.streaming import is_asgi_request
+from .broker import get_broker
+
+# Reconnection delay suggested to EventSource clients, in milliseconds.
+RETRY_MS = 3000
+
+
+def format_event(event):
+    return b'event: ' + event['type'].encode('ascii') + b'\ndata: ' + orjson.dumps(event) + b'\n\n'
+
+
+class EventStream:
+    """
+    Iterate a subscription as SSE frames, with comment heartbeats while idle.
+
+    The stream ends after ``EVENTS_STREAM_TIMEOUT`` seconds and clients
+    reconnect, so a worker is never held indefinitely. ``close()`` (called
+    by Django when the response is closed) releases the subscription even
+    if the body was never iterated.
+    """
+
+    def __init__(self, subscription, heartbeat=None, timeout=None):
+        self.subscription = subscription
+        self.heartbeat = settings.EVENTS_HEARTBEAT if heartbeat is None else heartbeat
+        self.timeout = settings.EVENTS_STREAM_TIMEOUT if timeout is None else timeout
+
+    def __iter__(self):
+        deadline = time.monotonic() + self.timeout
+        try:
+            yield b'retry: %d\n\n' % RETRY_MS
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = self.subscription.wait(min(self.heartbeat, remaining))
+                if events:
+                    yield b''.join(format_event(event) for event in events)
+                else:
+                    yield b': keep-alive\n\n'
+        finally:
+            self.close()
+
+    def close(self):
+        self.subscription.close()
+
+
+class AsyncEventStream(EventStream):
+    """
+    EventStream iterated on the event loop, for responses served over ASGI.
+
+    Idle listeners wait on the loop rather than in a thread each, so open
+    streams cost no threads.
+    """
+    # StreamingHttpResponse prefers __iter__ when both are present.
+    __iter__ = None
+
+    async def __aiter__(self):
+        deadline = time.monotonic() + self.timeout
+        try:
+            yield b'retry: %d\n\n' % RETRY_MS
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = await self.subscription.await_events(min(self.heartbeat, remaining))
+                if events:
+                    yield b''.join(format_event(event) for event in events)
+                else:
+                    yield b': keep-alive\n\n'
+        finally:
+            self.close()
+
+
+def event_stream_response(topics, request=None):
+    """
+    Subscribe to topics now and return a streaming ``text/event-stream`` response.
+
+    Subscribing before the body is streamed means no event committed after
+    the request arrived is missed. Requests served over ASGI get a stream
+    the server iterates asynchronously.
+    """
+    stream_class = EventStream
+    if is_asgi_request(request):
+        stream_class = AsyncEventStream
+    stream = stream_class(get_broker().subscribe(topics))
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
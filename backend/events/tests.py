@@ -0,0 +1,170 @@
+"""
+Tests for events app.
+"""
+import orjson
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from issues.models import Issue
+from .broker import RESET_EVENT, Broker, get_broker, issue_topic, project_topic
+
+
+def read_events(response):
+    """
+    Parse an SSE body into a list of event payloads, skipping comments and retry hints.
+    """
+    events = []
+    for frame in b''.join(response.streaming_content).split(b'\n\n'):
+        for line in frame.split(b'\n'):
+            if line.startswith(b'data: '):
+                events.append(orjson.loads(line[6:]))
+    return events
+
+
+class TestBroker:
+    """
+    Test local fan-out, unsubscription and overflow.
+    """
+
+    def test_fan_out_and_overflow(self):
+        """
+        Test that an event reaches each matching subscription once and slow readers get a reset.
+        """
+        broker = Broker('events.backends.LocalBackend')
+        both = broker.subscribe(['issue:1', 'project:1'])
+        other = broker.subscribe(['project:2'], max_pending=2)
+        broker.publish(['issue:1', 'project:1'], {'type': 'issue.updated'})
+        assert both.wait(0) == [{'type': 'issue.updated'}]
+        assert other.wait(0) == []
+
+        for index in range(3):
+            broker.publish(['project:2'], {'type': 'issue.created', 'issue': index})
+        broker.publish(['project:2'], {'type': 'issue.created', 'issue': 3})
+        assert other.wait(0) == [RESET_EVENT, {'type': 'issue.created', 'issue': 3}]
+
+        both.close()
+        other.close()
+        assert not broker.has_listeners(['issue:1', 'project:1', 'project:2'])
+        assert broker.subscribers == {}
+
+
+@pytest.mark.django_db
+class TestEventStreams:
+    """
+    Test the issue and project SSE endpoints.
+    """
+
+    @pytest.fixture(autouse=True)
+    def short_streams(self, settings):
+        settings.EVENTS_HEARTBEAT = 0.01
+        settings.EVENTS_STREAM_TIMEOUT = 0.1
+
+    def test_issue_stream_receives_committed_changes(self, authenticated_client, issue,
+                                                     django_capture_on_commit_callbacks):
+        """
+        Test issue and comment events carrying the committed rows.
+        """
+        api_client, _ = authenticated_client
+        response = api_client.get(f'/api/issues/{issue.id}/events/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/event-stream'
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(f'/api/issues/{issue.id}/update_status/', {'status': 'closed'}, format='json')
+        with django_capture_on_commit_callbacks(execute=True):
+            comment_id = api_client.post('/api/comments/', {'content': 'Live', 'issue': issue.id}).data['id']
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(f'/api/comments/{comment_id}/')
+        events = read_events(response)
+        assert [event['type'] for event in events] == ['issue.updated', 'comment.created', 'comment.deleted']
+        assert events[0]['data']['status'] == 'closed'
+        assert events[1]['data']['content'] == 'Live'
+        assert events[2] == {'type': 'comment.deleted', 'comment': comment_id, 'issue': issue.id,
+                             'project': issue.project_id}
+        assert not get_broker().has_listeners([issue_topic(issue.id)])
+
+    def test_project_stream_and_bulk_writes(self, authenticated_client, project, user,
+                                            django_capture_on_commit_callbacks):
+        """
+        Test that bulk creates, moves and deletes reach the project stream.
+        """
+        from projects.models import Project
+        api_client, _ = authenticated_client
+        other = Project.objects.create(name='Other', description='', created_by=user)
+        mover = Issue.objects.create(title='Mover', description='', project=project, reporter=user)
+        response = api_client.get(f'/api/projects/{project.id}/events/')
+        payload = {'create': [{'title': 'Bulk', 'description': 'Desc', 'project': project.id}]}
+        with django_capture_on_commit_callbacks(execute=True):
+            created_id = api_client.post('/api/issues/bulk/', payload, format='json').data['created'][0]['id']
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(f'/api/issues/{mover.id}/', {'project': other.id}, format='json')
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(f'/api/issues/{created_id}/')
+        events = read_events(response)
+        assert [(event['type'], event['issue'], event['project']) for event in events] == [
+            ('issue.created', created_id, project.id),
+            ('issue.updated', mover.id, other.id),
+            ('issue.deleted', created_id, project.id),
+        ]
+
+    def test_unwatched_and_rolled_back_writes_publish_nothing(self, authenticated_client, issue,
+                                                               django_capture_on_commit_callbacks):
+        """
+        Test that nothing is read for topics without listeners and rolled-back writes are not published.
+        """
+        from .signals import publish_issues
+        with CaptureQueriesContext(connection) as captured:
+            publish_issues('updated', [(issue.id, [issue_topic(issue.id), project_topic(issue.project_id)])])
+        assert len(captured) == 0
+
+        subscription = get_broker().subscribe([issue_topic(issue.id)])
+        with django_capture_on_commit_callbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    issue.status = 'closed'
+                    issue.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        assert subscription.wait(0) == []
+        subscription.close()
+
+    def test_stream_requires_access(self, api_client, issue):
+        """
+        Test that unauthenticated clients get an error event instead of a stream.
+        """
+        response = api_client.get(f'/api/issues/{issue.id}/events/')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.content.startswith(b'event: error\ndata: ')
+
+    def test_asgi_stream_waits_on_the_event_loop(self, settings, user, issue):
+        """
+        Test that streams served over ASGI are async iterables woken by publishes from other threads.
+        """
+        import threading
+        import time
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+        from rest_framework_simplejwt.tokens import RefreshToken
+        settings.ROOT_URLCONF = 'bug_tracking.asgi_urls'
+        settings.EVENTS_HEARTBEAT = 5
+        settings.EVENTS_STREAM_TIMEOUT = 0.5
+        token = RefreshToken.for_user(user).access_token
+        event = {'type': 'issue.updated', 'issue': issue.id}
+
+        async def stream():
+            response = await AsyncClient().get(
+                f'/api/issues/{issue.id}/events/', headers={'Authorization': f'Bearer {token}'}
+            )
+            threading.Timer(0.05, get_broker().publish, ([issue_topic(issue.id)], event)).start()
+            start = time.monotonic()
+            async for chunk in response.streaming_content:
+                if b'data: ' in chunk:
+                    return response, chunk, time.monotonic() - start
+
+        response, chunk, elapsed = async_to_sync(stream)()
+        assert response.is_async
+        assert chunk.startswith(b'event: issue.updated\ndata: ')
+        assert orjson.loads(chunk.split(b'data: ', 1)[1]) == event
+        assert elapsed < 0.4
+        assert not get_broker().has_listeners([issue_topic(issue.id)])
@@ -0,0 +1,263 @@
+"""
+Validate GraphQL operations against the schema and bind their variables.
+"""
+from .language import Field, FragmentSpread, GraphQLError, Variable
+from .schema import INPUT_TYPES, QUERY, TYPES, List, coerce_input, named_type
+
+TYPENAME = '__typename'
+# Field nodes a document may expand to, counting every fragment spread;
+# bounds the work fragments that spread each other repeatedly can cause.
+MAX_FIELD_NODES = 5000
+
+
+class Selection:
+    """
+    A validated field: its response key, schema definition, arguments and sub-selections.
+
+    ``arguments`` holds the literal argument nodes in a compiled operation
+    and the coerced values once bound to variables. ``children`` is None
+    for scalar fields.
+    """
+    __slots__ = ('key', 'name', 'definition', 'arguments', 'children', 'location')
+
+    def __init__(self, key, name, definition, arguments, children, location):
+        self.key = key
+        self.name = name
+        self.definition = definition
+        self.arguments = arguments
+        self.children = children
+        self.location = location
+
+
+def _signature(value):
+    if isinstance(value, Variable):
+        return ('$', value.name)
+    if isinstance(value, list):
+        return tuple(_signature(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((name, _signature(item)) for name, item in value.items()))
+    return (type(value).__name__, value)
+
+
+def _variables_in(value):
+    if isinstance(value, Variable):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _variables_in(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _variables_in(item)
+
+
+def _substitute(value, variables):
+    if isinstance(value, Variable):
+        return variables.get(value.name)
+    if isinstance(value, list):
+        return [_substitute(item, variables) for item in value]
+    return value
+
+
+class CompiledOperation:
+    """
+    An operation checked against the schema once, reusable with any variables.
+    """
+
+    def __init__(self, variables, defaults, selections):
+        self.variables = variables
+        self.defaults = defaults
+        self.selections = selections
+        self.depth = self.measure_depth(selections)
+
+    @classmethod
+    def measure_depth(cls, selections):
+        return max((1 + cls.measure_depth(field.children) for field in selections if field.children), default=0)
+
+    def bind(self, variables):
+        """
+        Return the selections with arguments coerced, taking variable values from a dict.
+        """
+        if not isinstance(variables, dict):
+            raise GraphQLError('variables must be an object.')
+        values = {}
+        for name, definition in self.variables.items():
+            if name in variables:
+                try:
+                    values[name] = coerce_input(definition.type, variables[name], from_variable=True)
+                except ValueError as error:
+                    raise GraphQLError(f'Variable "${name}" got an invalid value: {error}', definition.location)
+            elif name in self.defaults:
+                values[name] = self.defaults[name]
+            elif definition.type.endswith('!'):
+                raise GraphQLError(
+                    f'Variable "${name}" of required type "{definition.type}" was not provided.', definition.location
+                )
+        return self.bind_selections(self.selections, values)
+
+    def bind_selections(self, selections, values):
+        bound = []
+        for field in selections:
+            arguments = {}
+            for name, argument in (field.definition.arguments if field.definition else {}).items():
+                node = field.arguments.get(name)
+                if node is None or (isinstance(node, Variable) and node.name not in values):
+                    arguments[name] = argument.default
+                    continue
+                try:
+                    arguments[name] = coerce_input(
+                        argument.type, _substitute(node, values), from_variable=isinstance(node, Variable)
+                    )
+                except ValueError as error:
+                    raise GraphQLError(f'Argument "{name}" got an invalid value: {error}', field.location)
+            if isinstance(field.definition, List):
+                field.definition.check_arguments(arguments, field.location)
+            children = None if field.children is None else self.bind_selections(field.children, values)
+            bound.append(Selection(field.key, field.name, field.definition, arguments, children, field.location))
+        return bound
+
+
+def query_cost(selections, multiplier=1):
+    """
+    Return the most objects bound selections can return.
+
+    A list field returns up to ``first`` objects for every parent and an
+    object field one, so nested lists multiply. Scalars are free.
+    """
+    cost = 0
+    for field in selections:
+        if field.children is None:
+            continue
+        count = multiplier
+        if isinstance(field.definition, List):
+            count *= field.arguments['first']
+        cost += count + query_cost(field.children, count)
+    return cost
+
+
+class Compiler:
+    """
+    Check an operation against the schema and flatten its fragments into Selections.
+    """
+
+    def __init__(self, document):
+        self.fragments = document.fragments
+        self.variables = {}
+        self.defaults = {}
+        self.field_nodes = 0
+
+    def compile(self, operation):
+        if operation.kind != 'query':
+            raise GraphQLError(f'{operation.kind.capitalize()} operations are not supported.', operation.location)
+        for definition in operation.variables:
+            if definition.name in self.variables:
+                raise GraphQLError(f'There can be only one variable named "${definition.name}".', definition.location)
+            if named_type(definition.type) not in INPUT_TYPES:
+                raise GraphQLError(f'Unknown type "{named_type(definition.type)}".', definition.location)
+            if definition.default is not None:
+                try:
+                    self.defaults[definition.name] = coerce_input(definition.type, definition.default)
+                except ValueError as error:
+                    raise GraphQLError(f'Variable "${definition.name}" has an invalid default: {error}', definition.location)
+            self.variables[definition.name] = definition
+        fields = self.collect(QUERY, operation.selections, (), {})
+        return CompiledOperation(self.variables, self.defaults, self.selection_set(QUERY, fields))
+
+    def collect(self, object_type, nodes, path, fields):
+        """
+        Group the fields of nodes, expanding fragments, by response key into fields.
+
+        Each field is kept with the fragments it was reached through, so a
+        fragment spread inside its own subtree is caught at any depth.
+        """
+        for node in nodes:
+            if isinstance(node, Field):
+                self.field_nodes += 1
+                if self.field_nodes > MAX_FIELD_NODES:
+                    raise GraphQLError(f'The document expands to more than {MAX_FIELD_NODES} fields.', node.location)
+                fields.setdefault(node.response_key, []).append((node, path))
+                continue
+            if isinstance(node, FragmentSpread):
+                fragment = self.fragments.get(node.name)
+                if fragment is None:
+                    raise GraphQLError(f'Unknown fragment "{node.name}".', node.location)
+                if node.name in path:
+                    raise GraphQLError(f'Cannot spread fragment "{node.name}" within itself.', node.location)
+                node, path = fragment, path + (node.name,)
+            if node.type_condition not in (None, object_type.name):
+                raise GraphQLError(
+                    f'Fragment on "{node.type_condition}" cannot be spread on type "{object_type.name}".', node.location
+                )
+            self.collect(object_type, node.selections, path, fields)
+        return fields
+
+    def selection_set(self, object_type, fields):
+        return [self.field(object_type, key, group) for key, group in fields.items()]
+
+    def field(self, object_type, key, group):
+        node = group[0][0]
+        for other, _ in group[1:]:
+            if other.name != node.name or _signature(other.arguments) != _signature(node.arguments):
+                raise GraphQLError(
+                    f'Fields "{key}" conflict because they select different fields or arguments.', other.location
+                )
+        selected = [other.selections is not None for other, _ in group]
+        if node.name == TYPENAME:
+            if node.arguments or any(selected):
+                raise GraphQLError(f'Field "{TYPENAME}" takes no arguments or subfields.', node.location)
+            return Selection(key, node.name, None, {}, None, node.location)
+
+        definition = object_type.fields.get(node.name)
+        if definition is None:
+            raise GraphQLError(f'Cannot query field "{node.name}" on type "{object_type.name}".', node.location)
+        self.check_arguments(definition, node)
+
+        child_type = TYPES.get(definition.type)
+        if child_type is None:
+            if any(selected):
+                raise GraphQLError(
+                    f'Field "{node.name}" must not have a selection since type "{definition.type}" has no subfields.',
+                    node.location,
+                )
+            return Selection(key, node.name, definition, node.arguments, None, node.location)
+        if not all(selected):
+            raise GraphQLError(
+                f'Field "{node.name}" of type "{definition.type}" must have a selection of subfields.', node.location
+            )
+        fields = {}
+        for other, path in group:
+            self.collect(child_type, other.selections, path, fields)
+        children = self.selection_set(child_type, fields)
+        return Selection(key, node.name, definition, node.arguments, children, node.location)
+
+    def check_arguments(self, definition, node):
+        for name, value in node.arguments.items():
+            argument = definition.arguments.get(name)
+            if argument is None:
+                raise GraphQLError(f'Unknown argument "{name}" on field "{node.name}".', node.location)
+            variables = list(_variables_in(value))
+            for variable in variables:
+                if variable.name not in self.variables:
+                    raise GraphQLError(f'Variable "${variable.name}" is not defined.', variable.location)
+            if not variables:
+                try:
+                    coerce_input(argument.type, value)
+                except ValueError as error:
+                    raise GraphQLError(f'Argument "{name}" got an invalid value: {error}', node.location)
+        for name, argument in definition.arguments.items():
+            if argument.type.endswith('!') and argument.default is None and name not in node.arguments:
+                raise GraphQLError(f'Field "{node.name}" argument "{name}" is required.', node.location)
+
+
+def compile_operation(document, operation_name=None):
+    """
+    Return the CompiledOperation for the named (or only) operation of a parsed document.
+    """
+    if operation_name is None:
+        if len(document.operations) > 1:
+            raise GraphQLError('operationName is required when the document has several operations.')
+        operation = next(iter(document.operations.values()))
+    else:
+        operation = document.operations.get(operation_name)
+        if operation is None:
+            raise GraphQLError(f'Unknown operation named "{operation_name}".')
+    return Compiler(document).compile(operation)
@@ -0,0 +1,117 @@
+"""
+Batched execution of bound GraphQL selections.
+"""
+from collections import defaultdict
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from .compiler import TYPENAME
+from .schema import QUERY, TYPES, Column, List, Lookup, Related, Viewer
+
+
+def row_columns(object_type, selections, *extra):
+    """
+    Return the columns rows of a type need to resolve selections.
+    """
+    columns = {'id', *extra}
+    for field in selections:
+        if isinstance(field.definition, (Column, Related)):
+            columns.add(field.definition.column)
+    return tuple(sorted(columns))
+
+
+class Executor:
+    """
+    Resolve selections level by level, one query per object or list field.
+
+    Each field is resolved for all of its parent rows at once: the foreign
+    keys of a whole level are fetched with one ``IN`` query and a reverse
+    list with one windowed query for every parent, so the number of
+    statements depends on the shape of the query, never on the number of
+    rows. Rows already fetched for a type are reused within the request.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.loaded = {}
+
+    def execute(self, selections):
+        return self.resolve(QUERY, [{}], selections)[0]
+
+    def resolve(self, object_type, rows, selections):
+        results = [{} for _ in rows]
+        for field in selections:
+            definition = field.definition
+            if field.name == TYPENAME:
+                values = [object_type.name] * len(rows)
+            elif isinstance(definition, Column):
+                values = [definition.serialize(row[definition.column]) for row in rows]
+            elif isinstance(definition, List):
+                values = self.resolve_list(field, rows)
+            else:
+                values = self.resolve_object(field, rows)
+            for result, value in zip(results, values):
+                result[field.key] = value
+        return results
+
+    def fetch(self, object_type, ids, columns):
+        """
+        Return {id: row or None} for ids, querying only those not loaded yet.
+        """
+        known = self.loaded.setdefault((object_type.name, columns), {})
+        missing = ids - known.keys()
+        if missing:
+            known.update(dict.fromkeys(missing))
+            for row in object_type.model.objects.filter(pk__in=missing).order_by().values(*columns):
+                known[row['id']] = row
+        return {pk: known[pk] for pk in ids}
+
+    def references(self, field, rows):
+        definition = field.definition
+        if isinstance(definition, Viewer):
+            return [self.user.pk]
+        if isinstance(definition, Lookup):
+            return [field.arguments['id']]
+        return [row[definition.column] for row in rows]
+
+    def resolve_object(self, field, rows):
+        object_type = TYPES[field.definition.type]
+        references = self.references(field, rows)
+        fetched = self.fetch(
+            object_type, {pk for pk in references if pk is not None}, row_columns(object_type, field.children)
+        )
+        targets = [row for _, row in sorted(fetched.items()) if row is not None]
+        resolved = dict(zip((row['id'] for row in targets), self.resolve(object_type, targets, field.children)))
+        return [resolved.get(pk) for pk in references]
+
+    def resolve_list(self, field, rows):
+        definition, arguments = field.definition, field.arguments
+        object_type = TYPES[definition.type]
+        if not rows or not arguments['first']:
+            return [[] for _ in rows]
+
+        queryset = object_type.model.objects.all()
+        for name, (_, column) in definition.filters.items():
+            if arguments[name] is not None:
+                queryset = queryset.filter(**{column: arguments[name]})
+        if arguments['after'] is not None:
+            queryset = queryset.filter(id__lt=arguments['after'])
+
+        foreign_key = definition.foreign_key
+        if foreign_key is None:
+            children = list(
+                queryset.order_by('-id').values(*row_columns(object_type, field.children))[:arguments['first']]
+            )
+            return [self.resolve(object_type, children, field.children)]
+
+        children = list(
+            queryset.filter(**{f'{foreign_key}__in': [row['id'] for row in rows]})
+            .annotate(position=Window(RowNumber(), partition_by=[F(foreign_key)], order_by=[F('id').desc()]))
+            .filter(position__lte=arguments['first'])
+            .order_by(foreign_key, '-id')
+            .values(*row_columns(object_type, field.children, foreign_key))
+        )
+        grouped = defaultdict(list)
+        for child, result in zip(children, self.resolve(object_type, children, field.children)):
+            grouped[child[foreign_key]].append(result)
+        return [grouped.get(row['id'], []) for row in rows]
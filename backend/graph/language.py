@@ -0,0 +1,355 @@
+"""
+Lexer and parser for GraphQL executable documents.
+"""
+import re
+
+_TOKEN = re.compile(r'''
+    (?P<ignored>[\s,\ufeff]+|\#[^\n\r]*)
+  | (?P<spread>\.\.\.)
+  | (?P<punctuator>[!$():=@\[\]{}|])
+  | (?P<number>-?(?:0|[1-9][0-9]*)(?P<fraction>\.[0-9]+)?(?P<exponent>[eE][+-]?[0-9]+)?)
+  | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+  | (?P<block>"""(?:[^"\\]|\\"""|"(?!"")|\\)*""")
+  | (?P<string>"(?:[^"\\\n\r]|\\(?:["\\/bfnrt]|u[0-9A-Fa-f]{4}))*")
+''', re.VERBOSE)
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_ESCAPE = re.compile(r'\\(u[0-9A-Fa-f]{4}|.)')
+
+
+class GraphQLError(Exception):
+    """
+    An error reported in the response's ``errors`` list.
+    """
+
+    def __init__(self, message, location=None, code=None):
+        super().__init__(message)
+        self.message = message
+        self.location = location
+        self.code = code
+
+    def as_dict(self):
+        error = {'message': self.message}
+        if self.location is not None:
+            error['locations'] = [{'line': self.location[0], 'column': self.location[1]}]
+        if self.code is not None:
+            error['extensions'] = {'code': self.code}
+        return error
+
+
+class Variable:
+    __slots__ = ('name', 'location')
+
+    def __init__(self, name, location):
+        self.name = name
+        self.location = location
+
+
+class EnumValue(str):
+    """
+    An unquoted enum literal, told apart from a string literal.
+    """
+
+
+class VariableDefinition:
+    __slots__ = ('name', 'type', 'default', 'location')
+
+    def __init__(self, name, type, default, location):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.location = location
+
+
+class Field:
+    __slots__ = ('alias', 'name', 'arguments', 'selections', 'location')
+
+    def __init__(self, alias, name, arguments, selections, location):
+        self.alias = alias
+        self.name = name
+        self.arguments = arguments
+        self.selections = selections
+        self.location = location
+
+    @property
+    def response_key(self):
+        return self.alias or self.name
+
+
+class FragmentSpread:
+    __slots__ = ('name', 'location')
+
+    def __init__(self, name, location):
+        self.name = name
+        self.location = location
+
+
+class InlineFragment:
+    __slots__ = ('type_condition', 'selections', 'location')
+
+    def __init__(self, type_condition, selections, location):
+        self.type_condition = type_condition
+        self.selections = selections
+        self.location = location
+
+
+class Fragment:
+    __slots__ = ('name', 'type_condition', 'selections', 'location')
+
+    def __init__(self, name, type_condition, selections, location):
+        self.name = name
+        self.type_condition = type_condition
+        self.selections = selections
+        self.location = location
+
+
+class Operation:
+    __slots__ = ('kind', 'name', 'variables', 'selections', 'location')
+
+    def __init__(self, kind, name, variables, selections, location):
+        self.kind = kind
+        self.name = name
+        self.variables = variables
+        self.selections = selections
+        self.location = location
+
+
+class Document:
+    __slots__ = ('operations', 'fragments')
+
+    def __init__(self, operations, fragments):
+        self.operations = operations
+        self.fragments = fragments
+
+
+def _unescape(match):
+    escape = match.group(1)
+    if escape[0] == 'u':
+        return chr(int(escape[1:], 16))
+    return _ESCAPES[escape]
+
+
+def _block_string(raw):
+    lines = raw.replace('\\"""', '"""').splitlines()
+    indents = [len(line) - len(line.lstrip(' \t')) for line in lines[1:] if line.strip()]
+    if indents:
+        lines[1:] = [line[min(indents):] for line in lines[1:]]
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return '\n'.join(lines)
+
+
+def tokenize(source):
+    """
+    Return (kind, value, (line, column)) tokens, ending with an 'eof' token.
+    """
+    tokens = []
+    position, line, line_start = 0, 1, 0
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        location = (line, position - line_start + 1)
+        if match is None:
+            raise GraphQLError(f'Unexpected character {source[position]!r}.', location)
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'number':
+            value = float(text) if match.group('fraction') or match.group('exponent') else int(text)
+            tokens.append(('float' if isinstance(value, float) else 'int', value, location))
+        elif kind == 'string':
+            tokens.append(('string', _ESCAPE.sub(_unescape, text[1:-1]), location))
+        elif kind == 'block':
+            tokens.append(('string', _block_string(text[3:-3]), location))
+        elif kind != 'ignored':
+            tokens.append((kind, text, location))
+        for newline in re.finditer(r'\r\n|[\n\r]', text):
+            line += 1
+            line_start = position + newline.end()
+        position = match.end()
+    tokens.append(('eof', None, (line, position - line_start + 1)))
+    return tokens
+
+
+class Parser:
+    """
+    Recursive-descent parser for the query subset of the GraphQL grammar.
+
+    Type-system definitions and directives are rejected: the endpoint
+    serves a fixed schema and supports neither.
+    """
+
+    def __init__(self, source):
+        self.tokens = tokenize(source)
+        self.index = 0
+
+    def peek(self, kind=None, value=None):
+        token_kind, token_value, _ = self.tokens[self.index]
+        return (kind is None or token_kind == kind) and (value is None or token_value == value)
+
+    def location(self):
+        return self.tokens[self.index][2]
+
+    def advance(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, kind, value=None):
+        if not self.peek(kind, value):
+            _, found, location = self.tokens[self.index]
+            expected = value or kind
+            found = 'end of document' if found is None else repr(found)
+            raise GraphQLError(f'Expected {expected}, found {found}.', location)
+        return self.advance()[1]
+
+    def skip(self, kind, value=None):
+        if self.peek(kind, value):
+            self.advance()
+            return True
+        return False
+
+    def parse_document(self):
+        operations, fragments = {}, {}
+        while not self.peek('eof'):
+            location = self.location()
+            if self.peek('punctuator', '{'):
+                operation = Operation('query', None, [], self.parse_selection_set(), location)
+            elif self.peek('name', 'fragment'):
+                fragment = self.parse_fragment()
+                if fragment.name in fragments:
+                    raise GraphQLError(f'There can be only one fragment named "{fragment.name}".', location)
+                fragments[fragment.name] = fragment
+                continue
+            elif self.peek('name') and self.tokens[self.index][1] in ('query', 'mutation', 'subscription'):
+                operation = self.parse_operation()
+            else:
+                raise GraphQLError('Expected an operation or fragment definition.', location)
+            if operations and (operation.name is None or operation.name in operations or None in operations):
+                raise GraphQLError('Operations must have unique names, and an anonymous operation must be alone.', location)
+            operations[operation.name] = operation
+        if not operations:
+            raise GraphQLError('The document contains no operation.', self.location())
+        return Document(operations, fragments)
+
+    def parse_operation(self):
+        location = self.location()
+        kind = self.advance()[1]
+        name = self.advance()[1] if self.peek('name') else None
+        variables = self.parse_variable_definitions()
+        self.reject_directives()
+        return Operation(kind, name, variables, self.parse_selection_set(), location)
+
+    def parse_variable_definitions(self):
+        definitions = []
+        if self.skip('punctuator', '('):
+            while not self.skip('punctuator', ')'):
+                location = self.location()
+                self.expect('punctuator', '$')
+                name = self.expect('name')
+                self.expect('punctuator', ':')
+                type_ref = self.parse_type()
+                default = self.parse_value(const=True) if self.skip('punctuator', '=') else None
+                definitions.append(VariableDefinition(name, type_ref, default, location))
+        return definitions
+
+    def parse_type(self):
+        if self.skip('punctuator', '['):
+            type_ref = f'[{self.parse_type()}]'
+            self.expect('punctuator', ']')
+        else:
+            type_ref = self.expect('name')
+        if self.skip('punctuator', '!'):
+            type_ref += '!'
+        return type_ref
+
+    def parse_fragment(self):
+        location = self.location()
+        self.expect('name', 'fragment')
+        name = self.expect('name')
+        if name == 'on':
+            raise GraphQLError('A fragment cannot be named "on".', location)
+        self.expect('name', 'on')
+        type_condition = self.expect('name')
+        self.reject_directives()
+        return Fragment(name, type_condition, self.parse_selection_set(), location)
+
+    def parse_selection_set(self):
+        self.expect('punctuator', '{')
+        selections = []
+        while not self.skip('punctuator', '}'):
+            selections.append(self.parse_selection())
+        if not selections:
+            raise GraphQLError('A selection set cannot be empty.', self.tokens[self.index - 1][2])
+        return selections
+
+    def parse_selection(self):
+        location = self.location()
+        if self.skip('spread'):
+            if self.peek('name') and not self.peek('name', 'on'):
+                name = self.advance()[1]
+                self.reject_directives()
+                return FragmentSpread(name, location)
+            type_condition = None
+            if self.skip('name', 'on'):
+                type_condition = self.expect('name')
+            self.reject_directives()
+            return InlineFragment(type_condition, self.parse_selection_set(), location)
+
+        alias, name = None, self.expect('name')
+        if self.skip('punctuator', ':'):
+            alias, name = name, self.expect('name')
+        arguments = {}
+        if self.skip('punctuator', '('):
+            while not self.skip('punctuator', ')'):
+                argument_location = self.location()
+                argument = self.expect('name')
+                self.expect('punctuator', ':')
+                if argument in arguments:
+                    raise GraphQLError(f'There can be only one argument named "{argument}".', argument_location)
+                arguments[argument] = self.parse_value()
+        self.reject_directives()
+        selections = self.parse_selection_set() if self.peek('punctuator', '{') else None
+        return Field(alias, name, arguments, selections, location)
+
+    def parse_value(self, const=False):
+        kind, value, location = self.tokens[self.index]
+        if kind == 'punctuator' and value == '$' and not const:
+            self.advance()
+            return Variable(self.expect('name'), location)
+        if kind in ('int', 'float', 'string'):
+            self.advance()
+            return value
+        if kind == 'name':
+            self.advance()
+            return {'true': True, 'false': False, 'null': None}.get(value, EnumValue(value))
+        if kind == 'punctuator' and value == '[':
+            self.advance()
+            items = []
+            while not self.skip('punctuator', ']'):
+                items.append(self.parse_value(const))
+            return items
+        if kind == 'punctuator' and value == '{':
+            self.advance()
+            fields = {}
+            while not self.skip('punctuator', '}'):
+                name = self.expect('name')
+                self.expect('punctuator', ':')
+                fields[name] = self.parse_value(const)
+            return fields
+        found = 'end of document' if value is None else repr(value)
+        raise GraphQLError(f'Expected a value, found {found}.', location)
+
+    def reject_directives(self):
+        if self.peek('punctuator', '@'):
+            raise GraphQLError('Directives are not supported.', self.location())
+
+
+def parse(source):
+    """
+    Parse a GraphQL document, raising GraphQLError on syntax errors.
+    """
+    try:
+        return Parser(source).parse_document()
+    except RecursionError:
+        raise GraphQLError('The document is nested too deeply.')
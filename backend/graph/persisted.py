@@ -0,0 +1,65 @@
+"""
+Compiled operations cached by query hash, and persisted queries.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from .compiler import compile_operation
+from .language import GraphQLError, parse
+
+PERSISTED_QUERY_NOT_FOUND = 'PERSISTED_QUERY_NOT_FOUND'
+
+# (sha256, operation name) -> CompiledOperation, least recently used first.
+_operations = OrderedDict()
+_lock = threading.Lock()
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+def _query_key(sha256):
+    return f'graphql:query:{sha256}'
+
+
+def get_operation(query=None, sha256=None, operation_name=None):
+    """
+    Return the CompiledOperation for a query, a persisted query's hash, or both.
+
+    Operations are parsed and validated once and kept compiled in process
+    (``GRAPHQL_OPERATION_CACHE_SIZE``), so hot queries skip both steps. A
+    hash sent with its query registers the query in the default cache;
+    later requests may then send the hash alone, as in Apollo's automatic
+    persisted queries. An unknown hash raises PersistedQueryNotFound.
+    """
+    if query is None and sha256 is None:
+        raise GraphQLError('Must provide a query string.')
+    digest = sha256 if query is None else query_hash(query)
+    if sha256 is not None and sha256 != digest:
+        raise GraphQLError('provided sha does not match query')
+
+    key = (digest, operation_name)
+    with _lock:
+        operation = _operations.get(key)
+        if operation is not None:
+            _operations.move_to_end(key)
+    if operation is None:
+        source = query if query is not None else cache.get(_query_key(digest))
+        if source is None:
+            raise GraphQLError('PersistedQueryNotFound', code=PERSISTED_QUERY_NOT_FOUND)
+        operation = compile_operation(parse(source), operation_name)
+        with _lock:
+            _operations[key] = operation
+            while len(_operations) > settings.GRAPHQL_OPERATION_CACHE_SIZE:
+                _operations.popitem(last=False)
+    if sha256 is not None and query is not None:
+        cache.add(_query_key(digest), query, timeout=None)
+    return operation
+
+
+def clear_operations():
+    with _lock:
+        _operations.clear()
@@ -0,0 +1,248 @@
+"""
+GraphQL schema over projects, issues, comments and users.
+"""
+from django.contrib.auth import get_user_model
+from rest_framework.fields import DateTimeField
+from comments.models import Comment
+from issues.models import Issue
+from projects.models import Project
+from .language import EnumValue, GraphQLError
+
+User = get_user_model()
+
+# Page size of list fields without ``first``, and the largest ``first`` accepted.
+DEFAULT_FIRST = 10
+MAX_FIRST = 100
+
+_datetime_field = DateTimeField()
+
+
+def _parse_int(value):
+    if isinstance(value, bool) or not isinstance(value, int) or not -2 ** 31 <= value < 2 ** 31:
+        raise ValueError('Int cannot represent a non 32-bit integer value.')
+    return value
+
+
+def _parse_id(value):
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError('ID must be an integer or a string of digits.')
+    return value
+
+
+def _parse_string(value):
+    if not isinstance(value, str) or isinstance(value, EnumValue):
+        raise ValueError('String cannot represent a non-string value.')
+    return value
+
+
+def _parse_boolean(value):
+    if not isinstance(value, bool):
+        raise ValueError('Boolean cannot represent a non-boolean value.')
+    return value
+
+
+class Scalar:
+    def __init__(self, name, parse=None, serialize=None):
+        self.name = name
+        self.parse = parse
+        self.serialize = serialize
+
+
+class Enum:
+    """
+    Enum whose values are the model field's choices.
+
+    Literals must be unquoted; variables pass the value as a string.
+    """
+
+    def __init__(self, name, choices):
+        self.name = name
+        self.values = [value for value, _ in choices]
+
+    def parse(self, value, from_variable=False):
+        if isinstance(value, str) and (from_variable or isinstance(value, EnumValue)) and value in self.values:
+            return str(value)
+        raise ValueError(f'{self.name} must be one of: {", ".join(self.values)}.')
+
+    def serialize(self, value):
+        return value
+
+
+SCALARS = {
+    'ID': Scalar('ID', _parse_id),
+    'Int': Scalar('Int', _parse_int),
+    'String': Scalar('String', _parse_string),
+    'Boolean': Scalar('Boolean', _parse_boolean),
+    'DateTime': Scalar('DateTime', serialize=_datetime_field.to_representation),
+}
+ENUMS = {
+    'IssueStatus': Enum('IssueStatus', Issue.STATUS_CHOICES),
+    'IssuePriority': Enum('IssuePriority', Issue.PRIORITY_CHOICES),
+}
+INPUT_TYPES = {name: scalar for name, scalar in SCALARS.items() if scalar.parse} | ENUMS
+
+
+def coerce_input(type_ref, value, from_variable=False):
+    """
+    Return value coerced to a type reference such as ``[ID!]!``; raise ValueError if it does not fit.
+    """
+    if type_ref.endswith('!'):
+        if value is None:
+            raise ValueError(f'Expected a non-null {type_ref[:-1]}.')
+        return coerce_input(type_ref[:-1], value, from_variable)
+    if value is None:
+        return None
+    if type_ref.startswith('['):
+        items = value if isinstance(value, list) else [value]
+        return [coerce_input(type_ref[1:-1], item, from_variable) for item in items]
+    input_type = INPUT_TYPES[type_ref]
+    if isinstance(input_type, Enum):
+        return input_type.parse(value, from_variable)
+    return input_type.parse(value)
+
+
+def named_type(type_ref):
+    return type_ref.strip('[]!')
+
+
+class Argument:
+    def __init__(self, type, default=None):
+        self.type = type
+        self.default = default
+
+
+class Column:
+    """
+    Scalar field read from one column of the row.
+    """
+
+    def __init__(self, type, column):
+        self.type = type
+        self.column = column
+        self.arguments = {}
+
+    def serialize(self, value):
+        if value is None:
+            return None
+        output = SCALARS.get(self.type) or ENUMS[self.type]
+        return output.serialize(value) if output.serialize else value
+
+
+class Related:
+    """
+    Object field following a foreign key column of the row.
+    """
+
+    def __init__(self, type, column):
+        self.type = type
+        self.column = column
+        self.arguments = {}
+
+
+class Lookup:
+    """
+    Root field fetching one object by ``id``; null if it does not exist.
+    """
+
+    def __init__(self, type):
+        self.type = type
+        self.arguments = {'id': Argument('ID!')}
+
+
+class Viewer:
+    """
+    Root field returning the authenticated user.
+    """
+    type = 'User'
+    arguments = {}
+
+
+class List:
+    """
+    List field, newest first, paged with ``first`` and ``after`` (an id).
+
+    Without ``foreign_key`` it lists every row (a root field); with it, the
+    rows pointing at the parent through that column, ``first`` applying to
+    each parent separately. ``filters`` maps extra arguments to columns.
+    """
+
+    def __init__(self, type, foreign_key=None, filters=None):
+        self.type = type
+        self.foreign_key = foreign_key
+        self.filters = filters or {}
+        self.arguments = {'first': Argument('Int', DEFAULT_FIRST), 'after': Argument('ID')}
+        self.arguments.update({name: Argument(type_ref) for name, (type_ref, _) in self.filters.items()})
+
+    def check_arguments(self, arguments, location):
+        if arguments['first'] is None:
+            arguments['first'] = DEFAULT_FIRST
+        if not 0 <= arguments['first'] <= MAX_FIRST:
+            raise GraphQLError(f'first must be between 0 and {MAX_FIRST}.', location)
+
+
+class ObjectType:
+    def __init__(self, name, model, fields):
+        self.name = name
+        self.model = model
+        self.fields = fields
+
+
+ISSUE_FILTERS = {
+    'status': ('IssueStatus', 'status'),
+    'priority': ('IssuePriority', 'priority'),
+    'assigneeId': ('ID', 'assignee_id'),
+    'reporterId': ('ID', 'reporter_id'),
+}
+
+TYPES = {
+    'User': ObjectType('User', User, {
+        'id': Column('ID', 'id'),
+        'username': Column('String', 'username'),
+        'email': Column('String', 'email'),
+        'firstName': Column('String', 'first_name'),
+        'lastName': Column('String', 'last_name'),
+    }),
+    'Project': ObjectType('Project', Project, {
+        'id': Column('ID', 'id'),
+        'name': Column('String', 'name'),
+        'description': Column('String', 'description'),
+        'issueCount': Column('Int', 'issue_count'),
+        'createdAt': Column('DateTime', 'created_at'),
+        'updatedAt': Column('DateTime', 'updated_at'),
+        'createdBy': Related('User', 'created_by_id'),
+        'issues': List('Issue', 'project_id', ISSUE_FILTERS),
+    }),
+    'Issue': ObjectType('Issue', Issue, {
+        'id': Column('ID', 'id'),
+        'title': Column('String', 'title'),
+        'description': Column('String', 'description'),
+        'status': Column('IssueStatus', 'status'),
+        'priority': Column('IssuePriority', 'priority'),
+        'commentCount': Column('Int', 'comment_count'),
+        'createdAt': Column('DateTime', 'created_at'),
+        'updatedAt': Column('DateTime', 'updated_at'),
+        'project': Related('Project', 'project_id'),
+        'reporter': Related('User', 'reporter_id'),
+        'assignee': Related('User', 'assignee_id'),
+        'comments': List('Comment', 'issue_id'),
+    }),
+    'Comment': ObjectType('Comment', Comment, {
+        'id': Column('ID', 'id'),
+        'content': Column('String', 'content'),
+        'createdAt': Column('DateTime', 'created_at'),
+        'updatedAt': Column('DateTime', 'updated_at'),
+        'issue': Related('Issue', 'issue_id'),
+        'author': Related('User', 'author_id'),
+    }),
+}
+QUERY = ObjectType('Query', None, {
+    'me': Viewer(),
+    'user': Lookup('User'),
+    'project': Lookup('Project'),
+    'projects': List('Project'),
+    'issue': Lookup('Issue'),
+    'issues': List('Issue', filters={'projectId': ('ID', 'project_id'), **ISSUE_FILTERS}),
+    'comment': Lookup('Comment'),
+})
@@ -0,0 +1,170 @@
+"""
+Tests for the GraphQL endpoint.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from comments.models import Comment
+from issues.models import Issue
+
+URL = '/api/graphql/'
+
+
+@pytest.mark.django_db
+class TestGraphQLEndpoint:
+    """
+    Test GraphQL queries, batching, limits and persisted queries.
+    """
+
+    def seed(self, project, user, another_user, count):
+        issues = Issue.objects.bulk_create([
+            Issue(title=f'Issue {index}', description='Desc', project=project, reporter=user,
+                  assignee=another_user if index % 2 else None)
+            for index in range(count)
+        ])
+        Comment.objects.bulk_create([
+            Comment(content=f'Comment {index}', issue=issue, author=another_user if index % 2 else user)
+            for issue in issues for index in range(3)
+        ])
+        return issues
+
+    def post(self, client, query, **params):
+        return client.post(URL, {'query': query, **params}, format='json')
+
+    def test_nested_query(self, authenticated_client, project, issue, comment, another_user):
+        """
+        Test that nested fields, aliases, fragments and variables resolve like the REST views.
+        """
+        client, user = authenticated_client
+        query = '''
+            query Project($id: ID!, $status: IssueStatus) {
+                me { username }
+                project(id: $id) {
+                    __typename name createdBy { ...person }
+                    open: issues(status: $status, first: 5) {
+                        title status assignee { ...person } comments { content author { id } }
+                    }
+                }
+                missing: issue(id: 999999) { id }
+            }
+            fragment person on User { id firstName }
+        '''
+        response = self.post(client, query, variables={'id': str(project.id), 'status': 'open'})
+        assert response.status_code == status.HTTP_200_OK, response.data
+        data = response.data['data']
+        assert data['me'] == {'username': user.username}
+        assert data['missing'] is None
+        assert data['project']['__typename'] == 'Project'
+        assert data['project']['createdBy'] == {'id': user.id, 'firstName': user.first_name}
+        assert data['project']['open'] == [{
+            'title': issue.title, 'status': 'open',
+            'assignee': {'id': another_user.id, 'firstName': another_user.first_name},
+            'comments': [{'content': comment.content, 'author': {'id': comment.author_id}}],
+        }]
+        assert response.data['extensions'] == {'cost': 1 + 1 + 1 + 5 + 5 + 5 * 10 + 5 * 10 + 1}
+
+        response = self.post(client, '{ issue(id: %d) { createdAt } }' % issue.id)
+        assert response.data['data']['issue']['createdAt'] == client.get(f'/api/issues/{issue.id}/').data['created_at']
+
+    def test_query_count_is_independent_of_rows(self, authenticated_client, project, user, another_user):
+        """
+        Test that foreign keys and reverse lists are batched per level.
+        """
+        client, _ = authenticated_client
+        query = '''{
+            issues(first: 100) {
+                project { name createdBy { email } }
+                reporter { email } assignee { email }
+                comments(first: 2) { content author { email } issue { title } }
+            }
+        }'''
+        self.seed(project, user, another_user, 3)
+        with CaptureQueriesContext(connection) as few:
+            response = self.post(client, query)
+        assert len(response.data['data']['issues']) == 3
+        assert all(len(row['comments']) == 2 for row in response.data['data']['issues'])
+
+        self.seed(project, user, another_user, 12)
+        with CaptureQueriesContext(connection) as many:
+            response = self.post(client, query)
+        assert len(response.data['data']['issues']) == 15
+        assert len(many) == len(few)
+        # Users and issues already loaded with the same columns are not fetched again.
+        assert sum('FROM "accounts_user"' in query['sql'] for query in many.captured_queries) <= 3
+
+    def test_depth_and_cost_limits(self, authenticated_client, project, settings):
+        """
+        Test that deep or expensive queries are rejected before any data is read.
+        """
+        client, _ = authenticated_client
+        settings.GRAPHQL_MAX_DEPTH = 3
+        settings.GRAPHQL_MAX_COST = 1000
+        deep = '{ projects { issues { comments { author { id } } } } }'
+        costly = '{ projects(first: 100) { issues(first: 100) { id } } }'
+        for query, code in ((deep, 'QUERY_TOO_DEEP'), (costly, 'QUERY_TOO_COSTLY')):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.post(client, query)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert response.data['errors'][0]['extensions']['code'] == code
+            assert not any('projects_project' in query['sql'] for query in captured.captured_queries)
+        assert self.post(client, '{ projects(first: 9) { issues(first: 100) { id } } }').status_code == 200
+        assert self.post(client, '{ projects(first: 101) { id } }').status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_validation_errors(self, authenticated_client):
+        """
+        Test that invalid documents are rejected with located errors.
+        """
+        client, _ = authenticated_client
+        cases = [
+            ('{ issues { nope } }', 'Cannot query field "nope" on type "Issue".'),
+            ('{ issues }', 'must have a selection of subfields'),
+            ('{ issues { title { id } } }', 'must not have a selection'),
+            ('{ issue { id } }', 'argument "id" is required'),
+            ('{ issues(status: "open") { id } }', 'IssueStatus must be one of'),
+            ('{ issues(first: $n) { id } }', 'Variable "$n" is not defined.'),
+            ('{ ...a } fragment a on Query { issues { ...a } }', 'Cannot spread fragment "a" within itself.'),
+            ('{ issues { id: title id } }', 'conflict'),
+            ('mutation { issues { id } }', 'Mutation operations are not supported.'),
+            ('{ issues { id }', 'Expected name, found end of document.'),
+        ]
+        for query, message in cases:
+            response = self.post(client, query)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, query
+            assert message in response.data['errors'][0]['message'], response.data
+        response = self.post(client, 'query($n: Int!) { issues(first: $n) { id } }', variables={'n': 'x'})
+        assert response.data['errors'][0]['locations'] == [{'line': 1, 'column': 7}]
+        assert client.get(URL, {'query': '{ me { id } }'}).status_code == status.HTTP_200_OK
+
+    def test_requires_authentication(self, api_client):
+        """
+        Test that anonymous requests are rejected.
+        """
+        assert self.post(api_client, '{ me { id } }').status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_persisted_queries(self, authenticated_client, issue, monkeypatch):
+        """
+        Test automatic persisted queries and that cached operations are not parsed again.
+        """
+        import json
+        from . import persisted
+        client, _ = authenticated_client
+        query = '{ issue(id: %d) { title } }' % issue.id
+        extensions = {'persistedQuery': {'version': 1, 'sha256Hash': persisted.query_hash(query)}}
+
+        response = client.get(URL, {'extensions': json.dumps(extensions)})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['errors'][0]['message'] == 'PersistedQueryNotFound'
+        response = self.post(client, query, extensions=extensions)
+        assert response.data['data'] == {'issue': {'title': issue.title}}
+
+        monkeypatch.setattr(persisted, 'parse', lambda source: pytest.fail('cached operation parsed again'))
+        response = client.get(URL, {'extensions': json.dumps(extensions)})
+        assert response.data['data'] == {'issue': {'title': issue.title}}
+        persisted.clear_operations()
+        monkeypatch.undo()
+        response = client.post(URL, {'extensions': extensions}, format='json')
+        assert response.data['data'] == {'issue': {'title': issue.title}}
+
+        wrong = {'persistedQuery': {'version': 1, 'sha256Hash': '0' * 64}}
+        assert self.post(client, query, extensions=wrong).status_code == status.HTTP_400_BAD_REQUEST
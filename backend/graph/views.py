@@ -0,0 +1,79 @@
+"""
+GraphQL read endpoint.
+"""
+import json
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .compiler import query_cost
+from .executor import Executor
+from .language import GraphQLError
+from .persisted import PERSISTED_QUERY_NOT_FOUND, get_operation
+
+
+class GraphQLView(APIView):
+    """
+    Read-only GraphQL endpoint over projects, issues, comments and users.
+
+    POST ``{"query": .., "variables": {..}, "operationName": .., "extensions":
+    {"persistedQuery": {"version": 1, "sha256Hash": ..}}}``, or GET with the
+    same names as query parameters (``variables`` and ``extensions`` JSON
+    encoded). Queries nested deeper than ``GRAPHQL_MAX_DEPTH`` or costing
+    more than ``GRAPHQL_MAX_COST`` are rejected before any SQL runs; the
+    charged cost is returned in ``extensions.cost``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = dict(request.query_params.items())
+        try:
+            for name in ('variables', 'extensions'):
+                if params.get(name):
+                    params[name] = json.loads(params[name])
+        except ValueError:
+            return self.error_response(GraphQLError('variables and extensions must be JSON objects.'))
+        return self.run(request, params)
+
+    def post(self, request):
+        if not isinstance(request.data, dict):
+            return self.error_response(GraphQLError('The request body must be a JSON object.'))
+        return self.run(request, request.data)
+
+    def run(self, request, params):
+        try:
+            operation = get_operation(
+                params.get('query') or None, self.persisted_hash(params), params.get('operationName') or None
+            )
+            if operation.depth > settings.GRAPHQL_MAX_DEPTH:
+                raise GraphQLError(
+                    f'Query depth {operation.depth} exceeds the maximum of {settings.GRAPHQL_MAX_DEPTH}.',
+                    code='QUERY_TOO_DEEP',
+                )
+            selections = operation.bind(params.get('variables') or {})
+            cost = query_cost(selections)
+            if cost > settings.GRAPHQL_MAX_COST:
+                raise GraphQLError(
+                    f'Query cost {cost} exceeds the maximum of {settings.GRAPHQL_MAX_COST}.', code='QUERY_TOO_COSTLY'
+                )
+        except GraphQLError as error:
+            return self.error_response(error)
+        data = Executor(request.user).execute(selections)
+        return Response({'data': data, 'extensions': {'cost': cost}})
+
+    def persisted_hash(self, params):
+        extensions = params.get('extensions') or {}
+        persisted = extensions.get('persistedQuery') if isinstance(extensions, dict) else None
+        if not isinstance(persisted, dict):
+            return None
+        if persisted.get('version') != 1 or not isinstance(persisted.get('sha256Hash'), str):
+            raise GraphQLError('Unsupported persisted query version or hash.')
+        return persisted['sha256Hash']
+
+    def error_response(self, error):
+        # Persisted query clients resend the full query on this error and
+        # expect it with a 200 status, like any other GraphQL result.
+        code = status.HTTP_200_OK if error.code == PERSISTED_QUERY_NOT_FOUND else status.HTTP_400_BAD_REQUEST
+        return Response({'errors': [error.as_dict()]}, status=code)
@@ -0,0 +1,109 @@
+"""
+Lead time, cycle time and time-in-status analytics from status transitions.
+"""
+import datetime
+from array import array
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+
+from django.utils import timezone
+from .export import _parse_moment
+from .models import Issue, IssueStatusTransition
+
+PERCENTILES = (50, 75, 90, 95)
+# Work starts on entering STARTED_STATUS and is done on entering DONE_STATUS.
+STARTED_STATUS = 'in_progress'
+DONE_STATUS = 'closed'
+DEFAULT_WINDOW = datetime.timedelta(days=30)
+
+
+def parse_window(params):
+    """
+    Return (start, end) from ``start``/``end`` params, defaulting to the last 30 days.
+
+    Raises ValueError with a user-facing message for invalid values.
+    """
+    end = _parse_moment(params['end'], 'end') if params.get('end') else timezone.now()
+    start = _parse_moment(params['start'], 'start') if params.get('start') else end - DEFAULT_WINDOW
+    if start >= end:
+        raise ValueError('start must be before end.')
+    return start, end
+
+
+def distribution(values):
+    """
+    Summarize durations in seconds: count, mean and linearly interpolated percentiles.
+    """
+    ordered = sorted(values)
+    count = len(ordered)
+    summary = {'count': count, 'mean': None}
+    summary.update((f'p{rank}', None) for rank in PERCENTILES)
+    if not count:
+        return summary
+    summary['mean'] = round(sum(ordered) / count, 1)
+    for rank in PERCENTILES:
+        position = (count - 1) * rank / 100
+        lower = int(position)
+        upper = min(lower + 1, count - 1)
+        summary[f'p{rank}'] = round(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower), 1)
+    return summary
+
+
+def completion_durations(project_id, start, end):
+    """
+    Return (lead times, cycle times, {status: times}) of issues closed in [start, end).
+
+    Only issues closed inside the window are read, with one ordered query,
+    so the cost follows the window rather than the length of the history.
+    Lead time runs from creation to the last close before ``end``; cycle
+    time from the first move to ``in_progress`` to that close. Issues older
+    than the history table start their first status at ``created_at``.
+    """
+    closed = IssueStatusTransition.objects.filter(
+        issue__project_id=project_id, to_status=DONE_STATUS, changed_at__gte=start, changed_at__lt=end
+    )
+    rows = (
+        IssueStatusTransition.objects
+        .filter(issue_id__in=closed.values('issue_id'), changed_at__lt=end)
+        .order_by('issue_id', 'changed_at', 'id')
+        .values_list('issue_id', 'from_status', 'to_status', 'changed_at', 'issue__created_at')
+    )
+    lead_times, cycle_times = array('d'), array('d')
+    in_status = defaultdict(lambda: array('d'))
+    for issue_id, timeline in groupby(rows.iterator(), key=itemgetter(0)):
+        timeline = list(timeline)
+        last_close = max(index for index, row in enumerate(timeline) if row[2] == DONE_STATUS)
+        created_at = timeline[0][4]
+        status, since, started_at = None, created_at, None
+        spent = defaultdict(float)
+        for _, from_status, to_status, changed_at, _ in timeline[:last_close + 1]:
+            if from_status is not None:
+                spent[status or from_status] += (changed_at - since).total_seconds()
+            status, since = to_status, changed_at
+            if to_status == STARTED_STATUS and started_at is None:
+                started_at = changed_at
+        closed_at = timeline[last_close][3]
+        lead_times.append((closed_at - created_at).total_seconds())
+        if started_at is not None:
+            cycle_times.append((closed_at - started_at).total_seconds())
+        for name, seconds in spent.items():
+            in_status[name].append(seconds)
+    return lead_times, cycle_times, in_status
+
+
+def project_analytics(project_id, start, end):
+    """
+    Return cycle-time percentiles and time-in-status distributions for a window.
+    """
+    lead_times, cycle_times, in_status = completion_durations(project_id, start, end)
+    statuses = [choice for choice, label in Issue.STATUS_CHOICES if choice != DONE_STATUS]
+    statuses.extend(name for name in in_status if name not in statuses)
+    return {
+        'start': start,
+        'end': end,
+        'completed': len(lead_times),
+        'lead_time': distribution(lead_times),
+        'cycle_time': distribution(cycle_times),
+        'time_in_status': {name: distribution(in_status.get(name, ())) for name in statuses},
+    }
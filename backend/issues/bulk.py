@@ -0,0 +1,231 @@
+"""
+Batch create, update, status change and delete of issues.
+"""
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from activity.log import deferred
+from projects.models import Project
+from .models import Issue
+from .permissions import IsReporterOrAssignee
+from .serializers import BulkIssueSerializer, IssueSerializer
+from .signals import bulk_deleting, issues_bulk_written
+
+User = get_user_model()
+
+MAX_ITEMS = 5000
+
+
+def _as_pk(value):
+    """
+    Return value as an int primary key, or None if it is not one.
+    """
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BulkIssueWriter:
+    """
+    Validate a batch of issue writes together and apply them in one transaction.
+
+    Related projects, users and target issues are loaded with one query each,
+    the targets locked for the rest of the transaction, permissions are
+    checked against the loaded rows, and writes use ``bulk_create`` /
+    ``bulk_update`` (one per set of fields the items change) / a single
+    ``DELETE``. Every failing item is reported with its operation and
+    position. With ``atomic`` (the default) any error aborts the whole batch;
+    otherwise valid items are still applied.
+    """
+    operations = ('create', 'update', 'status', 'delete')
+
+    def __init__(self, request, view):
+        self.request = request
+        self.view = view
+        self.permission = IsReporterOrAssignee()
+        self.errors = []
+
+    def error(self, op, index, detail, pk=None):
+        entry = {'op': op, 'index': index, 'errors': detail}
+        if pk is not None:
+            entry['id'] = pk
+        self.errors.append(entry)
+
+    def parse(self, payload):
+        """
+        Return {op: list} from the request body, or None after recording errors.
+        """
+        if not isinstance(payload, dict):
+            self.error('request', 0, {'non_field_errors': ['Expected an object of operation lists.']})
+            return None
+        batch = {}
+        for op in self.operations:
+            items = payload.get(op, [])
+            if not isinstance(items, list):
+                self.error(op, 0, {'non_field_errors': ['Expected a list.']})
+                return None
+            batch[op] = items
+        if sum(len(items) for items in batch.values()) > MAX_ITEMS:
+            self.error('request', 0, {'non_field_errors': [f'At most {MAX_ITEMS} items per request.']})
+            return None
+        return batch
+
+    def prefetch(self, batch):
+        """
+        Load every project, user and target issue the batch refers to.
+        """
+        writes = batch['create'] + batch['update']
+        project_ids = {_as_pk(item.get('project')) for item in writes if isinstance(item, dict)}
+        user_ids = {_as_pk(item.get('assignee')) for item in writes if isinstance(item, dict)}
+        target_ids = {_as_pk(item.get('id')) for item in batch['update'] + batch['status'] if isinstance(item, dict)}
+        target_ids |= {_as_pk(pk) for pk in batch['delete']}
+        self.context = {
+            'request': self.request,
+            'view': self.view,
+            'prefetched': {
+                'projects': Project.objects.in_bulk(project_ids - {None}),
+                'users': User.objects.in_bulk(user_ids - {None}),
+            },
+        }
+        # Locked in id order, so concurrent batches cannot deadlock on each other.
+        self.targets = (
+            Issue.objects.select_related('project', 'reporter', 'assignee')
+            .select_for_update(of=('self',)).order_by('pk').in_bulk(target_ids - {None})
+        )
+
+    def target(self, op, index, pk, seen):
+        """
+        Return the issue an item refers to if it exists and may be changed.
+        """
+        issue_id = _as_pk(pk)
+        issue = self.targets.get(issue_id)
+        if issue is None:
+            self.error(op, index, {'id': ['Issue not found.']}, pk=pk)
+            return None
+        if issue_id in seen:
+            self.error(op, index, {'id': ['Issue appears more than once in this request.']}, pk=pk)
+            return None
+        if not self.permission.has_object_permission(self.request, self.view, issue):
+            self.error(op, index, {'detail': self.permission.message}, pk=pk)
+            return None
+        seen.add(issue_id)
+        return issue
+
+    def validate_item(self, serializer, item):
+        """
+        Validate one item with a reused serializer, returning (data, errors).
+
+        Building field sets dominates serializer cost, so one instance per
+        kind of write validates every item, as ``ListSerializer`` does.
+        """
+        try:
+            return serializer.run_validation(item), None
+        except serializers.ValidationError as exc:
+            return None, serializers.as_serializer_error(exc)
+
+    def validate(self, batch):
+        """
+        Return (creates, updates, deletes) of validated work.
+        """
+        creates, updates, deletes = [], [], []
+        seen = set()
+        creator = BulkIssueSerializer(context=self.context)
+        updater = BulkIssueSerializer(context=self.context, partial=True)
+        for index, item in enumerate(batch['create']):
+            validated_data, errors = self.validate_item(creator, item)
+            if errors is None:
+                creates.append(validated_data)
+            else:
+                self.error('create', index, errors)
+
+        for op in ('update', 'status'):
+            for index, item in enumerate(batch[op]):
+                if not isinstance(item, dict):
+                    self.error(op, index, {'non_field_errors': ['Expected an object.']})
+                    continue
+                if op == 'status':
+                    if 'status' not in item:
+                        self.error(op, index, {'status': ['This field is required.']}, pk=item.get('id'))
+                        continue
+                    item = {'id': item.get('id'), 'status': item['status']}
+                issue = self.target(op, index, item.get('id'), seen)
+                if issue is None:
+                    continue
+                data = {key: value for key, value in item.items() if key != 'id'}
+                updater.instance = issue
+                validated_data, errors = self.validate_item(updater, data)
+                if errors is None:
+                    updates.append((issue, validated_data))
+                else:
+                    self.error(op, index, errors, pk=issue.pk)
+
+        for index, pk in enumerate(batch['delete']):
+            issue = self.target('delete', index, pk, seen)
+            if issue is not None:
+                deletes.append(issue)
+        return creates, updates, deletes
+
+    def apply(self, creates, updates, deletes):
+        """
+        Write validated work and notify bulk listeners.
+        """
+        created = Issue.objects.bulk_create([
+            Issue(reporter=self.request.user, **validated_data) for validated_data in creates
+        ])
+
+        updated = []
+        # Items are written per set of fields they change, so columns no item
+        # asked to change are never overwritten.
+        groups = defaultdict(list)
+        now = timezone.now()
+        for issue, validated_data in updates:
+            changes = {}
+            for name, value in validated_data.items():
+                attname = Issue._meta.get_field(name).attname
+                old = getattr(issue, attname)
+                setattr(issue, name, value)
+                new = getattr(issue, attname)
+                if old != new:
+                    changes[attname] = (old, new)
+            issue.updated_at = now
+            updated.append((issue, changes))
+            groups[frozenset(validated_data) | {'updated_at'}].append(issue)
+        for fields, issues in groups.items():
+            Issue.objects.bulk_update(issues, sorted(fields))
+        for issue, _ in updated:
+            issue._remember_tracked_fields()
+
+        deleted_ids = [issue.pk for issue in deletes]
+        if deleted_ids:
+            with deferred(), bulk_deleting():
+                Issue.objects.filter(pk__in=deleted_ids).delete()
+
+        issues_bulk_written.send(sender=Issue, created=created, updated=updated, deleted=deletes)
+        return created, [issue for issue, _ in updated], deleted_ids
+
+    def run(self, payload, atomic=True):
+        """
+        Process a bulk request body and return (response data, ok).
+        """
+        result = {'created': [], 'updated': [], 'deleted': [], 'errors': self.errors}
+        batch = self.parse(payload)
+        if batch is None:
+            return result, False
+        with transaction.atomic():
+            self.prefetch(batch)
+            creates, updates, deletes = self.validate(batch)
+            if self.errors and atomic:
+                return result, False
+            created, updated, deleted_ids = self.apply(creates, updates, deletes)
+
+        context = {'request': self.request}
+        result['created'] = IssueSerializer(created, many=True, context=context).data
+        result['updated'] = IssueSerializer(updated, many=True, context=context).data
+        result['deleted'] = deleted_ids
+        return result, True
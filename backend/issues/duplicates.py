@@ -0,0 +1,170 @@
+"""
+Near-duplicate issue detection with MinHash signatures and LSH buckets.
+
+Each issue's title and description are cut into character shingles and
+summarised by a one-permutation MinHash signature: one hash per shingle,
+split into bins, with empty bins densified by rotation, so fingerprinting
+costs O(shingles) rather than O(shingles * permutations). The signature is
+split into bands and every band is hashed into a bucket stored in
+``IssueBucket``; two issues that share any bucket are candidates. A lookup is therefore one indexed
+``bucket IN (...)`` query per project, independent of how many issues exist.
+With 16 bands of 4 rows the candidate threshold sits near 0.5 Jaccard.
+"""
+import hashlib
+import re
+import struct
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 5
+SIMILARITY_THRESHOLD = 0.5
+MAX_DUPLICATES = 5
+
+_MAX_HASH = (1 << 32) - 1
+_BIN_MASK = NUM_PERMUTATIONS - 1
+# Odd constant added per step when an empty bin borrows from its neighbour.
+_DENSIFY_OFFSET = 0x9E3779B1
+_SIGNATURE_FORMAT = f'<{NUM_PERMUTATIONS}I'
+_BAND_FORMAT = f'<H{ROWS_PER_BAND}I'
+_WHITESPACE_RE = re.compile(r'\W+', re.UNICODE)
+
+
+def issue_text(title, description):
+    """
+    Return the text an issue is fingerprinted by.
+    """
+    return f'{title} {description}'
+
+
+def shingles(text):
+    """
+    Return the set of character shingles of normalized text.
+    """
+    normalized = _WHITESPACE_RE.sub(' ', text.lower()).strip()
+    if not normalized:
+        return set()
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[index:index + SHINGLE_SIZE] for index in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """
+    Compute the MinHash signature of text, or None for empty text.
+    """
+    bins = [None] * NUM_PERMUTATIONS
+    for shingle in shingles(text):
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        index, value = value & _BIN_MASK, value >> 32
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+    if all(value is None for value in bins):
+        return None
+    signature = list(bins)
+    for index, value in enumerate(bins):
+        if value is None:
+            distance = 1
+            while bins[(index + distance) & _BIN_MASK] is None:
+                distance += 1
+            signature[index] = (bins[(index + distance) & _BIN_MASK] + _DENSIFY_OFFSET * distance) & _MAX_HASH
+    return signature
+
+
+def pack_signature(signature):
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data):
+    return struct.unpack(_SIGNATURE_FORMAT, bytes(data))
+
+
+def band_buckets(signature):
+    """
+    Hash each band of a signature into a signed 64-bit bucket id.
+    """
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(_BAND_FORMAT, band, *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+def similarity(left, right):
+    """
+    Estimate Jaccard similarity from two signatures.
+    """
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERMUTATIONS
+
+
+def index_issues(rows):
+    """
+    Replace stored signatures and buckets for (id, project_id, title, description) rows.
+    """
+    from django.db import connection
+    from .models import IssueBucket, IssueSignature
+    signatures = []
+    buckets = []
+    for pk, project_id, title, description in rows:
+        signature = minhash(issue_text(title, description))
+        if signature is not None:
+            signatures.append((pk, pack_signature(signature)))
+            buckets.extend((pk, project_id, bucket) for bucket in band_buckets(signature))
+    issue_ids = [row[0] for row in rows]
+    IssueBucket.objects.filter(issue_id__in=issue_ids).delete()
+    IssueSignature.objects.filter(issue_id__in=issue_ids).delete()
+    # Plain executemany: building thousands of bucket model instances costs more than the insert.
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {IssueSignature._meta.db_table} (issue_id, signature) VALUES (%s, %s)',
+            signatures,
+        )
+        cursor.executemany(
+            f'INSERT INTO {IssueBucket._meta.db_table} (issue_id, project_id, bucket) VALUES (%s, %s, %s)',
+            buckets,
+        )
+
+
+def index_issue(issue):
+    """
+    Replace the stored signature and buckets of one issue.
+    """
+    index_issues([(issue.pk, issue.project_id, issue.title, issue.description)])
+
+
+def find_duplicates(project_id, title, description, exclude_id=None,
+                    threshold=SIMILARITY_THRESHOLD, limit=MAX_DUPLICATES):
+    """
+    Return likely duplicates in a project as dicts, most similar first.
+    """
+    from .models import Issue, IssueBucket, IssueSignature
+    signature = minhash(issue_text(title, description))
+    if signature is None:
+        return []
+    candidates = (
+        IssueBucket.objects.filter(project_id=project_id, bucket__in=band_buckets(signature))
+        .exclude(issue_id=exclude_id)
+        .values_list('issue_id', flat=True)
+        .distinct()
+    )
+    scored = []
+    stored = IssueSignature.objects.filter(issue_id__in=list(candidates)).values_list('issue_id', 'signature')
+    for issue_id, packed in stored:
+        score = similarity(signature, unpack_signature(packed))
+        if score >= threshold:
+            scored.append((score, issue_id))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    scored = scored[:limit]
+    issues = Issue.objects.in_bulk([issue_id for _, issue_id in scored])
+    return [
+        {
+            'id': issue_id,
+            'title': issues[issue_id].title,
+            'status': issues[issue_id].status,
+            'similarity': round(score, 3),
+        }
+        for score, issue_id in scored
+        if issue_id in issues
+    ]
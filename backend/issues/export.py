@@ -0,0 +1,156 @@
+"""
+Streaming CSV / NDJSON export of a project's issues and comments.
+"""
+import csv
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from bug_tracking.renderers import ORJSONRenderer
+from bug_tracking.streaming import buffered
+from comments.models import Comment
+from comments.serializers import CommentValuesSerializer
+from .models import Issue
+from .serializers import IssueValuesSerializer
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+COMMENT_FIELDS = ('id', 'author', 'author_name', 'content', 'created_at')
+# Leading characters that make spreadsheet applications evaluate a cell as a formula.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _parse_moment(value, name):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'{name} must be an ISO 8601 date or datetime.')
+        moment = datetime.datetime.combine(day, datetime.time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def parse_export_filters(params):
+    """
+    Return Issue filter kwargs from status, priority, created_after and created_before.
+
+    Raises ValueError with a user-facing message for invalid values.
+    """
+    filters = {}
+    for name, choices in (('status', Issue.STATUS_CHOICES), ('priority', Issue.PRIORITY_CHOICES)):
+        value = params.get(name)
+        if value:
+            valid = [choice for choice, label in choices]
+            if value not in valid:
+                raise ValueError(f'Invalid {name}. Must be one of: {", ".join(valid)}')
+            filters[name] = value
+    if params.get('created_after'):
+        filters['created_at__gte'] = _parse_moment(params['created_after'], 'created_after')
+    if params.get('created_before'):
+        filters['created_at__lt'] = _parse_moment(params['created_before'], 'created_before')
+    return filters
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Line:
+    """
+    File-like target letting csv.writer return each encoded line.
+    """
+
+    def write(self, value):
+        return value
+
+
+class IssueExport:
+    """
+    Stream a project's issues, optionally with their comments, as CSV or NDJSON.
+
+    Issues are read in id order and comments in (issue, id) order, each
+    through ``.iterator(chunk_size=STREAMING_CHUNK_SIZE)`` (a server-side
+    cursor on PostgreSQL), and the two are merged as they go, so memory does
+    not depend on the size of the project. NDJSON writes one issue per line
+    with a ``comments`` list. CSV writes one row per comment, repeating the
+    issue columns, and one row for an issue without comments.
+    """
+
+    def __init__(self, project_id, filters=None, include_comments=False):
+        self.project_id = project_id
+        self.filters = filters or {}
+        self.include_comments = include_comments
+        self.issue_serializer = IssueValuesSerializer()
+        self.comment_serializer = CommentValuesSerializer(fields=COMMENT_FIELDS + ('issue',))
+
+    def issues(self):
+        return Issue.objects.filter(project_id=self.project_id, **self.filters).select_related(
+            'project', 'reporter', 'assignee'
+        )
+
+    def comments(self):
+        issue_filters = {f'issue__{lookup}': value for lookup, value in self.filters.items()}
+        return Comment.objects.filter(issue__project_id=self.project_id, **issue_filters).select_related('author')
+
+    def records(self):
+        """
+        Yield (issue, comments) dicts, comments being an empty list when not exported.
+        """
+        chunk_size = settings.STREAMING_CHUNK_SIZE
+        issue_rows = self.issue_serializer.prepare(self.issues().order_by('id')).iterator(chunk_size=chunk_size)
+        if not self.include_comments:
+            for row in issue_rows:
+                yield self.issue_serializer.to_representation(row), []
+            return
+
+        comment_rows = self.comment_serializer.prepare(
+            self.comments().order_by('issue_id', 'id')
+        ).iterator(chunk_size=chunk_size)
+        pending = next(comment_rows, None)
+        for row in issue_rows:
+            comments = []
+            while pending is not None and pending.issue <= row.id:
+                if pending.issue == row.id:
+                    comments.append(self.comment_serializer.to_representation(pending))
+                pending = next(comment_rows, None)
+            for comment in comments:
+                comment.pop('issue')
+            yield self.issue_serializer.to_representation(row), comments
+
+    def ndjson(self):
+        renderer = ORJSONRenderer()
+
+        def lines():
+            for issue, comments in self.records():
+                if self.include_comments:
+                    issue['comments'] = comments
+                yield renderer.render(issue) + b'\n'
+        return buffered(lines())
+
+    def csv(self):
+        writer = csv.writer(_Line())
+        issue_columns = [name for name, extract in self.issue_serializer.extractors]
+        comment_columns = list(COMMENT_FIELDS) if self.include_comments else []
+        empty_comment = [''] * len(comment_columns)
+
+        def lines():
+            yield writer.writerow(issue_columns + [f'comment_{name}' for name in comment_columns]).encode('utf-8')
+            for issue, comments in self.records():
+                cells = [_cell(issue[name]) for name in issue_columns]
+                if not comments:
+                    yield writer.writerow(cells + empty_comment).encode('utf-8')
+                for comment in comments:
+                    yield writer.writerow(cells + [_cell(comment[name]) for name in comment_columns]).encode('utf-8')
+        return buffered(lines())
+
+    def stream(self, export_format):
+        """
+        Return an iterator of encoded chunks in export_format (one of EXPORT_FORMATS).
+        """
+        return getattr(self, export_format)()
@@ -0,0 +1,321 @@
+"""
+Bulk import of issues and their comments from CSV or NDJSON.
+"""
+import csv
+import io
+import time
+
+import orjson
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from comments.models import Comment
+from projects.models import Project
+from .export import COMMENT_FIELDS, EXPORT_FORMATS, FORMULA_PREFIXES
+from .models import Issue
+from .signals import issues_bulk_written
+
+User = get_user_model()
+
+IMPORT_FORMATS = EXPORT_FORMATS
+STATUSES = {choice for choice, label in Issue.STATUS_CHOICES}
+PRIORITIES = {choice for choice, label in Issue.PRIORITY_CHOICES}
+TITLE_MAX_LENGTH = Issue._meta.get_field('title').max_length
+
+
+def guess_format(name):
+    """
+    Return the import format implied by a file name.
+    """
+    return 'ndjson' if name.lower().endswith(('.ndjson', '.jsonl')) else 'csv'
+
+
+def _text(value):
+    """
+    Undo the export's formula escaping and map empty CSV cells to None.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, str) and value.startswith("'") and value[1:2] in FORMULA_PREFIXES:
+        return value[1:]
+    return value
+
+
+class ImportStats:
+    """
+    Running totals of an import, reported after every committed batch.
+    """
+
+    def __init__(self, offset=0):
+        self.offset = offset
+        self.issues = 0
+        self.comments = 0
+        self.rejected = 0
+        self.started = time.monotonic()
+
+    @property
+    def rows(self):
+        return self.issues + self.comments
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.monotonic() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            'offset': self.offset,
+            'issues': self.issues,
+            'comments': self.comments,
+            'rejected': self.rejected,
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+
+class IssueImporter:
+    """
+    Stream-parse issues (with nested comments) and insert them in large batches.
+
+    The input uses the export layout: NDJSON lines with an optional
+    ``comments`` list, or CSV rows where consecutive rows sharing an ``id``
+    are one issue with one ``comment_*`` set per row. Projects are resolved by
+    ``project`` (pk) or ``project_name``, users by pk, email or username,
+    through lookup tables loaded once. Every ``batch_size`` issues are written
+    with ``bulk_create`` in their own transaction, then announced through
+    ``issues_bulk_written`` so counters, search and caches follow. Invalid
+    records are passed to ``on_reject`` and skipped; ``offset`` counts input
+    records (lines or CSV rows) and always points at a batch boundary after a
+    commit, so a failed run resumes from the last reported offset.
+    """
+
+    def __init__(self, project_id=None, reporter_id=None, lock_project=False, batch_size=1000,
+                 on_reject=None, on_progress=None):
+        self.project_id = project_id
+        self.reporter_id = reporter_id
+        self.lock_project = lock_project
+        self.batch_size = batch_size
+        self.on_reject = on_reject or (lambda offset, errors, record: None)
+        self.on_progress = on_progress or (lambda stats: None)
+        self.load_lookups()
+
+    def load_lookups(self):
+        """
+        Build the project and user lookup tables with one query each.
+        """
+        self.project_ids = set()
+        names = {}
+        for pk, name in Project.objects.values_list('id', 'name').iterator():
+            self.project_ids.add(pk)
+            names[name] = None if name in names else pk
+        self.project_names = names
+        self.users = {}
+        for pk, email, username in User.objects.values_list('id', 'email', 'username').iterator():
+            # Primary keys win over a username or email that looks like one.
+            self.users[str(pk)] = pk
+            if username:
+                self.users.setdefault(username, pk)
+            if email:
+                self.users.setdefault(email.lower(), pk)
+
+    # Readers yield (offset after the record, record dict or None, errors or None, raw).
+
+    def read_ndjson(self, stream, offset=0):
+        for number, line in enumerate(stream, start=1):
+            if number <= offset or not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError as error:
+                yield number, None, {'record': [f'Invalid JSON: {error}']}, line.decode('utf-8', 'replace')
+                continue
+            if not isinstance(record, dict):
+                yield number, None, {'record': ['Expected a JSON object.']}, record
+                continue
+            yield number, record, None, record
+
+    def read_csv(self, stream, offset=0):
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        reader = csv.DictReader(text)
+        comment_columns = {f'comment_{name}': name for name in COMMENT_FIELDS}
+        current, current_key, number = None, None, 0
+        for number, row in enumerate(reader, start=1):
+            if number <= offset:
+                continue
+            if None in row or None in row.values():
+                if current is not None:
+                    yield number - 1, current, None, current
+                    current, current_key = None, None
+                yield number, None, {'record': ['Wrong number of columns.']}, row
+                continue
+            key = row.get('id') or None
+            if current is not None and (key is None or key != current_key):
+                yield number - 1, current, None, current
+                current = None
+            if current is None:
+                current = {name: value for name, value in row.items() if name not in comment_columns}
+                current['comments'] = []
+                current_key = key
+            comment = {name: row[column] for column, name in comment_columns.items() if column in row}
+            if any(comment.values()):
+                current['comments'].append(comment)
+        if current is not None:
+            yield number, current, None, current
+
+    def resolve_user(self, value, field, errors, default=None):
+        value = _text(value)
+        if value is None:
+            return default
+        pk = self.users.get(str(value)) or self.users.get(str(value).lower())
+        if pk is None:
+            errors[field] = [f'Unknown user {value!r}.']
+        return pk
+
+    def resolve_project(self, record, errors):
+        if self.lock_project:
+            return self.project_id
+        value = _text(record.get('project'))
+        if value is not None:
+            try:
+                pk = int(value)
+            except (TypeError, ValueError):
+                pk = None
+            if pk not in self.project_ids:
+                errors['project'] = [f'Unknown project {value!r}.']
+            return pk
+        name = _text(record.get('project_name'))
+        if name is not None:
+            pk = self.project_names.get(name)
+            if pk is None:
+                errors['project_name'] = [
+                    f'Project name {name!r} is ambiguous.' if name in self.project_names else f'Unknown project {name!r}.'
+                ]
+            return pk
+        if self.project_id is None:
+            errors['project'] = ['This field is required.']
+        return self.project_id
+
+    def parse_moment(self, value, field, errors):
+        value = _text(value)
+        if value is None:
+            return None
+        moment = parse_datetime(value) if isinstance(value, str) else None
+        if moment is None:
+            errors[field] = ['Expected an ISO 8601 datetime.']
+            return None
+        return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+    def build(self, record):
+        """
+        Return (issue, comments, created_at values) for a record, or raise ValueError(errors).
+        """
+        errors = {}
+        title = _text(record.get('title'))
+        if not isinstance(title, str) or not title.strip():
+            errors['title'] = ['This field is required.']
+        elif len(title) > TITLE_MAX_LENGTH:
+            errors['title'] = [f'Ensure this field has no more than {TITLE_MAX_LENGTH} characters.']
+        description = _text(record.get('description')) or ''
+        if not isinstance(description, str):
+            errors['description'] = ['Expected a string.']
+        status = _text(record.get('status')) or 'open'
+        if status not in STATUSES:
+            errors['status'] = [f'Invalid status. Must be one of: {", ".join(sorted(STATUSES))}']
+        priority = _text(record.get('priority')) or 'medium'
+        if priority not in PRIORITIES:
+            errors['priority'] = [f'Invalid priority. Must be one of: {", ".join(sorted(PRIORITIES))}']
+        issue = Issue(
+            title=title, description=description, status=status, priority=priority,
+            project_id=self.resolve_project(record, errors),
+            reporter_id=self.resolve_user(record.get('reporter'), 'reporter', errors, default=self.reporter_id),
+            assignee_id=self.resolve_user(record.get('assignee'), 'assignee', errors),
+        )
+        created_at = self.parse_moment(record.get('created_at'), 'created_at', errors)
+
+        comments, comment_dates = [], []
+        raw_comments = record.get('comments') or []
+        if not isinstance(raw_comments, list):
+            errors['comments'] = ['Expected a list.']
+            raw_comments = []
+        for index, raw in enumerate(raw_comments):
+            comment_errors = {}
+            if not isinstance(raw, dict):
+                errors[f'comments[{index}]'] = {'comment': ['Expected an object.']}
+                continue
+            content = _text(raw.get('content'))
+            if not isinstance(content, str) or not content.strip():
+                comment_errors['content'] = ['This field is required.']
+            author_id = self.resolve_user(
+                raw.get('author'), 'author', comment_errors, default=issue.reporter_id
+            )
+            comment_dates.append(self.parse_moment(raw.get('created_at'), 'created_at', comment_errors))
+            if comment_errors:
+                errors[f'comments[{index}]'] = comment_errors
+            comments.append(Comment(content=content, author_id=author_id))
+        if errors:
+            raise ValueError(errors)
+        issue.comment_count = len(comments)
+        return issue, comments, created_at, comment_dates
+
+    def run(self, stream, import_format, offset=0):
+        """
+        Import every record of stream (a binary file) and return the final ImportStats.
+        """
+        stats = ImportStats(offset)
+        reader = self.read_ndjson if import_format == 'ndjson' else self.read_csv
+        batch, position = [], None
+        for position, record, errors, raw in reader(stream, offset):
+            if record is not None:
+                try:
+                    batch.append(self.build(record))
+                except ValueError as error:
+                    errors = error.args[0]
+            if errors:
+                stats.rejected += 1
+                self.on_reject(position, errors, raw)
+            if len(batch) >= self.batch_size:
+                self.write(batch, stats)
+                batch = []
+                stats.offset = position
+                self.on_progress(stats)
+        if batch:
+            self.write(batch, stats)
+        if position is not None:
+            stats.offset = position
+        self.on_progress(stats)
+        return stats
+
+    def write(self, batch, stats):
+        """
+        Insert one batch of built issues and comments in a single transaction.
+        """
+        with transaction.atomic():
+            issues = Issue.objects.bulk_create([issue for issue, _, _, _ in batch])
+            comments, comment_dates = [], []
+            for issue, (_, issue_comments, _, dates) in zip(issues, batch):
+                for comment in issue_comments:
+                    comment.issue_id = issue.pk
+                comments.extend(issue_comments)
+                comment_dates.extend(dates)
+            comments = Comment.objects.bulk_create(comments)
+            # auto_now_add overwrites timestamps on insert; restore the source ones.
+            dated_issues = self.restore_dates(issues, [created_at for _, _, created_at, _ in batch])
+            dated_comments = self.restore_dates(comments, comment_dates)
+            if dated_issues:
+                Issue.objects.bulk_update(dated_issues, ['created_at'])
+            if dated_comments:
+                Comment.objects.bulk_update(dated_comments, ['created_at'])
+            issues_bulk_written.send(sender=Issue, created=issues, updated=[])
+        stats.issues += len(issues)
+        stats.comments += len(comments)
+
+    def restore_dates(self, objects, dates):
+        """
+        Set created_at from dates where given and return the objects that changed.
+        """
+        dated = []
+        for instance, created_at in zip(objects, dates):
+            if created_at is not None:
+                instance.created_at = created_at
+                dated.append(instance)
+        return dated
@@ -0,0 +1,210 @@
+"""
+Compound documents: related rows embedded in issue responses with ``?include=``.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from rest_framework.exceptions import ValidationError
+from accounts.serializers import UserValuesSerializer
+from comments.models import Comment
+from comments.serializers import CommentValuesSerializer
+from projects.models import Project
+from projects.serializers import ProjectValuesSerializer
+
+User = get_user_model()
+
+INCLUDE_QUERY_PARAM = 'include'
+COMMENTS_LIMIT_QUERY_PARAM = 'comments_limit'
+MAX_COMMENTS_LIMIT = 100
+
+# Include name -> issue field holding the ids it is looked up by.
+ISSUE_INCLUDES = {
+    'comments': 'id',
+    'reporter': 'reporter',
+    'assignee': 'assignee',
+    'project': 'project',
+}
+# Validators a response embedding the include also depends on.
+INCLUDE_TIMESTAMP_FIELDS = {
+    'comments': ('comments__updated_at', 'comments__author__updated_at'),
+    'project': ('project__created_by__updated_at',),
+}
+INCLUDE_COUNTER_FIELDS = {
+    'project': ('project__issue_count',),
+}
+
+
+def _split(value):
+    return [name.strip() for name in value.split(',') if name.strip()] if value else []
+
+
+class IssueIncludes:
+    """
+    Build the ``included`` member for a page of serialized issues.
+
+    ``included`` has one list per requested relation type: ``users``
+    (reporters and assignees), ``projects`` and ``comments`` (the newest
+    ``comments_limit`` of each issue, newest first, each naming its
+    ``issue``). Every related row appears once, and each type costs one
+    query whatever the number of issues, the per-issue comment limit being
+    applied by a ``ROW_NUMBER()`` window in the same query.
+    """
+
+    def __init__(self, names, comments_limit=None):
+        self.names = names
+        self.comments_limit = settings.INCLUDE_COMMENTS_LIMIT if comments_limit is None else comments_limit
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Return the includes a request asks for, or None when it asks for none.
+
+        Raises ValidationError for unknown names or a malformed limit.
+        """
+        params = request.query_params
+        requested = _split(params.get(INCLUDE_QUERY_PARAM))
+        if not requested:
+            return None
+        unknown = sorted(set(requested) - set(ISSUE_INCLUDES))
+        if unknown:
+            raise ValidationError({INCLUDE_QUERY_PARAM: [f'Unknown include(s): {", ".join(unknown)}.']})
+        names = [name for name in ISSUE_INCLUDES if name in requested]
+
+        comments_limit = None
+        if params.get(COMMENTS_LIMIT_QUERY_PARAM):
+            try:
+                comments_limit = int(params[COMMENTS_LIMIT_QUERY_PARAM])
+            except ValueError:
+                comments_limit = -1
+            if comments_limit < 0:
+                raise ValidationError({COMMENTS_LIMIT_QUERY_PARAM: ['Must be a non-negative integer.']})
+            comments_limit = min(comments_limit, MAX_COMMENTS_LIMIT)
+        return cls(names, comments_limit)
+
+    def required_fields(self):
+        """
+        Return the issue fields the includes read their ids from.
+        """
+        return [ISSUE_INCLUDES[name] for name in self.names]
+
+    def timestamp_fields(self):
+        fields = []
+        for name in self.names:
+            fields.extend(INCLUDE_TIMESTAMP_FIELDS.get(name, ()))
+        return tuple(fields)
+
+    def counter_fields(self):
+        fields = []
+        for name in self.names:
+            fields.extend(INCLUDE_COUNTER_FIELDS.get(name, ()))
+        return tuple(fields)
+
+    def querysets(self, rows):
+        """
+        Return {type: (values serializer, queryset)} reading the rows' related objects.
+        """
+        def ids(field):
+            return sorted({row[field] for row in rows if row.get(field) is not None})
+
+        querysets = {}
+        user_ids = sorted({pk for name in ('reporter', 'assignee') if name in self.names for pk in ids(name)})
+        if 'reporter' in self.names or 'assignee' in self.names:
+            serializer = UserValuesSerializer()
+            querysets['users'] = (serializer, serializer.prepare(User.objects.filter(pk__in=user_ids).order_by('id')))
+        if 'project' in self.names:
+            serializer = ProjectValuesSerializer()
+            queryset = Project.objects.filter(pk__in=ids('project')).select_related('created_by').order_by('id')
+            querysets['projects'] = (serializer, serializer.prepare(queryset))
+        if 'comments' in self.names:
+            serializer = CommentValuesSerializer()
+            queryset = (
+                Comment.objects.filter(issue_id__in=ids('id') if self.comments_limit else [])
+                .annotate(position=Window(
+                    RowNumber(), partition_by=[F('issue_id')], order_by=[F('created_at').desc(), F('id').desc()],
+                ))
+                .filter(position__lte=self.comments_limit)
+                .order_by('issue_id', '-created_at', '-id')
+            )
+            querysets['comments'] = (serializer, serializer.prepare(queryset))
+        return querysets
+
+    def build(self, rows):
+        """
+        Return the ``included`` member for rows, the issues' serialized dicts.
+        """
+        return {
+            kind: serializer.serialize(queryset) if rows else []
+            for kind, (serializer, queryset) in self.querysets(rows).items()
+        }
+
+    async def abuild(self, rows):
+        """
+        Async version of build().
+        """
+        included = {}
+        for kind, (serializer, queryset) in self.querysets(rows).items():
+            included[kind] = serializer.serialize([row async for row in queryset] if rows else [])
+        return included
+
+
+class IssueIncludeMixin:
+    """
+    Add ``included`` to issue ``list`` and ``retrieve`` responses on ``?include=``.
+
+    Paginated lists get it beside ``results``; a retrieved issue carries it
+    as an extra key. Sparse fieldsets keep the fields the includes need.
+    Streamed lists ignore the parameter. Viewsets with conditional requests
+    should add ``IssueIncludes.timestamp_fields()`` to their validators.
+    """
+    include_actions = ('list', 'retrieve')
+
+    def get_includes(self):
+        if self.action not in self.include_actions:
+            return None
+        if not hasattr(self, '_includes'):
+            self._includes = IssueIncludes.from_request(self.request)
+        return self._includes
+
+    def get_sparse_fields(self):
+        fields = super().get_sparse_fields()
+        includes = self.get_includes()
+        if fields is None or includes is None:
+            return fields
+        return fields + [name for name in includes.required_fields() if name not in fields]
+
+    def included_rows(self, data):
+        if self.action == 'retrieve':
+            return [data]
+        return data['results'] if isinstance(data, dict) else data
+
+    def add_included(self, response, included):
+        if self.action == 'list' and not isinstance(response.data, dict):
+            response.data = {'results': response.data, 'included': included}
+        else:
+            response.data['included'] = included
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.with_included(super().list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.with_included(super().retrieve(request, *args, **kwargs))
+
+    def with_included(self, response):
+        includes = self.get_includes()
+        if includes is None or response.status_code != 200:
+            return response
+        return self.add_included(response, includes.build(self.included_rows(response.data)))
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.awith_included(await super().alist(request, *args, **kwargs))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.awith_included(await super().aretrieve(request, *args, **kwargs))
+
+    async def awith_included(self, response):
+        includes = self.get_includes()
+        if includes is None or response.status_code != 200:
+            return response
+        return self.add_included(response, await includes.abuild(self.included_rows(response.data)))
@@ -0,0 +1,223 @@
+"""
+Benchmark concurrency and tail latency of the WSGI and ASGI entry points under a slow database.
+"""
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from bug_tracking.asyncviews import AsyncReadASGIHandler
+from comments.models import Comment
+from issues.models import Issue
+from projects.models import Project
+
+
+class InFlight:
+    """
+    Count requests inside the application and remember the peak.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.current -= 1
+
+
+class Command(BaseCommand):
+    """
+    Drive the real WSGI and ASGI handlers in-process with the same closed-loop load.
+
+    Every client sends its share of issue list, issue detail and comment list
+    requests back to back. The WSGI run serves them from a FIFO queue with
+    ``--workers`` threads, like gunicorn's sync workers behind the listen
+    backlog; the ASGI run has no such limit, like an ASGI server's event
+    loop. Every query sleeps ``--latency-ms`` first to stand in for a
+    loaded or distant database. Latency is measured
+    from the moment a client sends, so time spent queueing for a worker
+    counts. The seeded rows are committed (requests run on their own
+    connections) and deleted afterwards; the response cache is off.
+    """
+    help = 'Compare throughput, peak concurrency and p99 latency of the WSGI and ASGI entry points.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=32, help='Concurrent clients.')
+        parser.add_argument('--requests', type=int, default=320, help='Requests per entry point.')
+        parser.add_argument('--workers', type=int, default=4, help='WSGI workers (gunicorn --workers).')
+        parser.add_argument('--latency-ms', type=float, default=20.0, help='Delay added to every query.')
+
+    def handle(self, *args, **options):
+        user, project = self.seed()
+        try:
+            token = str(RefreshToken.for_user(user).access_token)
+            issue_id = project.issues.values_list('id', flat=True).first()
+            paths = [
+                f'/api/issues/?project_id={project.id}',
+                f'/api/issues/{issue_id}/',
+                f'/api/comments/?issue_id={issue_id}&cursor=',
+            ]
+            plan = [paths[index % len(paths)] for index in range(options['requests'])]
+            delay = options['latency_ms'] / 1000
+
+            def slow_query(execute, sql, params, many, context):
+                time.sleep(delay)
+                return execute(sql, params, many, context)
+
+            def install(sender, connection, **kwargs):
+                if slow_query not in connection.execute_wrappers:
+                    connection.execute_wrappers.append(slow_query)
+
+            self.stdout.write(
+                f'{options["clients"]} clients, {options["requests"]} requests, '
+                f'{options["latency_ms"]:g} ms per query'
+            )
+            self.stdout.write(f'{"entry point":<16} {"req/s":>8} {"in flight":>10} {"p50 ms":>8} {"p99 ms":>8} {"errors":>7}')
+            connection_created.connect(install)
+            try:
+                with override_settings(RESPONSE_CACHE_ENABLED=False):
+                    wsgi = self.run_wsgi(plan, token, options['clients'], options['workers'])
+                    asgi = asyncio.run(self.run_asgi(plan, token, options['clients']))
+            finally:
+                connection_created.disconnect(install)
+            self.report(f'WSGI ({options["workers"]} workers)', *wsgi)
+            self.report('ASGI', *asgi)
+        finally:
+            project.delete()
+            user.delete()
+
+    def seed(self):
+        user = get_user_model().objects.create(
+            username='asgi-bench', email='asgi-bench@example.invalid', first_name='Bench', last_name='User'
+        )
+        project = Project.objects.create(name='ASGI benchmark', description='', created_by=user)
+        issues = Issue.objects.bulk_create([
+            Issue(title=f'Issue {index}', description='Steps to reproduce. ' * 10,
+                  project=project, reporter=user, assignee=user if index % 2 else None)
+            for index in range(50)
+        ])
+        Comment.objects.bulk_create([
+            Comment(content=f'Comment {index}', issue=issues[0], author=user) for index in range(20)
+        ])
+        return user, project
+
+    def report(self, label, elapsed, latencies, peak, errors):
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100, method='inclusive')[98]
+        self.stdout.write(
+            f'{label:<16} {len(latencies) / elapsed:8.1f} {peak:10d} {p50 * 1000:8.1f} {p99 * 1000:8.1f} {errors:7d}'
+        )
+
+    def host(self):
+        return next((host for host in settings.ALLOWED_HOSTS if host and '*' not in host), 'localhost')
+
+    def run_wsgi(self, plan, token, clients, workers):
+        """
+        Return (seconds, latencies, peak in flight, errors) for the WSGI handler.
+        """
+        application = WSGIHandler()
+        pool = ThreadPoolExecutor(max_workers=workers)
+        in_flight = InFlight()
+        latencies, errors = [], []
+        host = self.host()
+
+        def call(path):
+            url = urlsplit(path)
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': url.path, 'QUERY_STRING': url.query,
+                'SERVER_NAME': host, 'SERVER_PORT': '80', 'HTTP_HOST': host, 'SCRIPT_NAME': '',
+                'HTTP_AUTHORIZATION': f'Bearer {token}', 'wsgi.input': BytesIO(), 'wsgi.url_scheme': 'http',
+                'wsgi.errors': BytesIO(), 'wsgi.multithread': True, 'wsgi.multiprocess': True,
+                'wsgi.run_once': False, 'wsgi.version': (1, 0),
+            }
+            statuses = []
+            with in_flight:
+                body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+                try:
+                    for _ in body:
+                        pass
+                finally:
+                    body.close()
+            return int(statuses[0].split()[0])
+
+        def client(paths):
+            for path in paths:
+                start = time.perf_counter()
+                status = pool.submit(call, path).result()
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors.append(status)
+
+        threads = [threading.Thread(target=client, args=(plan[index::clients],)) for index in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+        return elapsed, latencies, in_flight.peak, len(errors)
+
+    async def run_asgi(self, plan, token, clients):
+        """
+        Return (seconds, latencies, peak in flight, errors) for the ASGI handler.
+        """
+        application = AsyncReadASGIHandler()
+        in_flight = InFlight()
+        latencies, errors = [], []
+        host = self.host()
+
+        async def call(path):
+            url = urlsplit(path)
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': url.path, 'raw_path': url.path.encode('ascii'),
+                'query_string': url.query.encode('ascii'), 'root_path': '',
+                'headers': [(b'host', host.encode('ascii')), (b'authorization', f'Bearer {token}'.encode('ascii'))],
+                'server': (host, 80), 'client': ('127.0.0.1', 0),
+            }
+            sent = []
+            requested = False
+
+            async def receive():
+                nonlocal requested
+                if not requested:
+                    requested = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await asyncio.Event().wait()
+
+            async def send(message):
+                sent.append(message)
+
+            await application(scope, receive, send)
+            return sent[0]['status']
+
+        async def client(paths):
+            for path in paths:
+                start = time.perf_counter()
+                with in_flight:
+                    status = await call(path)
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors.append(status)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(plan[index::clients]) for index in range(clients)))
+        return time.perf_counter() - start, latencies, in_flight.peak, len(errors)
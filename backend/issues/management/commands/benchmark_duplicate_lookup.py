@@ -0,0 +1,140 @@
+"""
+Benchmark duplicate lookup latency against growing issue tables.
+"""
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from issues.duplicates import band_buckets, find_duplicates, index_issues, issue_text, minhash
+from issues.models import Issue, IssueBucket
+from projects.models import Project
+
+WORDS = (
+    'login crash dashboard slow error timeout upload button page save export '
+    'report email reset password search filter null pointer layout mobile api '
+    'token expired session cache image broken link sort column chart render'
+).split()
+SYLLABLES = 'ba be co da de fi ga ho ka li lo ma mi no pa ra re si ta to un ve xo za'.split()
+
+
+class Command(BaseCommand):
+    """
+    Seed synthetic issues in a rolled-back transaction and time lookups.
+
+    Every seeded issue is fingerprinted from its text, so buckets fill up as
+    they would with real issues. Text is drawn from a Zipf-weighted
+    vocabulary of ``--vocabulary`` words, and ``--duplicate-share`` of the
+    rows are near-copies of the probe issues, so lookups meet a growing
+    number of true and false candidates. The mean candidate count is printed
+    beside the latencies.
+    """
+    help = 'Measure duplicate lookup latency at increasing issue counts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[10000, 100000, 1000000],
+            help='Issue table sizes to measure at.',
+        )
+        parser.add_argument('--lookups', type=int, default=200, help='Lookups timed per size.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert.')
+        parser.add_argument('--vocabulary', type=int, default=5000, help='Distinct words issue text is drawn from.')
+        parser.add_argument(
+            '--duplicate-share', type=float, default=0.01, help='Share of seeded issues that copy a probe issue.'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        self.words = self.build_vocabulary(rng, options['vocabulary'])
+        self.weights = [1 / rank for rank in range(1, len(self.words) + 1)]
+        with transaction.atomic():
+            user = get_user_model().objects.create(username='dup-bench', email='dup-bench@example.invalid')
+            project = Project.objects.create(name='Duplicate benchmark', description='', created_by=user)
+            probes = self.seed_probes(project, user, rng)
+
+            inserted = 0
+            self.stdout.write('issues      p50 ms    p95 ms    p99 ms  candidates')
+            for size in sorted(options['sizes']):
+                while inserted < size:
+                    count = min(options['batch_size'], size - inserted)
+                    self.seed_bulk(project, user, count, probes, options['duplicate_share'], rng)
+                    inserted += count
+                timings, candidates = self.time_lookups(project, probes, options['lookups'], rng)
+                quantiles = statistics.quantiles(timings, n=100)
+                self.stdout.write(
+                    f'{size:<10}  {statistics.median(timings):8.3f}  {quantiles[94]:8.3f}  {quantiles[98]:8.3f}'
+                    f'  {statistics.mean(candidates):10.1f}'
+                )
+            transaction.set_rollback(True)
+
+    def build_vocabulary(self, rng, size):
+        """
+        Return the common bug-report words followed by made-up ones, most frequent first.
+        """
+        words = list(WORDS)
+        seen = set(words)
+        while len(words) < size:
+            word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+            if word not in seen:
+                seen.add(word)
+                words.append(word)
+        return words
+
+    def sentence(self, rng, length=12):
+        return ' '.join(rng.choices(self.words, weights=self.weights, k=length))
+
+    def perturb(self, rng, text):
+        """
+        Replace one word of text, as a reworded report of the same bug would.
+        """
+        words = text.split()
+        words[rng.randrange(len(words))] = self.sentence(rng, 1)
+        return ' '.join(words)
+
+    def seed_probes(self, project, user, rng, count=50):
+        probes = []
+        for _ in range(count):
+            title, description = self.sentence(rng, 6), self.sentence(rng, 30)
+            issue = Issue.objects.create(
+                title=title, description=description, project=project, reporter=user
+            )
+            probes.append(issue)
+        return probes
+
+    def seed_bulk(self, project, user, count, probes, duplicate_share, rng):
+        rows = []
+        for _ in range(count):
+            if rng.random() < duplicate_share:
+                probe = rng.choice(probes)
+                rows.append((probe.title, self.perturb(rng, probe.description)))
+            else:
+                rows.append((self.sentence(rng, 6), self.sentence(rng, 30)))
+        issues = Issue.objects.bulk_create([
+            Issue(title=title, description=description, project=project, reporter=user)
+            for title, description in rows
+        ])
+        index_issues([(issue.pk, project.pk, issue.title, issue.description) for issue in issues])
+
+    def time_lookups(self, project, probes, lookups, rng):
+        """
+        Return (lookup milliseconds, candidate issues per lookup).
+        """
+        timings, candidates = [], []
+        for _ in range(lookups):
+            probe = rng.choice(probes)
+            # Perturb the text slightly so the lookup is a near, not exact, match.
+            description = self.perturb(rng, probe.description)
+            start = time.perf_counter()
+            find_duplicates(project.pk, probe.title, description)
+            timings.append((time.perf_counter() - start) * 1000)
+            buckets = band_buckets(minhash(issue_text(probe.title, description)))
+            candidates.append(
+                IssueBucket.objects.filter(project_id=project.pk, bucket__in=buckets)
+                .values('issue_id').distinct().count()
+            )
+        return timings, candidates
@@ -0,0 +1,60 @@
+"""
+Benchmark response renderers on a large issue list payload.
+"""
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from bug_tracking.renderers import ColumnarJSONRenderer, MessagePackRenderer, ORJSONRenderer
+from issues.models import Issue
+from issues.serializers import IssueValuesSerializer
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Serialize seeded issues once, then time each renderer encoding the page.
+
+    Seeding happens in a rolled-back transaction.
+    """
+    help = 'Compare encode time and payload size of the JSON, MessagePack and columnar renderers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--issues', type=int, default=1000, help='Issues in the payload.')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed encodes per renderer.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            data = self.payload(options['issues'])
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'{"renderer":<22} {"encode ms":>10} {"bytes":>10}')
+        baseline = None
+        for renderer in (JSONRenderer(), ORJSONRenderer(), MessagePackRenderer(), ColumnarJSONRenderer()):
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                body = renderer.render(data, renderer.media_type, {})
+                timings.append((time.perf_counter() - start) * 1000)
+            elapsed = statistics.median(timings)
+            speedup = f'  x{baseline / elapsed:.1f}' if baseline else ''
+            baseline = baseline or elapsed
+            self.stdout.write(f'{type(renderer).__name__:<22} {elapsed:10.3f} {len(body):10d}{speedup}')
+
+    def payload(self, count):
+        User = get_user_model()
+        user = User.objects.create(
+            username='renderer-bench', email='renderer-bench@example.invalid', first_name='Bench', last_name='User'
+        )
+        project = Project.objects.create(name='Renderer benchmark', description='', created_by=user)
+        Issue.objects.bulk_create([
+            Issue(title=f'Issue {index}: page crashes on save', description='Steps to reproduce. ' * 10,
+                  project=project, reporter=user, assignee=user if index % 2 else None)
+            for index in range(count)
+        ])
+        serializer = IssueValuesSerializer()
+        rows = serializer.serialize(serializer.prepare(project.issues.all()))
+        return {'count': len(rows), 'next': None, 'previous': None, 'results': rows}
@@ -0,0 +1,89 @@
+"""
+Benchmark model serializers against the values_list read path.
+"""
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from comments.models import Comment
+from comments.serializers import CommentSerializer, CommentValuesSerializer
+from issues.models import Issue
+from issues.serializers import IssueSerializer, IssueValuesSerializer
+from projects.models import Project
+from projects.serializers import ProjectSerializer, ProjectValuesSerializer
+
+
+class Command(BaseCommand):
+    """
+    Seed rows in a rolled-back transaction and time serializing one page of each.
+
+    Both paths are timed end to end, query included, as a list view runs them.
+    """
+    help = 'Compare per-row serialization cost of the model and values_list read paths.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per page.')
+        parser.add_argument('--repeat', type=int, default=15, help='Timed runs per path.')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        with transaction.atomic():
+            self.seed(rows)
+            self.stdout.write(f'{"endpoint":<10} {"path":<8} {"page ms":>9} {"us/row":>9}')
+            for name, queryset, serializer_class, values_class in (
+                ('issues', Issue.objects.select_related('project', 'reporter', 'assignee'),
+                 IssueSerializer, IssueValuesSerializer),
+                ('comments', Comment.objects.select_related('author', 'issue'),
+                 CommentSerializer, CommentValuesSerializer),
+                ('projects', Project.objects.select_related('created_by'),
+                 ProjectSerializer, ProjectValuesSerializer),
+            ):
+                def model_path():
+                    return serializer_class(list(queryset[:rows]), many=True).data
+
+                def values_path():
+                    serializer = values_class()
+                    return serializer.serialize(serializer.prepare(queryset)[:rows])
+
+                baseline = None
+                for label, run in (('model', model_path), ('values', values_path)):
+                    elapsed = self.time(run, options['repeat'])
+                    count = min(rows, queryset.count())
+                    speedup = f'  x{baseline / elapsed:.1f}' if baseline else ''
+                    baseline = baseline or elapsed
+                    self.stdout.write(
+                        f'{name:<10} {label:<8} {elapsed:9.2f} {elapsed * 1000 / max(count, 1):9.2f}{speedup}'
+                    )
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        User = get_user_model()
+        users = User.objects.bulk_create([
+            User(username=f'serializer-bench-{index}', email=f'serializer-bench-{index}@example.invalid',
+                 first_name='Bench', last_name=f'User {index}')
+            for index in range(20)
+        ])
+        projects = Project.objects.bulk_create([
+            Project(name=f'Benchmark project {index}', description='Seeded.', created_by=users[index % 20])
+            for index in range(rows)
+        ])
+        issues = Issue.objects.bulk_create([
+            Issue(title=f'Issue {index}', description='Seeded by benchmark_serialization. ' * 4,
+                  project=projects[index % 10], reporter=users[index % 20],
+                  assignee=users[(index * 7) % 20] if index % 3 else None)
+            for index in range(rows)
+        ])
+        Comment.objects.bulk_create([
+            Comment(content='Seeded comment.', issue=issues[index], author=users[index % 20])
+            for index in range(rows)
+        ])
+
+    def time(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,68 @@
+"""
+Benchmark peak memory of buffered and streamed project issue lists.
+"""
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from issues.models import Issue
+from projects.models import Project
+from projects.views import ProjectViewSet
+
+
+class Command(BaseCommand):
+    """
+    Fetch /api/projects/{id}/issues/ at growing sizes, with and without ?stream=1.
+
+    Seeding happens in a rolled-back transaction; the response cache is off.
+    """
+    help = 'Compare peak memory of the buffered and streamed project issue list.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 4000, 16000],
+                            help='Project sizes (issues) to measure.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{"issues":>7} {"mode":<9} {"peak KiB":>9} {"ms":>8} {"bytes":>10}')
+        with transaction.atomic(), override_settings(RESPONSE_CACHE_ENABLED=False):
+            user = get_user_model().objects.create(
+                username='streaming-bench', email='streaming-bench@example.invalid', first_name='Bench'
+            )
+            project = Project.objects.create(name='Streaming benchmark', description='', created_by=user)
+            seeded = 0
+            for size in sorted(options['sizes']):
+                Issue.objects.bulk_create([
+                    Issue(title=f'Issue {index}', description='Steps to reproduce. ' * 10,
+                          project=project, reporter=user)
+                    for index in range(seeded, size)
+                ], batch_size=1000)
+                seeded = size
+                for mode, query in (('buffered', ''), ('streamed', '?stream=1')):
+                    peak, elapsed, length = self.measure(user, project, query)
+                    self.stdout.write(f'{size:7d} {mode:<9} {peak / 1024:9.0f} {elapsed:8.1f} {length:10d}')
+            transaction.set_rollback(True)
+
+    def measure(self, user, project, query):
+        """
+        Return (peak traced bytes, milliseconds, body length) for one request.
+        """
+        view = ProjectViewSet.as_view({'get': 'issues'})
+        request = APIRequestFactory().get(f'/api/projects/{project.id}/issues/{query}')
+        force_authenticate(request, user=user)
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = view(request, pk=project.id)
+        length = 0
+        if response.streaming:
+            for chunk in response.streaming_content:
+                length += len(chunk)
+        else:
+            length = len(response.render().content)
+        elapsed = (time.perf_counter() - start) * 1000
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak, elapsed, length
@@ -0,0 +1,80 @@
+"""
+Bulk import issues and comments from a CSV or NDJSON file.
+"""
+import orjson
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from issues.importer import IMPORT_FORMATS, IssueImporter, guess_format
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Import the export layout in batched transactions, reporting progress per batch.
+
+    Rejected records are appended to ``--rejects`` (NDJSON with the input
+    offset, errors and record). After a failure, rerun with the last reported
+    ``--offset`` to continue where the last committed batch ended.
+    """
+    help = 'Import issues and comments from CSV or NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or NDJSON file to import.')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, dest='import_format',
+                            help='Input format; guessed from the file extension when omitted.')
+        parser.add_argument('--project', type=int, help='Project for records without project/project_name.')
+        parser.add_argument('--reporter', help='Reporter (pk, email or username) for records without one.')
+        parser.add_argument('--batch-size', type=int, default=settings.IMPORT_BATCH_SIZE,
+                            help='Issues inserted per transaction.')
+        parser.add_argument('--offset', type=int, default=0, help='Input records to skip, to resume a run.')
+        parser.add_argument('--rejects', help='Rejects file; defaults to <path>.rejects.ndjson.')
+
+    def handle(self, *args, **options):
+        if options['project'] is not None and not Project.objects.filter(pk=options['project']).exists():
+            raise CommandError(f'Project {options["project"]} does not exist.')
+        self.rejects_path = options['rejects'] or f'{options["path"]}.rejects.ndjson'
+        self.rejects_mode = 'ab' if options['offset'] else 'wb'
+        self.rejects = None
+        self.committed = options['offset']
+
+        importer = IssueImporter(
+            project_id=options['project'], batch_size=options['batch_size'],
+            on_reject=self.reject, on_progress=self.progress,
+        )
+        if options['reporter']:
+            errors = {}
+            importer.reporter_id = importer.resolve_user(options['reporter'], 'reporter', errors)
+            if errors:
+                raise CommandError(errors['reporter'][0])
+
+        import_format = options['import_format'] or guess_format(options['path'])
+        try:
+            with open(options['path'], 'rb') as stream:
+                stats = importer.run(stream, import_format, offset=options['offset'])
+        except OSError as error:
+            raise CommandError(str(error))
+        except Exception:
+            self.stderr.write(f'Import stopped; resume with --offset {self.committed}.')
+            raise
+        finally:
+            if self.rejects is not None:
+                self.rejects.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {stats.issues} issues and {stats.comments} comments '
+            f'({stats.rows_per_second:,.0f} rows/s); {stats.rejected} rejected.'
+        ))
+        if stats.rejected:
+            self.stdout.write(f'Rejected records written to {self.rejects_path}.')
+
+    def reject(self, offset, errors, record):
+        if self.rejects is None:
+            self.rejects = open(self.rejects_path, self.rejects_mode)
+        self.rejects.write(orjson.dumps({'offset': offset, 'errors': errors, 'record': record}) + b'\n')
+
+    def progress(self, stats):
+        self.committed = stats.offset
+        self.stdout.write(
+            f'offset {stats.offset}: {stats.issues} issues, {stats.comments} comments, '
+            f'{stats.rejected} rejected, {stats.rows_per_second:,.0f} rows/s'
+        )
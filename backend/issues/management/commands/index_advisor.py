@@ -0,0 +1,285 @@
+"""
+Workload-driven index advisor for the issue tracker tables.
+"""
+import os
+import random
+import re
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.db.migrations import Migration
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.operations import AddIndex
+from django.db.migrations.writer import MigrationWriter
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.request import Request
+from comments.models import Comment
+from comments.views import CommentViewSet
+from issues.models import Issue
+from issues.views import IssueViewSet
+from projects.models import Project
+
+User = get_user_model()
+
+# Index names appearing in SQLite and PostgreSQL plans.
+PLAN_INDEX_RE = re.compile(
+    r'USING (?:COVERING )?INDEX (\w+)|Index (?:Only )?Scan(?: Backward)? using (\w+)|Bitmap Index Scan on (\w+)'
+)
+
+OPEN_STATUSES = ['open', 'in_progress']
+
+# Candidate indexes and the workload queries they are meant to serve.
+CANDIDATES = [
+    (Issue, models.Index(fields=['project', 'status', 'priority', '-created_at'], name='issue_proj_status_prio_idx'),
+     ['project_issues_status_priority', 'project_issues_status']),
+    (Issue, models.Index(fields=['assignee', '-created_at'], name='issue_assignee_open_idx',
+                         condition=models.Q(status__in=OPEN_STATUSES)),
+     ['assignee_inbox']),
+    (Issue, models.Index(fields=['reporter', '-created_at'], name='issue_reporter_created_idx'),
+     ['reporter_inbox']),
+    (Comment, models.Index(fields=['author', '-created_at'], name='comment_author_created_idx'),
+     ['author_comments']),
+]
+
+
+class Command(BaseCommand):
+    """
+    Replay the viewsets' query shapes, read their plans and propose indexes.
+
+    By default a synthetic dataset is seeded and everything, including the
+    candidate indexes created for measurement, is rolled back at the end.
+    Run it against a staging copy when using ``--no-seed``: building
+    indexes takes locks on the real tables for the duration of the run.
+    """
+    help = 'Report unused indexes and propose composite/partial indexes for the API workload.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--issues', type=int, default=20000, help='Issues to seed.')
+        parser.add_argument('--no-seed', action='store_true', help='Use existing data instead of seeding.')
+        parser.add_argument('--repeat', type=int, default=7, help='Timed runs per query.')
+        parser.add_argument(
+            '--min-gain',
+            type=float,
+            default=0.2,
+            help='Minimum relative speed-up on a target query to recommend an index.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Directory to write migrations into as <dir>/<app>/<name>.py instead of printing them.',
+        )
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        with transaction.atomic():
+            if not options['no_seed']:
+                self.seed(options['issues'])
+            self.analyze()
+            self.workload = self.build_workload()
+
+            baseline = self.measure()
+            self.report_workload(baseline)
+            self.report_unused(baseline)
+            accepted = self.evaluate_candidates(baseline, options['min_gain'])
+            transaction.set_rollback(True)
+
+        self.emit_migrations(accepted, options['output'])
+
+    # Dataset
+
+    def seed(self, issue_count):
+        rng = random.Random(42)
+        users = User.objects.bulk_create([
+            User(username=f'advisor-{index}', email=f'advisor-{index}@example.invalid')
+            for index in range(50)
+        ])
+        projects = Project.objects.bulk_create([
+            Project(name=f'Advisor project {index}', description='', created_by=rng.choice(users))
+            for index in range(20)
+        ])
+        now = timezone.now()
+        statuses = [choice[0] for choice in Issue.STATUS_CHOICES]
+        priorities = [choice[0] for choice in Issue.PRIORITY_CHOICES]
+        issues = Issue.objects.bulk_create([
+            Issue(
+                title=f'Issue {index}',
+                description='Seeded by index_advisor.',
+                status=rng.choice(statuses),
+                priority=rng.choice(priorities),
+                project=rng.choice(projects),
+                reporter=rng.choice(users),
+                assignee=rng.choice(users + [None]),
+            )
+            for index in range(issue_count)
+        ], batch_size=2000)
+        # auto_now_add ignores explicit values, so spread the timestamps afterwards.
+        for issue in issues:
+            issue.created_at = now - timedelta(minutes=rng.randrange(0, 525600))
+        Issue.objects.bulk_update(issues, ['created_at'], batch_size=2000)
+        Comment.objects.bulk_create([
+            Comment(content='Seeded comment.', issue=rng.choice(issues), author=rng.choice(users))
+            for _ in range(issue_count * 2)
+        ], batch_size=2000)
+        self.sample = {'project': projects[0], 'issue': issues[0], 'user': users[0]}
+        self.stdout.write(f'Seeded {issue_count} issues and {issue_count * 2} comments.')
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def sample_values(self):
+        sample = getattr(self, 'sample', None)
+        if sample is None:
+            issue = Issue.objects.order_by('-comment_count').select_related('project', 'assignee').first()
+            if issue is None:
+                raise CommandError('No issues to replay against; drop --no-seed.')
+            sample = {'project': issue.project, 'issue': issue, 'user': issue.assignee or issue.reporter}
+            self.sample = sample
+        return sample
+
+    # Workload
+
+    def viewset_queryset(self, viewset_class, params):
+        request = Request(RequestFactory().get('/', params))
+        view = viewset_class(request=request, format_kwarg=None, action='list')
+        return view.get_queryset()
+
+    def build_workload(self):
+        """
+        Return {name: queryset} for the query shapes the API issues.
+        """
+        sample = self.sample_values()
+        project, issue, user = sample['project'], sample['issue'], sample['user']
+        page = slice(0, 10)
+        keyset = ('-created_at', '-id')
+        project_issues = project.issues.select_related('project', 'reporter', 'assignee').order_by(*keyset)
+        return {
+            'issue_list': self.viewset_queryset(IssueViewSet, {}).order_by(*keyset)[page],
+            'issue_list_by_project': self.viewset_queryset(IssueViewSet, {'project_id': project.pk}).order_by(*keyset)[page],
+            'project_issues_status': project_issues.filter(status='open')[page],
+            'project_issues_status_priority': project_issues.filter(status='open', priority='high')[page],
+            'comments_for_issue': self.viewset_queryset(CommentViewSet, {'issue_id': issue.pk}).order_by(*keyset)[page],
+            'assignee_inbox': Issue.objects.filter(assignee=user, status__in=OPEN_STATUSES).order_by('-created_at')[page],
+            'reporter_inbox': Issue.objects.filter(reporter=user).order_by('-created_at')[page],
+            'author_comments': Comment.objects.filter(author=user).order_by('-created_at')[page],
+            'project_list': Project.objects.select_related('created_by')[page],
+        }
+
+    def measure(self):
+        """
+        Return {name: (median ms, plan text, index names used)}.
+        """
+        results = {}
+        for name, queryset in self.workload.items():
+            plan = queryset.explain()
+            used = {match for groups in PLAN_INDEX_RE.findall(plan) for match in groups if match}
+            timings = []
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = (statistics.median(timings), plan, used)
+        return results
+
+    def report_workload(self, results):
+        self.stdout.write(self.style.MIGRATE_HEADING('Workload'))
+        for name, (elapsed, _, used) in results.items():
+            self.stdout.write(f'  {name:<32} {elapsed:8.3f} ms  {", ".join(sorted(used)) or "no index"}')
+
+    # Existing indexes
+
+    def existing_indexes(self):
+        """
+        Yield (table, name, columns) for every non-unique secondary index.
+        """
+        with connection.cursor() as cursor:
+            for model in (Project, Issue, Comment):
+                table = model._meta.db_table
+                for name, info in connection.introspection.get_constraints(cursor, table).items():
+                    if info['index'] and not info['unique'] and not info['primary_key']:
+                        yield table, name, tuple(info['columns'])
+
+    def report_unused(self, results):
+        used = set().union(*(entry[2] for entry in results.values()))
+        indexes = list(self.existing_indexes())
+        self.stdout.write(self.style.MIGRATE_HEADING('Indexes unused by the workload'))
+        for table, name, columns in indexes:
+            if name in used:
+                continue
+            note = ''
+            for other_table, other_name, other_columns in indexes:
+                if other_table != table or other_name == name:
+                    continue
+                if other_columns == columns and other_name < name:
+                    note = f' (duplicate of {other_name})'
+                    break
+                if len(other_columns) > len(columns) and other_columns[:len(columns)] == columns:
+                    note = f' (prefix of {other_name})'
+                    break
+            self.stdout.write(f'  {table}.{name} ({", ".join(columns)}){note}')
+
+    # Candidates
+
+    def evaluate_candidates(self, baseline, min_gain):
+        self.stdout.write(self.style.MIGRATE_HEADING('Candidate indexes'))
+        editor = connection.schema_editor()
+        accepted = []
+        for model, index, targets in CANDIDATES:
+            with connection.cursor() as cursor:
+                cursor.execute(str(index.create_sql(model, editor)))
+            self.analyze()
+            after = self.measure()
+            with connection.cursor() as cursor:
+                cursor.execute(str(index.remove_sql(model, editor)))
+
+            gains = []
+            for target in targets:
+                before_ms, after_ms = baseline[target][0], after[target][0]
+                gain = 1 - after_ms / before_ms if before_ms else 0
+                gains.append(gain)
+                self.stdout.write(
+                    f'  {index.name:<28} {target:<32} {before_ms:8.3f} ms -> {after_ms:8.3f} ms'
+                    f'  {"used" if index.name in after[target][2] else "not used"}'
+                )
+            if any(index.name in after[target][2] for target in targets) and max(gains) >= min_gain:
+                accepted.append((model, index))
+                self.stdout.write(self.style.SUCCESS(f'  recommend {index.name}'))
+        self.analyze()
+        return accepted
+
+    def emit_migrations(self, accepted, output):
+        if not accepted:
+            self.stdout.write('No index changes recommended.')
+            return
+        loader = MigrationLoader(connection, ignore_no_migrations=True)
+        by_app = {}
+        for model, index in accepted:
+            by_app.setdefault(model._meta.app_label, []).append((model, index))
+
+        for app_label, entries in by_app.items():
+            leaf = max(loader.graph.leaf_nodes(app_label))
+            number = int(leaf[1].split('_', 1)[0]) + 1
+            name = f'{number:04d}_advisor_indexes'
+            migration = Migration(name, app_label)
+            migration.dependencies = [leaf]
+            migration.operations = [
+                AddIndex(model_name=model._meta.model_name, index=index) for model, index in entries
+            ]
+            writer = MigrationWriter(migration)
+            self.stdout.write(self.style.MIGRATE_HEADING(f'Migration {app_label}/{name}.py'))
+            self.stdout.write(
+                f'  Also add {", ".join(index.name for _, index in entries)} to the models\' Meta.indexes.'
+            )
+            if output:
+                directory = os.path.join(output, app_label)
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f'{name}.py')
+                with open(path, 'w') as handle:
+                    handle.write(writer.as_string())
+                self.stdout.write(f'  Written to {path}')
+            else:
+                self.stdout.write(writer.as_string())
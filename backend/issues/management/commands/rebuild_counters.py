@@ -0,0 +1,57 @@
+"""
+Rebuild the denormalized issue_count and comment_count columns.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from comments.models import Comment
+from projects.models import Project
+from issues.models import Issue
+
+
+def _count_subquery(model, fk_name):
+    """
+    Correlated COUNT(*) of model rows pointing at the outer row.
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{fk_name: OuterRef('pk')})
+            .order_by()
+            .values(fk_name)
+            .annotate(total=Count('id'))
+            .values('total')
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    """
+    Recompute Project.issue_count and Issue.comment_count from the child tables.
+    """
+    help = 'Rebuild denormalized issue and comment counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='project_ids',
+            help='Only rebuild counters for this project id (repeatable).',
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.all()
+        issues = Issue.objects.all()
+        if options['project_ids']:
+            projects = projects.filter(pk__in=options['project_ids'])
+            issues = issues.filter(project_id__in=options['project_ids'])
+
+        with transaction.atomic():
+            issue_rows = issues.update(comment_count=_count_subquery(Comment, 'issue'))
+            project_rows = projects.update(issue_count=_count_subquery(Issue, 'project'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt counters for {project_rows} projects and {issue_rows} issues.'
+        ))
@@ -0,0 +1,52 @@
+"""
+Rebuild the MinHash/LSH index used for duplicate issue detection.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from issues.duplicates import index_issues
+from issues.models import Issue
+
+
+class Command(BaseCommand):
+    """
+    Recompute every issue signature and its LSH buckets in batches.
+    """
+    help = 'Rebuild the duplicate-detection signatures and LSH buckets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of issues processed per transaction.',
+        )
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='project_ids',
+            help='Only rebuild issues of this project id (repeatable).',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        issues = Issue.objects.order_by('pk').values_list('pk', 'project_id', 'title', 'description')
+        if options['project_ids']:
+            issues = issues.filter(project_id__in=options['project_ids'])
+
+        total = 0
+        batch = []
+        for row in issues.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                total += self.rebuild_batch(batch)
+                batch = []
+        if batch:
+            total += self.rebuild_batch(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt duplicate index for {total} issues.'))
+
+    def rebuild_batch(self, rows):
+        with transaction.atomic():
+            index_issues(rows)
+        return len(rows)
@@ -0,0 +1,27 @@
+"""
+Rebuild the materialized per-project issue statistics.
+"""
+from django.core.management.base import BaseCommand
+from projects.stats import rebuild_project_stats
+
+
+class Command(BaseCommand):
+    """
+    Recompute ProjectIssueStat buckets from the issue table and report drift.
+    """
+    help = 'Rebuild per-project issue statistics.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='project_ids',
+            help='Only rebuild statistics for this project id (repeatable).',
+        )
+
+    def handle(self, *args, **options):
+        drifted = rebuild_project_stats(options['project_ids'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt project statistics; {drifted} buckets were out of date.'
+        ))
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    Issue = apps.get_model('issues', 'Issue')
+    Comment = apps.get_model('comments', 'Comment')
+    counts = (
+        Comment.objects.filter(issue=OuterRef('pk'))
+        .order_by()
+        .values('issue')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Issue.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0002_rename_issues_issu_status_idx_issues_issu_status_003ba6_idx_and_more'),
+        ('comments', '0002_rename_comments_co_issue_idx_comments_co_issue_i_25b7b6_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
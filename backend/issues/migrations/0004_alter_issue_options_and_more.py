@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0003_issue_comment_count'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='issue',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['-created_at', '-id'], name='issues_issu_created_8c5e75_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', '-created_at', '-id'], name='issues_issu_project_bc56c3_idx'),
+        ),
+    ]
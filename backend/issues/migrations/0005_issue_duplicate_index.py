@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_issue_count'),
+        ('issues', '0004_alter_issue_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueSignature',
+            fields=[
+                ('issue', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='issues.issue')),
+                ('signature', models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='IssueBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField()),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='issues.issue')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'bucket'], name='issues_issu_project_043ede_idx')],
+            },
+        ),
+    ]
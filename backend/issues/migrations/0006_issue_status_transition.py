@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0005_issue_duplicate_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('to_status', models.CharField(max_length=20)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='issues.issue')),
+            ],
+            options={
+                'ordering': ['changed_at', 'id'],
+                'indexes': [models.Index(fields=['issue', 'changed_at'], name='issues_issu_issue_i_7bca6e_idx'), models.Index(fields=['to_status', 'changed_at'], name='issues_issu_to_stat_aecfb2_idx')],
+            },
+        ),
+    ]
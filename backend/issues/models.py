@@ -1,9 +1,10 @@
 """
 Models for issues app.
 """
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -34,10 +35,18 @@ class Issue(models.Model):
     assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_issues')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Denormalized counters maintained by signals; never written by save().
+    COUNTER_FIELDS = ('comment_count',)
+    # Values remembered at load time so signal handlers can tell what changed.
+    TRACKED_FIELDS = ('project_id', 'title', 'description', 'status', 'priority', 'assignee_id')
 
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['project', '-created_at', '-id']),
             models.Index(fields=['status']),
             models.Index(fields=['priority']),
             models.Index(fields=['project']),
@@ -48,9 +57,110 @@ class Issue(models.Model):
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember tracked field values so changes can be detected on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_fields()
+        return instance
+
+    def _remember_tracked_fields(self):
+        self._loaded_values = {name: self.__dict__[name] for name in self.TRACKED_FIELDS if name in self.__dict__}
+
+    def refresh_from_db(self, using=None, fields=None):
+        """
+        Reload from the database and remember the reloaded tracked values.
+        """
+        super().refresh_from_db(using=using, fields=fields)
+        loaded = getattr(self, '_loaded_values', {})
+        self._remember_tracked_fields()
+        if fields is not None:
+            refreshed = {self._meta.get_field(name).attname for name in fields}
+            self._loaded_values = {
+                name: value if name in refreshed else loaded.get(name, value)
+                for name, value in self._loaded_values.items()
+            }
+
+    def get_loaded_value(self, attname):
+        """
+        Return the value a tracked field had when last loaded or saved.
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        if attname in loaded:
+            return loaded[attname]
+        return getattr(self, attname)
+
+    def save(self, *args, **kwargs):
+        """
+        Save the issue without overwriting counters maintained elsewhere.
+        """
+        if not self._state.adding and not args and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._remember_tracked_fields()
+
     def clean(self):
         """
         Validate status transitions and assignee.
         """
         if self.assignee and not isinstance(self.assignee, User):
             raise ValidationError({'assignee': 'Invalid assignee.'})
+
+
+class IssueSignature(models.Model):
+    """
+    MinHash signature of an issue's title and description.
+    """
+    issue = models.OneToOneField(Issue, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    signature = models.BinaryField()
+
+    def __str__(self):
+        return f'Signature of issue {self.issue_id}'
+
+
+class IssueBucket(models.Model):
+    """
+    One LSH band bucket of an issue signature, used to find duplicate candidates.
+    """
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='buckets')
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='+')
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'bucket']),
+        ]
+
+    def __str__(self):
+        return f'Bucket {self.bucket} of issue {self.issue_id}'
+
+
+class IssueStatusTransition(models.Model):
+    """
+    Append-only record of an issue's status changes.
+
+    ``from_status`` is null for the row written when the issue is created.
+    """
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='status_transitions')
+    from_status = models.CharField(max_length=20, null=True, blank=True)
+    to_status = models.CharField(max_length=20)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['changed_at', 'id']
+        indexes = [
+            models.Index(fields=['issue', 'changed_at']),
+            models.Index(fields=['to_status', 'changed_at']),
+        ]
+
+    def __str__(self):
+        return f'Issue {self.issue_id}: {self.from_status} -> {self.to_status}'
@@ -13,5 +13,8 @@ class IsReporterOrAssignee(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         """
         Check if the user is the reporter or assignee of the issue.
+
+        Compares foreign key ids so checking many issues costs no queries.
         """
-        return obj.reporter == request.user or obj.assignee == request.user
+        user_id = request.user.pk
+        return user_id is not None and user_id in (obj.reporter_id, obj.assignee_id)
@@ -1,8 +1,41 @@
 """
 Serializers for issues app.
 """
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from .models import Issue
+from bug_tracking.values import ValuesSerializer, full_name
+from projects.models import Project
+from .models import Issue, IssueStatusTransition
+
+User = get_user_model()
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field resolved from objects preloaded into the serializer context.
+
+    ``context['prefetched'][context_key]`` maps pk to instance; without it the
+    field behaves like ``PrimaryKeyRelatedField`` and queries per value.
+    """
+
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        objects = self.context.get('prefetched', {}).get(self.context_key)
+        if objects is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return objects[pk]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
 
 
 class IssueSerializer(serializers.ModelSerializer):
@@ -12,7 +45,6 @@ class IssueSerializer(serializers.ModelSerializer):
     reporter_name = serializers.CharField(source='reporter.get_full_name', read_only=True)
     assignee_name = serializers.CharField(source='assignee.get_full_name', read_only=True, allow_null=True)
     project_name = serializers.CharField(source='project.name', read_only=True)
-    comment_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Issue
@@ -20,13 +52,7 @@ class IssueSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'status', 'priority', 'project', 'project_name',
             'reporter', 'reporter_name', 'assignee', 'assignee_name', 'created_at', 'updated_at', 'comment_count'
         )
-        read_only_fields = ('id', 'reporter', 'created_at', 'updated_at')
-
-    def get_comment_count(self, obj):
-        """
-        Get the count of comments for this issue.
-        """
-        return obj.comments.count()
+        read_only_fields = ('id', 'reporter', 'created_at', 'updated_at', 'comment_count')
 
     def validate_status(self, value):
         """
@@ -45,3 +71,34 @@ class IssueSerializer(serializers.ModelSerializer):
         if value not in valid_priorities:
             raise serializers.ValidationError(f'Invalid priority. Must be one of: {", ".join(valid_priorities)}')
         return value
+
+
+class BulkIssueSerializer(IssueSerializer):
+    """
+    Issue serializer for batch writes, resolving relations from prefetched objects.
+    """
+    project = PrefetchedPrimaryKeyRelatedField('projects', queryset=Project.objects.all())
+    assignee = PrefetchedPrimaryKeyRelatedField(
+        'users', queryset=User.objects.all(), allow_null=True, required=False
+    )
+
+
+class IssueStatusTransitionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for one entry of an issue's status history.
+    """
+
+    class Meta:
+        model = IssueStatusTransition
+        fields = ('from_status', 'to_status', 'changed_at')
+
+
+class IssueValuesSerializer(ValuesSerializer):
+    """
+    Read-only IssueSerializer output built from values rows.
+    """
+    serializer_class = IssueSerializer
+    computed_fields = {
+        'reporter_name': (('reporter__first_name', 'reporter__last_name'), full_name),
+        'assignee_name': (('assignee__first_name', 'assignee__last_name'), full_name),
+    }
@@ -0,0 +1,210 @@
+"""
+Signal handlers for issues app.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from projects.models import Project
+from projects.stats import apply_stat_deltas, bucket_of, move_issue_stats, unassign_user_stats
+from .duplicates import index_issue, index_issues
+from .models import Issue, IssueStatusTransition
+
+User = get_user_model()
+
+# Sent after a batch write, because bulk_create/bulk_update skip per-row
+# signals. Arguments: ``created`` (list of issues), ``updated`` (list of
+# (issue, changes) where changes maps attname to (old, new)) and, from
+# writers that delete inside bulk_deleting(), ``deleted`` (list of issues).
+issues_bulk_written = Signal()
+
+_bulk_deleting = ContextVar('issues_bulk_deleting', default=False)
+
+TEXT_FIELDS = ('project_id', 'title', 'description')
+
+
+@contextmanager
+def bulk_deleting():
+    """
+    Skip the per-row counter, statistics, search and cache work of issue deletes inside the block.
+
+    The caller reports the deleted issues with ``issues_bulk_written``,
+    whose receivers apply that work once per batch. Deletes still send
+    ``post_delete`` for the activity log and live events.
+    """
+    token = _bulk_deleting.set(True)
+    try:
+        yield
+    finally:
+        _bulk_deleting.reset(token)
+
+
+def is_bulk_deleting():
+    return _bulk_deleting.get()
+
+
+def adjust_issue_count(project_id, delta):
+    """
+    Atomically shift a project's denormalized issue counter.
+    """
+    if project_id is None or not delta:
+        return
+    Project.objects.filter(pk=project_id).update(issue_count=F('issue_count') + delta)
+
+
+@receiver(post_save, sender=Issue)
+def issue_saved(sender, instance, created, raw=False, **kwargs):
+    """
+    Count new issues and move the count along with issues changing project.
+    """
+    if raw:
+        return
+    if created:
+        adjust_issue_count(instance.project_id, 1)
+        return
+    previous_project_id = instance.get_loaded_value('project_id')
+    if previous_project_id != instance.project_id:
+        adjust_issue_count(previous_project_id, -1)
+        adjust_issue_count(instance.project_id, 1)
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted(sender, instance, origin=None, **kwargs):
+    """
+    Uncount deleted issues, unless the whole project is being deleted.
+    """
+    if is_bulk_deleting():
+        return
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if origin is Project or isinstance(origin, Project) and origin.pk == instance.project_id:
+        return
+    adjust_issue_count(instance.project_id, -1)
+
+
+@receiver(post_save, sender=Issue)
+def issue_fingerprint_saved(sender, instance, created, raw=False, **kwargs):
+    """
+    Refresh the duplicate-detection signature when the issue text or project changes.
+    """
+    if raw:
+        return
+    changed = any(
+        instance.get_loaded_value(name) != getattr(instance, name)
+        for name in TEXT_FIELDS
+    )
+    if created or changed:
+        index_issue(instance)
+
+
+@receiver(issues_bulk_written)
+def issues_bulk_counted(sender, created, updated, deleted=(), **kwargs):
+    """
+    Apply the net issue count change of a batch with one UPDATE per project.
+    """
+    deltas = Counter(issue.project_id for issue in created)
+    deltas.subtract(issue.project_id for issue in deleted)
+    for issue, changes in updated:
+        if 'project_id' in changes:
+            old, new = changes['project_id']
+            deltas[old] -= 1
+            deltas[new] += 1
+    for project_id, delta in deltas.items():
+        adjust_issue_count(project_id, delta)
+
+
+@receiver(issues_bulk_written)
+def issues_bulk_fingerprinted(sender, created, updated, **kwargs):
+    """
+    Refresh duplicate-detection signatures for a batch in bulk.
+    """
+    changed = list(created) + [
+        issue for issue, changes in updated if any(name in changes for name in TEXT_FIELDS)
+    ]
+    if changed:
+        index_issues([(issue.pk, issue.project_id, issue.title, issue.description) for issue in changed])
+
+
+@receiver(post_save, sender=Issue)
+def issue_stats_saved(sender, instance, created, raw=False, **kwargs):
+    """
+    Move the issue between statistics buckets when its project, status, priority or assignee changes.
+    """
+    if raw:
+        return
+    move_issue_stats(instance, None if created else bucket_of(instance, loaded=True))
+
+
+@receiver(post_delete, sender=Issue)
+def issue_stats_deleted(sender, instance, origin=None, **kwargs):
+    """
+    Drop deleted issues from the statistics, unless the whole project is being deleted.
+    """
+    if is_bulk_deleting():
+        return
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if origin is Project or isinstance(origin, Project) and origin.pk == instance.project_id:
+        return
+    apply_stat_deltas({bucket_of(instance, loaded=True): -1})
+
+
+@receiver(issues_bulk_written)
+def issues_bulk_stats(sender, created, updated, deleted=(), **kwargs):
+    """
+    Apply the net statistics change of a batch with one UPDATE per bucket.
+    """
+    deltas = Counter(bucket_of(issue) for issue in created)
+    deltas.subtract(bucket_of(issue, loaded=True) for issue in deleted)
+    for issue, changes in updated:
+        deltas[bucket_of(issue, changes=changes)] -= 1
+        deltas[bucket_of(issue)] += 1
+    apply_stat_deltas(deltas)
+
+
+@receiver(post_delete, sender=User)
+def assignee_deleted(sender, instance, **kwargs):
+    """
+    Count the deleted user's issues as unassigned; SET_NULL sends no issue signals.
+    """
+    unassign_user_stats(instance.pk)
+
+
+@receiver(post_save, sender=Issue)
+def issue_status_recorded(sender, instance, created, raw=False, **kwargs):
+    """
+    Append a status transition for new issues and status changes.
+    """
+    if raw:
+        return
+    if created:
+        IssueStatusTransition.objects.create(
+            issue=instance, from_status=None, to_status=instance.status, changed_at=instance.created_at
+        )
+        return
+    previous_status = instance.get_loaded_value('status')
+    if previous_status != instance.status:
+        IssueStatusTransition.objects.create(issue=instance, from_status=previous_status, to_status=instance.status)
+
+
+@receiver(issues_bulk_written)
+def issues_bulk_status_recorded(sender, created, updated, **kwargs):
+    """
+    Append the status transitions of a batch with one INSERT.
+    """
+    transitions = [
+        IssueStatusTransition(issue_id=issue.pk, from_status=None, to_status=issue.status, changed_at=issue.created_at)
+        for issue in created
+    ]
+    transitions.extend(
+        IssueStatusTransition(
+            issue_id=issue.pk, from_status=changes['status'][0], to_status=changes['status'][1],
+            changed_at=issue.updated_at,
+        )
+        for issue, changes in updated if 'status' in changes
+    )
+    IssueStatusTransition.objects.bulk_create(transitions)
@@ -192,3 +192,908 @@ class TestIssueEndpoints:
         }
         response = api_client.post('/api/issues/', data)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestIssueCounters:
+    """
+    Test the denormalized comment_count and issue_count columns.
+    """
+
+    def test_counters_follow_creates_and_deletes(self, project, user):
+        """
+        Test that creating and deleting rows keeps both counters exact.
+        """
+        from comments.models import Comment
+        issue = Issue.objects.create(title='Issue', description='Desc', project=project, reporter=user)
+        comment = Comment.objects.create(content='First', issue=issue, author=user)
+        Comment.objects.create(content='Second', issue=issue, author=user)
+        project.refresh_from_db()
+        issue.refresh_from_db()
+        assert project.issue_count == 1
+        assert issue.comment_count == 2
+
+        comment.delete()
+        issue.refresh_from_db()
+        assert issue.comment_count == 1
+
+        issue.delete()
+        project.refresh_from_db()
+        assert project.issue_count == 0
+
+    def test_moving_issue_updates_both_projects(self, project, user):
+        """
+        Test that changing an issue's project moves its count.
+        """
+        other = Project.objects.create(name='Other', description='Other project', created_by=user)
+        issue = Issue.objects.create(title='Issue', description='Desc', project=project, reporter=user)
+        issue = Issue.objects.get(pk=issue.pk)
+        issue.project = other
+        issue.save()
+        project.refresh_from_db()
+        other.refresh_from_db()
+        assert project.issue_count == 0
+        assert other.issue_count == 1
+
+    def test_stale_instance_save_keeps_counter(self, project, user):
+        """
+        Test that saving a stale issue does not overwrite its comment counter.
+        """
+        from comments.models import Comment
+        issue = Issue.objects.create(title='Issue', description='Desc', project=project, reporter=user)
+        Comment.objects.create(content='Comment', issue=issue, author=user)
+        issue.title = 'Renamed'
+        issue.save()
+        issue.refresh_from_db()
+        assert issue.comment_count == 1
+
+    def test_list_reads_counter_column(self, authenticated_client, project, user, django_assert_num_queries):
+        """
+        Test that the issue list no longer queries comments per row.
+        """
+        from comments.models import Comment
+        api_client, _ = authenticated_client
+        for index in range(3):
+            issue = Issue.objects.create(title=f'Issue {index}', description='Desc', project=project, reporter=user)
+            Comment.objects.create(content='Comment', issue=issue, author=user)
+        # user lookup, count, page
+        with django_assert_num_queries(3):
+            response = api_client.get('/api/issues/')
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['comment_count'] for row in response.data['results']] == [1, 1, 1]
+
+    def test_rebuild_counters_command(self, project, user):
+        """
+        Test that rebuild_counters repairs drifted counters.
+        """
+        from io import StringIO
+        from django.core.management import call_command
+        from comments.models import Comment
+        issue = Issue.objects.create(title='Issue', description='Desc', project=project, reporter=user)
+        Comment.objects.create(content='Comment', issue=issue, author=user)
+        Issue.objects.update(comment_count=7)
+        Project.objects.update(issue_count=7)
+        call_command('rebuild_counters', stdout=StringIO())
+        issue.refresh_from_db()
+        project.refresh_from_db()
+        assert issue.comment_count == 1
+        assert project.issue_count == 1
+
+
+@pytest.mark.django_db
+class TestIssueKeysetPagination:
+    """
+    Test keyset pagination on the issue endpoints.
+    """
+
+    @pytest.fixture
+    def issues(self, project, user):
+        """
+        Create issues that share a created_at timestamp to exercise the id tiebreaker.
+        """
+        from django.utils import timezone
+        created = [
+            Issue.objects.create(title=f'Issue {index}', description='Desc', project=project, reporter=user)
+            for index in range(7)
+        ]
+        Issue.objects.update(created_at=timezone.now())
+        return sorted(created, key=lambda issue: issue.id, reverse=True)
+
+    def _walk(self, api_client, url):
+        """
+        Follow next links and collect result ids.
+        """
+        ids = []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.data
+            ids.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_walk_all_pages(self, authenticated_client, issues):
+        """
+        Test that walking the cursor visits every issue exactly once, newest first.
+        """
+        api_client, _ = authenticated_client
+        ids = self._walk(api_client, '/api/issues/?cursor=&page_size=3')
+        assert ids == [issue.id for issue in issues]
+
+    def test_pages_seek_with_an_index_range_bound(self, authenticated_client, issues):
+        """
+        Test that later pages bound created_at directly, not only inside the OR.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        api_client, _ = authenticated_client
+        first = api_client.get('/api/issues/?cursor=&page_size=3')
+        with CaptureQueriesContext(connection) as captured:
+            api_client.get(first.data['next'])
+        pages = [query['sql'] for query in captured if 'ORDER BY' in query['sql']]
+        assert pages and '"issues_issue"."created_at" <= ' in pages[0]
+
+    def test_insert_during_walk_does_not_shift_rows(self, authenticated_client, issues, project, user):
+        """
+        Test that rows created between pages are neither skipped nor repeated.
+        """
+        api_client, _ = authenticated_client
+        first = api_client.get('/api/issues/?cursor=&page_size=3')
+        Issue.objects.create(title='Newer', description='Desc', project=project, reporter=user)
+        ids = [row['id'] for row in first.data['results']] + self._walk(api_client, first.data['next'])
+        assert ids == [issue.id for issue in issues]
+
+    def test_previous_link(self, authenticated_client, issues):
+        """
+        Test that the previous link returns the page before.
+        """
+        api_client, _ = authenticated_client
+        first = api_client.get('/api/issues/?cursor=&page_size=3')
+        second = api_client.get(first.data['next'])
+        back = api_client.get(second.data['previous'])
+        assert [row['id'] for row in back.data['results']] == [row['id'] for row in first.data['results']]
+        assert back.data['previous'] is None
+
+    def test_invalid_cursor(self, authenticated_client, issues):
+        """
+        Test that a malformed cursor is rejected.
+        """
+        api_client, _ = authenticated_client
+        response = api_client.get('/api/issues/?cursor=not-a-cursor')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_project_issues_cursor(self, authenticated_client, issues, project):
+        """
+        Test that the project issues action pages by cursor when asked to.
+        """
+        api_client, _ = authenticated_client
+        ids = self._walk(api_client, f'/api/projects/{project.id}/issues/?cursor=&page_size=2&priority=medium')
+        assert ids == [issue.id for issue in issues]
+
+    def test_without_cursor_uses_page_numbers(self, authenticated_client, issues):
+        """
+        Test that requests without a cursor keep page-number responses.
+        """
+        api_client, _ = authenticated_client
+        response = api_client.get('/api/issues/')
+        assert response.data['count'] == len(issues)
+
+
+@pytest.mark.django_db
+class TestIssueEstimatedCount:
+    """
+    Test the estimated-count page-number fallback on the issue list.
+    """
+
+    @pytest.fixture(autouse=True)
+    def low_threshold(self, settings):
+        """
+        Use a tiny exact-count threshold and a clean count cache.
+        """
+        from django.core.cache import cache
+        settings.PAGINATION_EXACT_COUNT_THRESHOLD = 2
+        cache.clear()
+        yield
+        cache.clear()
+
+    def _create(self, project, user, count):
+        for index in range(count):
+            Issue.objects.create(title=f'Issue {index}', description='Desc', project=project, reporter=user)
+
+    def test_exact_under_threshold(self, authenticated_client, project, user):
+        """
+        Test that small result sets are counted exactly.
+        """
+        api_client, _ = authenticated_client
+        self._create(project, user, 2)
+        response = api_client.get('/api/issues/')
+        assert response.data['count'] == 2
+        assert response.data['count_is_exact'] is True
+
+    def test_estimated_over_threshold_is_cached(self, authenticated_client, project, user):
+        """
+        Test that large counts are flagged inexact and served from cache per filter.
+        """
+        api_client, _ = authenticated_client
+        self._create(project, user, 4)
+        response = api_client.get(f'/api/issues/?project_id={project.id}')
+        assert response.data['count'] == 4
+        assert response.data['count_is_exact'] is False
+
+        self._create(project, user, 1)
+        response = api_client.get(f'/api/issues/?project_id={project.id}')
+        assert response.data['count'] == 4
+
+        response = api_client.get('/api/issues/')
+        assert response.data['count'] == 5
+
+
+@pytest.mark.django_db
+class TestDuplicateDetection:
+    """
+    Test MinHash/LSH duplicate detection on issue creation.
+    """
+
+    DESCRIPTION = 'Clicking the login button with an expired session token shows a blank white page.'
+
+    def test_create_reports_near_duplicate(self, authenticated_client, project, user):
+        """
+        Test that creating a near-identical issue returns the original.
+        """
+        api_client, _ = authenticated_client
+        original = Issue.objects.create(
+            title='Blank page after login', description=self.DESCRIPTION, project=project, reporter=user
+        )
+        Issue.objects.create(
+            title='Export to CSV is slow', description='Exports with many rows take minutes.',
+            project=project, reporter=user,
+        )
+        data = {
+            'title': 'Blank page after login!',
+            'description': self.DESCRIPTION + ' Happens on Firefox.',
+            'project': project.id,
+        }
+        response = api_client.post('/api/issues/', data)
+        assert response.status_code == status.HTTP_201_CREATED
+        duplicates = response.data['possible_duplicates']
+        assert [row['id'] for row in duplicates] == [original.id]
+        assert duplicates[0]['similarity'] >= 0.5
+
+    def test_duplicates_are_scoped_to_project(self, authenticated_client, project, user):
+        """
+        Test that issues in other projects are never reported.
+        """
+        api_client, _ = authenticated_client
+        other = Project.objects.create(name='Other', description='Other project', created_by=user)
+        Issue.objects.create(title='Blank page after login', description=self.DESCRIPTION, project=other, reporter=user)
+        response = api_client.post(
+            f'/api/issues/create-for-project/{project.id}/',
+            {'title': 'Blank page after login', 'description': self.DESCRIPTION, 'project': project.id},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['possible_duplicates'] == []
+
+    def test_index_follows_edits_and_rebuild(self, project, user):
+        """
+        Test that edits refresh the signature and the rebuild command restores it.
+        """
+        from io import StringIO
+        from django.core.management import call_command
+        from .duplicates import find_duplicates
+        from .models import IssueBucket, IssueSignature
+        issue = Issue.objects.create(title='Unrelated', description='Nothing alike', project=project, reporter=user)
+        assert find_duplicates(project.id, 'Blank page after login', self.DESCRIPTION) == []
+
+        issue.title = 'Blank page after login'
+        issue.description = self.DESCRIPTION
+        issue.save()
+        assert [row['id'] for row in find_duplicates(project.id, 'Blank page after login', self.DESCRIPTION)] == [issue.id]
+
+        IssueBucket.objects.all().delete()
+        IssueSignature.objects.all().delete()
+        call_command('rebuild_duplicate_index', stdout=StringIO())
+        assert [row['id'] for row in find_duplicates(project.id, 'Blank page after login', self.DESCRIPTION)] == [issue.id]
+
+
+@pytest.mark.django_db
+class TestIndexAdvisor:
+    """
+    Test the index_advisor management command.
+    """
+
+    def test_reports_and_rolls_back(self):
+        """
+        Test that the advisor reports on the workload and leaves no data or indexes behind.
+        """
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        out = StringIO()
+        call_command('index_advisor', issues=300, repeat=1, min_gain=-1, stdout=out)
+        output = out.getvalue()
+        assert 'issue_list_by_project' in output
+        assert 'Indexes unused by the workload' in output
+        assert 'migrations.AddIndex' in output
+        assert not Issue.objects.exists()
+        with connection.cursor() as cursor:
+            names = connection.introspection.get_constraints(cursor, Issue._meta.db_table)
+        assert 'issue_reporter_created_idx' not in names
+
+
+@pytest.mark.django_db
+class TestIssueBulkEndpoint:
+    """
+    Test the bulk write endpoint.
+    """
+
+    def _issue(self, project, reporter, **kwargs):
+        return Issue.objects.create(
+            title=kwargs.pop('title', 'Issue'), description='Desc', project=project, reporter=reporter, **kwargs
+        )
+
+    def test_mixed_batch(self, authenticated_client, project, user, another_user):
+        """
+        Test creates, updates, status changes and deletes in one request.
+        """
+        api_client, _ = authenticated_client
+        to_update = self._issue(project, user)
+        to_close = self._issue(project, another_user, assignee=user)
+        to_delete = self._issue(project, user)
+        payload = {
+            'create': [
+                {'title': f'New {index}', 'description': 'Desc', 'project': project.id, 'assignee': another_user.id}
+                for index in range(3)
+            ],
+            'update': [{'id': to_update.id, 'title': 'Renamed', 'priority': 'high'}],
+            'status': [{'id': to_close.id, 'status': 'closed'}],
+            'delete': [to_delete.id],
+        }
+        response = api_client.post('/api/issues/bulk/', payload, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['errors'] == []
+        assert len(response.data['created']) == 3
+        assert response.data['created'][0]['reporter'] == user.id
+        assert response.data['deleted'] == [to_delete.id]
+
+        to_update.refresh_from_db()
+        to_close.refresh_from_db()
+        project.refresh_from_db()
+        assert (to_update.title, to_update.priority) == ('Renamed', 'high')
+        assert to_close.status == 'closed'
+        assert not Issue.objects.filter(pk=to_delete.pk).exists()
+        assert project.issue_count == 5
+
+        from search.backends import get_search_backend
+        assert len(get_search_backend().search('new', project_id=project.id)) == 3
+
+    def test_atomic_batch_reports_item_errors(self, authenticated_client, project, user, another_user):
+        """
+        Test that an invalid item or a forbidden issue aborts the whole batch.
+        """
+        api_client, _ = authenticated_client
+        foreign = self._issue(project, another_user)
+        payload = {
+            'create': [
+                {'title': 'Valid', 'description': 'Desc', 'project': project.id},
+                {'title': 'Bad', 'description': 'Desc', 'project': project.id, 'priority': 'urgent'},
+            ],
+            'status': [{'id': foreign.id, 'status': 'closed'}],
+            'delete': [999999],
+        }
+        response = api_client.post('/api/issues/bulk/', payload, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = {(entry['op'], entry['index']): entry for entry in response.data['errors']}
+        assert set(errors) == {('create', 1), ('status', 0), ('delete', 0)}
+        assert 'priority' in errors[('create', 1)]['errors']
+        assert not Issue.objects.filter(title='Valid').exists()
+
+    def test_non_atomic_batch_applies_valid_items(self, authenticated_client, project, user):
+        """
+        Test that atomic=false applies the valid items and reports the rest.
+        """
+        api_client, _ = authenticated_client
+        payload = {
+            'create': [
+                {'title': 'Valid', 'description': 'Desc', 'project': project.id},
+                {'title': 'Bad', 'description': 'Desc', 'project': 999999},
+            ],
+            'atomic': False,
+        }
+        response = api_client.post('/api/issues/bulk/', payload, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['title'] for row in response.data['created']] == ['Valid']
+        assert response.data['errors'][0]['index'] == 1
+
+    def test_items_write_only_their_own_fields(self, authenticated_client, project, user, monkeypatch):
+        """
+        Test that an item's UPDATE leaves fields only other items change alone.
+        """
+        from .bulk import BulkIssueWriter
+        api_client, _ = authenticated_client
+        renamed, closed = self._issue(project, user), self._issue(project, user)
+        validate = BulkIssueWriter.validate
+
+        def validate_after_concurrent_edit(writer, batch):
+            # Another client edits the loaded row before the batch writes.
+            Issue.objects.filter(pk=closed.pk).update(title='Edited elsewhere')
+            return validate(writer, batch)
+        monkeypatch.setattr(BulkIssueWriter, 'validate', validate_after_concurrent_edit)
+        payload = {
+            'update': [{'id': renamed.id, 'title': 'Renamed'}],
+            'status': [{'id': closed.id, 'status': 'closed'}],
+        }
+        assert api_client.post('/api/issues/bulk/', payload, format='json').status_code == status.HTTP_200_OK
+        closed.refresh_from_db()
+        assert (closed.title, closed.status) == ('Edited elsewhere', 'closed')
+        assert Issue.objects.get(pk=renamed.pk).title == 'Renamed'
+
+    def test_query_count_is_independent_of_batch_size(self, authenticated_client, project, user, django_assert_max_num_queries):
+        """
+        Test that validation and permission checks do not query per item.
+        """
+        api_client, _ = authenticated_client
+        targets = [self._issue(project, user, title=f'Issue {index}') for index in range(30)]
+        payload = {
+            'create': [{'title': f'New {index}', 'description': 'Desc', 'project': project.id} for index in range(30)],
+            'status': [{'id': issue.id, 'status': 'in_progress'} for issue in targets],
+        }
+        with django_assert_max_num_queries(22):
+            response = api_client.post('/api/issues/bulk/', payload, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert Issue.objects.filter(status='in_progress').count() == 30
+
+    def test_delete_query_count_is_independent_of_batch_size(self, authenticated_client, project, user):
+        """
+        Test that deletes update counters, statistics and the index once per batch.
+        """
+        from django.db import connection
+        from django.db.models import Sum
+        from django.test.utils import CaptureQueriesContext
+        from projects.models import ProjectIssueStat
+        from search.backends import get_search_backend
+        api_client, _ = authenticated_client
+
+        def delete_cost(count):
+            ids = [self._issue(project, user, title=f'Doomed {index}').pk for index in range(count)]
+            with CaptureQueriesContext(connection) as captured:
+                response = api_client.post('/api/issues/bulk/', {'delete': ids}, format='json')
+            assert response.data['deleted'] == ids
+            return len(captured)
+
+        self._issue(project, user, title='Survivor')
+        assert delete_cost(3) == delete_cost(30)
+        project.refresh_from_db()
+        assert project.issue_count == 1
+        assert ProjectIssueStat.objects.filter(project=project).aggregate(total=Sum('count'))['total'] == 1
+        assert get_search_backend().search('doomed', project_id=project.id) == []
+
+
+@pytest.mark.django_db
+class TestIssueExport:
+    """
+    Test the streaming CSV / NDJSON export endpoint and command.
+    """
+
+    @pytest.fixture
+    def dataset(self, user, another_user):
+        from comments.models import Comment
+        project = Project.objects.create(name='Export', description='', created_by=user)
+        other = Project.objects.create(name='Other', description='', created_by=user)
+        issues = Issue.objects.bulk_create([
+            Issue(title=f'Issue {index}', description='Line one\nline, "two"', project=project, reporter=user,
+                  status='closed' if index % 3 == 0 else 'open', priority='high' if index % 2 else 'low')
+            for index in range(7)
+        ] + [Issue(title='Elsewhere', description='', project=other, reporter=user)])
+        issues[0].title = '=HYPERLINK("http://example.invalid")'
+        issues[0].save()
+        Comment.objects.bulk_create([
+            Comment(content=f'Comment {index}', issue=issues[index % 3], author=another_user)
+            for index in range(5)
+        ] + [Comment(content='Other project', issue=issues[-1], author=user)])
+        return project, issues
+
+    def export(self, client, project, query=''):
+        response = client.get(f'/api/projects/{project.id}/export/{query}')
+        assert response.status_code == status.HTTP_200_OK, response.content
+        assert response.streaming
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_export_with_comments(self, authenticated_client, dataset):
+        """
+        Test one CSV row per comment, issues without comments included, formulas neutralised.
+        """
+        import csv
+        import io
+        client, user = authenticated_client
+        project, issues = dataset
+        response, body = self.export(client, project, '?comments=1')
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        assert response['Content-Disposition'] == f'attachment; filename="project-{project.id}-issues.csv"'
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert [row['id'] for row in rows] == [
+            str(issue.id) for issue in issues[:7] for _ in range(max(1, [2, 2, 1, 0, 0, 0, 0][issues.index(issue)]))
+        ]
+        first = [row for row in rows if row['id'] == str(issues[0].id)]
+        assert [row['comment_content'] for row in first] == ['Comment 0', 'Comment 3']
+        assert first[0]['title'] == '\'=HYPERLINK("http://example.invalid")'
+        assert first[0]['description'] == 'Line one\nline, "two"'
+        assert rows[-1]['comment_id'] == '' and rows[-1]['assignee'] == ''
+        assert 'Other project' not in body
+
+    def test_ndjson_export_matches_api_and_filters(self, authenticated_client, dataset):
+        """
+        Test NDJSON lines against the issue API, with filters applied to issues and comments.
+        """
+        import json
+        client, user = authenticated_client
+        project, issues = dataset
+        response, body = self.export(client, project, '?format=ndjson&comments=true&status=closed&priority=low')
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in body.splitlines()]
+        assert [line['id'] for line in lines] == [issues[0].id, issues[6].id]
+        detail = client.get(f'/api/issues/{issues[0].id}/').json()
+        assert {key: value for key, value in lines[0].items() if key != 'comments'} == detail
+        assert [comment['content'] for comment in lines[0]['comments']] == ['Comment 0', 'Comment 3']
+        assert set(lines[0]['comments'][0]) == {'id', 'author', 'author_name', 'content', 'created_at'}
+        assert lines[1]['comments'] == []
+
+        _, plain = self.export(client, project, '?format=ndjson')
+        assert all('comments' not in json.loads(line) for line in plain.splitlines())
+
+    def test_date_range_and_invalid_filters(self, authenticated_client, dataset):
+        """
+        Test created_after / created_before and 400s for bad filter values.
+        """
+        import datetime
+        from django.utils import timezone
+        client, user = authenticated_client
+        project, issues = dataset
+        Issue.objects.filter(pk=issues[1].pk).update(created_at=timezone.now() - datetime.timedelta(days=30))
+        cutoff = (timezone.now() - datetime.timedelta(days=1)).date().isoformat()
+        _, recent = self.export(client, project, f'?format=ndjson&created_after={cutoff}')
+        _, old = self.export(client, project, f'?format=ndjson&created_before={cutoff}')
+        assert len(recent.splitlines()) == 6
+        assert len(old.splitlines()) == 1
+
+        for query in ('?status=bogus', '?created_after=yesterday'):
+            response = client.get(f'/api/projects/{project.id}/export/{query}')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert response.content.startswith(b'field,message\r\nerror,')
+        assert client.get('/api/projects/999999/export/').status_code == status.HTTP_404_NOT_FOUND
+
+    def test_export_command(self, dataset, tmp_path):
+        """
+        Test the export_issues command to stdout and to a file.
+        """
+        import json
+        from io import StringIO
+        from django.core.management import CommandError, call_command
+        project, issues = dataset
+        out = StringIO()
+        call_command('export_issues', project.id, export_format='ndjson', comments=True, status='open', stdout=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [line['id'] for line in lines] == [issue.id for issue in issues[:7] if issue.status == 'open']
+
+        target = tmp_path / 'export.csv'
+        call_command('export_issues', project.id, output=str(target), stderr=StringIO())
+        assert target.read_text().count('\n') > 7
+        with pytest.raises(CommandError):
+            call_command('export_issues', 999999)
+        with pytest.raises(CommandError):
+            call_command('export_issues', project.id, priority='urgent')
+
+
+@pytest.mark.django_db
+class TestIssueImport:
+    """
+    Test the bulk issue import command and upload endpoint.
+    """
+
+    @pytest.fixture
+    def project(self, user):
+        return Project.objects.create(name='Imported', description='', created_by=user)
+
+    def write_ndjson(self, path, records):
+        import json
+        path.write_text(''.join(
+            (record if isinstance(record, str) else json.dumps(record)) + '\n' for record in records
+        ))
+        return path
+
+    def test_ndjson_command_imports_and_rejects(self, project, user, another_user, tmp_path):
+        """
+        Test resolution by name and email, preserved timestamps, counters, search and rejects.
+        """
+        import json
+        from io import StringIO
+        from django.core.management import call_command
+        from search.backends import search_issues
+        source = self.write_ndjson(tmp_path / 'issues.ndjson', [
+            {'title': 'Migrated crash', 'description': 'Crashes on boot', 'project_name': 'Imported',
+             'reporter': 'another@example.com', 'assignee': 'testuser', 'status': 'closed',
+             'created_at': '2020-01-02T03:04:05Z',
+             'comments': [{'content': 'Seen it', 'author': 'testuser', 'created_at': '2020-01-03T00:00:00Z'},
+                          {'content': 'Me too'}]},
+            {'title': 'No comments', 'project': project.id},
+            '{"title": ',
+            {'title': '', 'project': project.id, 'status': 'bogus'},
+            {'title': 'Unknown user', 'project': project.id, 'reporter': 'ghost@example.com'},
+            {'title': 'Bad comment', 'project': project.id, 'comments': [{'content': ''}]},
+        ])
+        out = StringIO()
+        call_command('import_issues', str(source), reporter='testuser', batch_size=1, stdout=out)
+        output = out.getvalue()
+        assert 'Imported 2 issues and 2 comments' in output
+        assert '4 rejected' in output
+        assert 'rows/s' in output and 'offset 1:' in output
+
+        migrated = Issue.objects.get(title='Migrated crash')
+        assert (migrated.project_id, migrated.reporter_id, migrated.assignee_id) == (project.id, another_user.id, user.id)
+        assert migrated.status == 'closed'
+        assert migrated.created_at.year == 2020
+        assert migrated.comment_count == 2
+        comments = list(migrated.comments.order_by('id'))
+        assert [comment.author_id for comment in comments] == [user.id, another_user.id]
+        assert comments[0].created_at.day == 3
+        assert Issue.objects.get(title='No comments').reporter_id == user.id
+        project.refresh_from_db()
+        assert project.issue_count == 2
+        assert [hit.issue_id for hit in search_issues('boot', project_id=project.id)] == [migrated.id]
+
+        rejects = [json.loads(line) for line in (tmp_path / 'issues.ndjson.rejects.ndjson').read_text().splitlines()]
+        assert [reject['offset'] for reject in rejects] == [3, 4, 5, 6]
+        assert 'Invalid JSON' in rejects[0]['errors']['record'][0]
+        assert set(rejects[1]['errors']) == {'title', 'status'}
+        assert rejects[2]['errors'] == {'reporter': ["Unknown user 'ghost@example.com'."]}
+        assert 'comments[0]' in rejects[3]['errors']
+
+    def test_resume_from_offset(self, project, tmp_path):
+        """
+        Test that --offset skips records already imported.
+        """
+        from io import StringIO
+        from django.core.management import call_command
+        source = self.write_ndjson(tmp_path / 'issues.jsonl', [
+            {'title': f'Issue {index}', 'project': project.id} for index in range(5)
+        ])
+        call_command('import_issues', str(source), offset=3, stdout=StringIO())
+        assert sorted(Issue.objects.values_list('title', flat=True)) == ['Issue 3', 'Issue 4']
+
+    def test_export_round_trip_through_upload(self, authenticated_client, api_client, project, user, another_user):
+        """
+        Test that a CSV export uploaded to another project reproduces its issues and comments.
+        """
+        import csv
+        import io
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from comments.models import Comment
+        client, user = authenticated_client
+        issues = [
+            Issue.objects.create(title='=SUM(A1)', description='Multi\nline, "quoted"', project=project,
+                                 reporter=another_user, assignee=user, priority='high'),
+            Issue.objects.create(title='Plain', description='', project=project, reporter=user),
+        ]
+        Comment.objects.create(content='First', issue=issues[0], author=user)
+        Comment.objects.create(content='Second', issue=issues[0], author=another_user)
+        exported = b''.join(client.get(f'/api/projects/{project.id}/export/?comments=1').streaming_content)
+
+        target = Project.objects.create(name='Target', description='', created_by=user)
+        upload = SimpleUploadedFile('issues.csv', exported, content_type='text/csv')
+        response = client.post(f'/api/projects/{target.id}/import/', {'file': upload}, format='multipart')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        user.is_staff = True
+        user.save()
+        upload.seek(0)
+        response = client.post(f'/api/projects/{target.id}/import/', {'file': upload}, format='multipart')
+        assert response.status_code == status.HTTP_200_OK, response.content
+        assert response.data['issues'] == 2 and response.data['comments'] == 2 and response.data['rejected'] == 0
+
+        def rows(project_id):
+            body = b''.join(client.get(f'/api/projects/{project_id}/export/?comments=1').streaming_content)
+            ignored = {'id', 'project', 'project_name', 'updated_at', 'comment_id'}
+            return [
+                {key: value for key, value in row.items() if key not in ignored}
+                for row in csv.DictReader(io.StringIO(body.decode('utf-8')))
+            ]
+        assert rows(target.id) == rows(project.id)
+
+        bad = SimpleUploadedFile('issues.csv', b'title,status\nOnly,open,extra\n')
+        response = client.post(f'/api/projects/{target.id}/import/', {'file': bad}, format='multipart')
+        assert response.data['rejected'] == 1
+        assert response.data['rejects'] == [{'offset': 1, 'errors': {'record': ['Wrong number of columns.']}}]
+        response = client.post(f'/api/projects/{target.id}/import/', {}, format='multipart')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestStatusHistory:
+    """
+    Test status transition history and cycle-time analytics.
+    """
+
+    def transitions(self, issue):
+        return list(issue.status_transitions.values_list('from_status', 'to_status'))
+
+    def test_status_changes_are_recorded(self, authenticated_client, project, user):
+        """
+        Test that creates, status updates, PATCH, model saves and bulk writes append transitions.
+        """
+        api_client, _ = authenticated_client
+        response = api_client.post('/api/issues/', {'title': 'Tracked', 'description': 'Desc', 'project': project.id})
+        issue = Issue.objects.get(pk=response.data['id'])
+        api_client.patch(f'/api/issues/{issue.id}/update_status/', {'status': 'in_progress'}, format='json')
+        api_client.patch(f'/api/issues/{issue.id}/', {'title': 'Renamed'}, format='json')
+        api_client.patch(f'/api/issues/{issue.id}/', {'status': 'closed'}, format='json')
+        issue.refresh_from_db()
+        issue.status = 'open'
+        issue.save()
+        payload = {'status': [{'id': issue.id, 'status': 'closed'}]}
+        assert api_client.post('/api/issues/bulk/', payload, format='json').status_code == status.HTTP_200_OK
+        assert self.transitions(issue) == [
+            (None, 'open'), ('open', 'in_progress'), ('in_progress', 'closed'), ('closed', 'open'), ('open', 'closed'),
+        ]
+
+        response = api_client.get(f'/api/issues/{issue.id}/history/')
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['to_status'] for row in response.data] == ['open', 'in_progress', 'closed', 'open', 'closed']
+
+    def test_cycle_time_analytics(self, authenticated_client, project, user):
+        """
+        Test lead time, cycle time and time-in-status percentiles for a window.
+        """
+        import datetime
+        from django.utils import timezone
+        from .models import IssueStatusTransition
+        api_client, _ = authenticated_client
+        t0 = timezone.now().replace(microsecond=0) - datetime.timedelta(days=2)
+        hour = datetime.timedelta(hours=1)
+
+        def issue_with(*steps):
+            issue = Issue.objects.create(title='Issue', description='', project=project, reporter=user)
+            Issue.objects.filter(pk=issue.pk).update(created_at=t0)
+            issue.status_transitions.all().delete()
+            IssueStatusTransition.objects.bulk_create([
+                IssueStatusTransition(issue=issue, from_status=from_status, to_status=to_status, changed_at=t0 + hours * hour)
+                for from_status, to_status, hours in steps
+            ])
+
+        issue_with((None, 'open', 0), ('open', 'in_progress', 1), ('in_progress', 'closed', 3))
+        issue_with((None, 'open', 0), ('open', 'closed', 1))
+        # Created before history was recorded: the first status starts at created_at.
+        issue_with(('open', 'closed', 5))
+        issue_with((None, 'open', 0), ('open', 'closed', 30))
+
+        window = f'start={(t0 + hour).isoformat()}&end={(t0 + 6 * hour).isoformat()}'.replace('+', '%2B')
+        response = api_client.get(f'/api/projects/{project.id}/analytics/?{window}')
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert response.data['completed'] == 3
+        assert response.data['lead_time'] == {
+            'count': 3, 'mean': 10800.0, 'p50': 10800.0, 'p75': 14400.0, 'p90': 16560.0, 'p95': 17280.0,
+        }
+        assert response.data['cycle_time']['count'] == 1
+        assert response.data['cycle_time']['p50'] == 7200.0
+        assert response.data['time_in_status']['open']['count'] == 3
+        assert response.data['time_in_status']['open']['p50'] == 3600.0
+        assert response.data['time_in_status']['in_progress']['mean'] == 7200.0
+        assert response['X-Cache'] == 'MISS'
+        assert api_client.get(f'/api/projects/{project.id}/analytics/?{window}')['X-Cache'] == 'HIT'
+
+        issue = Issue.objects.filter(project=project).first()
+        issue.status = 'in_progress'
+        issue.save()
+        assert api_client.get(f'/api/projects/{project.id}/analytics/?{window}')['X-Cache'] == 'MISS'
+
+        response = api_client.get(f'/api/projects/{project.id}/analytics/?start=2024-02-01&end=2024-01-01')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestCompoundDocuments:
+    """
+    Test ?include= on issue list and retrieve.
+    """
+
+    @pytest.fixture
+    def dataset(self, project, user, another_user):
+        from comments.models import Comment
+        issues = [
+            Issue.objects.create(
+                title=f'Issue {index}', description='Desc', project=project, reporter=user,
+                assignee=another_user if index % 2 else None,
+            )
+            for index in range(4)
+        ]
+        for issue in issues[:2]:
+            for index in range(3):
+                Comment.objects.create(content=f'{issue.title} comment {index}', issue=issue, author=another_user)
+        return issues
+
+    def test_list_includes_related_rows_once(self, authenticated_client, dataset, project, user, another_user):
+        """
+        Test that included users, projects and comments are deduplicated and limited per issue.
+        """
+        api_client, _ = authenticated_client
+        response = api_client.get('/api/issues/?include=comments,reporter,assignee,project&comments_limit=2')
+        assert response.status_code == status.HTTP_200_OK
+        included = response.data['included']
+        assert sorted(row['id'] for row in included['users']) == sorted([user.id, another_user.id])
+        assert [row['id'] for row in included['projects']] == [project.id]
+        assert included['projects'][0]['created_by'] == user.id
+        by_issue = {}
+        for row in included['comments']:
+            by_issue.setdefault(row['issue'], []).append(row['content'])
+        assert by_issue == {
+            issue.id: [f'{issue.title} comment 2', f'{issue.title} comment 1'] for issue in dataset[:2]
+        }
+        assert len(response.data['results']) == 4
+        assert 'included' not in api_client.get('/api/issues/').data
+
+    def test_query_count_is_independent_of_page_size(self, authenticated_client, dataset, project, user):
+        """
+        Test that every included type costs one query whatever the number of issues.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        api_client, _ = authenticated_client
+        url = f'/api/issues/?project_id={project.id}&include=comments,reporter,assignee,project&cursor=&page_size='
+        with CaptureQueriesContext(connection) as two:
+            assert len(api_client.get(url + '2').data['results']) == 2
+        with CaptureQueriesContext(connection) as four:
+            assert len(api_client.get(url + '4').data['results']) == 4
+        with CaptureQueriesContext(connection) as plain:
+            api_client.get(f'/api/issues/?project_id={project.id}&cursor=&page_size=4')
+        assert len(two) == len(four) == len(plain) + 3
+
+    def test_retrieve_and_project_issues(self, authenticated_client, dataset, project):
+        """
+        Test includes on a retrieved issue, with sparse fields, and on the project issue list.
+        """
+        api_client, _ = authenticated_client
+        issue = dataset[1]
+        response = api_client.get(f'/api/issues/{issue.id}/?include=comments,assignee&fields=title')
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {'title', 'id', 'assignee', 'included'}
+        assert [row['id'] for row in response.data['included']['users']] == [issue.assignee_id]
+        assert len(response.data['included']['comments']) == 3
+
+        response = api_client.get(f'/api/projects/{project.id}/issues/?include=comments&comments_limit=1')
+        assert len(response.data['results']) == 4
+        assert len(response.data['included']['comments']) == 2
+        response = api_client.get(f'/api/projects/{project.id}/issues/?include=reporter&cursor=')
+        assert len(response.data['included']['users']) == 1
+
+    def test_new_comment_changes_etag(self, authenticated_client, dataset, another_user):
+        """
+        Test that a new comment invalidates validators of responses including comments.
+        """
+        from comments.models import Comment
+        api_client, _ = authenticated_client
+        url = f'/api/issues/{dataset[3].id}/?include=comments'
+        etag = api_client.get(url)['ETag']
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+        Comment.objects.create(content='New', issue=dataset[3], author=another_user)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['content'] for row in response.data['included']['comments']] == ['New']
+
+    def test_new_issue_changes_included_project_etag(self, authenticated_client, dataset, another_user):
+        """
+        Test that a new issue invalidates responses embedding its project's issue count.
+        """
+        api_client, _ = authenticated_client
+        url = f'/api/issues/{dataset[3].id}/?include=project'
+        response = api_client.get(url)
+        count = response.data['included']['projects'][0]['issue_count']
+        Issue.objects.create(title='New', description='Desc', project=dataset[3].project, reporter=another_user)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['included']['projects'][0]['issue_count'] == count + 1
+
+    def test_invalid_parameters(self, authenticated_client, dataset):
+        """
+        Test that unknown includes and malformed limits are rejected.
+        """
+        api_client, _ = authenticated_client
+        for query in ('include=watchers', 'include=comments&comments_limit=-1', 'include=comments&comments_limit=x'):
+            assert api_client.get(f'/api/issues/?{query}').status_code == status.HTTP_400_BAD_REQUEST
@@ -6,24 +6,48 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
+from bug_tracking.pagination import EstimatedKeysetPagination
+from bug_tracking.renderers import EventStreamRenderer
+from bug_tracking.sparse import SparseFieldsMixin
+from bug_tracking.streaming import StreamingListMixin
+from bug_tracking.values import ValuesReadMixin
+from caching.conditional import SINGLE_OBJECT_ACTIONS, ConditionalRequestMixin
+from caching.mixins import CachedResponseMixin
+from caching.store import USERS_SCOPE, project_scope
+from events.broker import issue_topic
+from events.stream import event_stream_response
+from search.backends import annotate_search_rows, search_issues
+from .bulk import BulkIssueWriter
+from .duplicates import find_duplicates
+from .includes import IssueIncludeMixin
 from .models import Issue
-from .serializers import IssueSerializer
+from .serializers import IssueSerializer, IssueStatusTransitionSerializer, IssueValuesSerializer
 from .permissions import IsReporterOrAssignee
 
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(
+    ConditionalRequestMixin, StreamingListMixin, CachedResponseMixin, IssueIncludeMixin, SparseFieldsMixin,
+    ValuesReadMixin, viewsets.ModelViewSet,
+):
     """
     ViewSet for Issue model.
     Provides CRUD operations for issues.
     """
     serializer_class = IssueSerializer
+    values_serializer_class = IssueValuesSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = EstimatedKeysetPagination
+    conditional_timestamp_fields = (
+        'updated_at', 'project__updated_at', 'reporter__updated_at', 'assignee__updated_at'
+    )
+    conditional_counter_fields = ('comment_count',)
+    conditional_object_actions = SINGLE_OBJECT_ACTIONS + ('update_status', 'assign')
 
     def get_queryset(self):
         """
-        Optimize queries using select_related and prefetch_related.
+        Optimize queries using select_related.
         """
-        queryset = Issue.objects.select_related('project', 'reporter', 'assignee').prefetch_related('comments')
+        queryset = Issue.objects.select_related('project', 'reporter', 'assignee')
         
         # Filter by project if project_id is provided
         project_id = self.request.query_params.get('project_id')
@@ -32,6 +56,53 @@ class IssueViewSet(viewsets.ModelViewSet):
         
         return queryset
 
+    def get_cache_scopes(self):
+        """
+        Key issue lists filtered by project on that project's version only.
+        """
+        project_id = self.request.query_params.get('project_id')
+        if self.action == 'list' and project_id:
+            return [project_scope(project_id), USERS_SCOPE]
+        return super().get_cache_scopes()
+
+    def get_conditional_timestamp_fields(self):
+        """
+        Also validate against the rows ``?include=`` embeds.
+        """
+        fields = super().get_conditional_timestamp_fields()
+        includes = self.get_includes()
+        if includes is not None:
+            fields = tuple(fields) + includes.timestamp_fields()
+        return fields
+
+    def get_conditional_counter_fields(self):
+        fields = super().get_conditional_counter_fields()
+        includes = self.get_includes()
+        if includes is not None:
+            fields = tuple(fields) + includes.counter_fields()
+        return fields
+
+    def create(self, request, *args, **kwargs):
+        """
+        Create an issue and report likely duplicates in the same project.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response(self.with_duplicates(serializer), status=status.HTTP_201_CREATED, headers=headers)
+
+    def with_duplicates(self, serializer):
+        """
+        Return serialized issue data with a possible_duplicates list added.
+        """
+        issue = serializer.instance
+        data = dict(serializer.data)
+        data['possible_duplicates'] = find_duplicates(
+            issue.project_id, issue.title, issue.description, exclude_id=issue.pk
+        )
+        return data
+
     def perform_create(self, serializer):
         """
         Set the reporter field to the current user.
@@ -57,14 +128,72 @@ class IssueViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
             serializer.save(reporter=request.user, project=project)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response(self.with_duplicates(serializer), status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create, update, change the status of and delete many issues at once.
+
+        Body: ``{"create": [...], "update": [{"id": ..}], "status": [{"id": .., "status": ..}],
+        "delete": [ids], "atomic": true}``. Updates, status changes and deletes
+        require the user to be the reporter or assignee of each issue.
+        """
+        atomic = True
+        if isinstance(request.data, dict):
+            atomic = request.data.get('atomic', True) is not False
+        data, ok = BulkIssueWriter(request, self).run(request.data, atomic=atomic)
+        return Response(data, status=status.HTTP_200_OK if ok else status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search over issue titles, descriptions and comments.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'Query parameter q is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        project_id = request.query_params.get('project_id')
+        if project_id and not project_id.isdigit():
+            return Response({'error': 'Invalid project_id.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        hits = search_issues(query, project_id=project_id or None)
+        issues = {issue.pk: issue for issue in self.get_queryset().filter(pk__in=[hit.issue_id for hit in hits])}
+        ranked = [issues[hit.issue_id] for hit in hits if hit.issue_id in issues]
+        serializer = self.get_serializer(ranked, many=True)
+        return Response(annotate_search_rows(serializer.data, hits))
+
+    @action(detail=True, methods=['get'], renderer_classes=[EventStreamRenderer])
+    def events(self, request, pk=None):
+        """
+        Stream the issue's and its comments' changes as Server-Sent Events.
+
+        Each event is ``issue.updated``, ``issue.deleted`` or
+        ``comment.created|updated|deleted`` with the committed row in
+        ``data``; ``reset`` means events were dropped and the client should refetch.
+        """
+        issue = self.get_object()
+        return event_stream_response([issue_topic(issue.pk)], request)
+
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """
+        List the issue's status transitions, oldest first.
+        """
+        issue = self.get_object()
+        serializer = IssueStatusTransitionSerializer(issue.status_transitions.all(), many=True)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
         """
-        Update the status of an issue.
+        Update the status of an issue; honours If-Match like PATCH on the issue.
         """
+        return self.conditional_response(self.set_status, request, pk=pk)
+
+    def set_status(self, request, pk=None):
         issue = self.get_object()
         self.check_object_permissions(request, issue)
         
@@ -80,8 +209,11 @@ class IssueViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['patch'])
     def assign(self, request, pk=None):
         """
-        Assign an issue to a user.
+        Assign an issue to a user; honours If-Match like PATCH on the issue.
         """
+        return self.conditional_response(self.set_assignee, request, pk=pk)
+
+    def set_assignee(self, request, pk=None):
         issue = self.get_object()
         self.check_object_permissions(request, issue)
         
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_issue_count(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Issue = apps.get_model('issues', 'Issue')
+    counts = (
+        Issue.objects.filter(project=OuterRef('pk'))
+        .order_by()
+        .values('project')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Project.objects.update(issue_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_rename_projects_pr_created_idx_projects_pr_created_6b02e3_idx_and_more'),
+        ('issues', '0002_rename_issues_issu_status_idx_issues_issu_status_003ba6_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_issue_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:10
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def backfill_issue_stats(apps, schema_editor):
+    Issue = apps.get_model('issues', 'Issue')
+    ProjectIssueStat = apps.get_model('projects', 'ProjectIssueStat')
+    rows = (
+        Issue.objects.order_by()
+        .values_list('project_id', 'status', 'priority', 'assignee_id')
+        .annotate(total=Count('id'))
+    )
+    ProjectIssueStat.objects.bulk_create([
+        ProjectIssueStat(project_id=project_id, status=status, priority=priority, assignee=assignee_id or 0, count=total)
+        for project_id, status, priority, assignee_id, total in rows.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_issue_count'),
+        ('issues', '0005_issue_duplicate_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectIssueStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=20)),
+                ('priority', models.CharField(max_length=20)),
+                ('assignee', models.PositiveIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='issue_stats', to='projects.project')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='projectissuestat',
+            constraint=models.UniqueConstraint(fields=('project', 'status', 'priority', 'assignee'), name='project_issue_stat_bucket'),
+        ),
+        migrations.RunPython(backfill_issue_stats, migrations.RunPython.noop),
+    ]
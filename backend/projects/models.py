@@ -1,7 +1,7 @@
 """
 Models for projects app.
 """
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -16,6 +16,12 @@ class Project(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='projects')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    issue_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Denormalized counters maintained by signals; never written by save().
+    COUNTER_FIELDS = ('issue_count',)
+    # Values remembered at load time so signal handlers can tell what changed.
+    TRACKED_FIELDS = ('name', 'description')
 
     class Meta:
         ordering = ['-created_at']
@@ -26,3 +32,66 @@ class Project(models.Model):
 
     def __str__(self):
         return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember tracked field values so changes can be detected on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_fields()
+        return instance
+
+    def _remember_tracked_fields(self):
+        self._loaded_values = {name: self.__dict__[name] for name in self.TRACKED_FIELDS if name in self.__dict__}
+
+    def get_loaded_value(self, attname):
+        """
+        Return the value a tracked field had when last loaded or saved.
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        if attname in loaded:
+            return loaded[attname]
+        return getattr(self, attname)
+
+    def save(self, *args, **kwargs):
+        """
+        Save the project without overwriting counters maintained elsewhere.
+        """
+        if not self._state.adding and not args and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._remember_tracked_fields()
+
+
+class ProjectIssueStat(models.Model):
+    """
+    Number of a project's issues with one (status, priority, assignee) combination.
+
+    Maintained incrementally by issue signals (see ``projects.stats``) and
+    rebuilt by ``manage.py rebuild_project_stats``.
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='issue_stats')
+    status = models.CharField(max_length=20)
+    priority = models.CharField(max_length=20)
+    # User pk, 0 when unassigned. Not a foreign key: a NULL in the unique key
+    # would let concurrent writers create duplicate buckets.
+    assignee = models.PositiveIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'status', 'priority', 'assignee'], name='project_issue_stat_bucket'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.project_id}/{self.status}/{self.priority}/{self.assignee}: {self.count}'
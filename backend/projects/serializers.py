@@ -2,6 +2,7 @@
 Serializers for projects app.
 """
 from rest_framework import serializers
+from bug_tracking.values import ValuesSerializer, full_name
 from .models import Project
 
 
@@ -10,15 +11,18 @@ class ProjectSerializer(serializers.ModelSerializer):
     Serializer for Project model.
     """
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
-    issue_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
         fields = ('id', 'name', 'description', 'created_by', 'created_by_name', 'created_at', 'updated_at', 'issue_count')
-        read_only_fields = ('id', 'created_by', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'created_by', 'created_at', 'updated_at', 'issue_count')
 
-    def get_issue_count(self, obj):
-        """
-        Get the count of issues for this project.
-        """
-        return obj.issues.count()
+
+class ProjectValuesSerializer(ValuesSerializer):
+    """
+    Read-only ProjectSerializer output built from values rows.
+    """
+    serializer_class = ProjectSerializer
+    computed_fields = {
+        'created_by_name': (('created_by__first_name', 'created_by__last_name'), full_name),
+    }
@@ -0,0 +1,178 @@
+"""
+Materialized issue statistics per project.
+"""
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from bug_tracking.values import full_name
+from issues.models import Issue
+from .models import ProjectIssueStat
+
+User = get_user_model()
+
+# Issue attributes a bucket is keyed on, in bucket tuple order.
+BUCKET_ATTNAMES = ('project_id', 'status', 'priority', 'assignee_id')
+
+
+def bucket_of(issue, changes=None, loaded=False):
+    """
+    Return the (project_id, status, priority, assignee) bucket of an issue.
+
+    With loaded, the bucket the issue was in when loaded; with changes (attname
+    to (old, new)), the bucket it was in before those changes.
+    """
+    values = []
+    for attname in BUCKET_ATTNAMES:
+        if loaded:
+            value = issue.get_loaded_value(attname)
+        elif changes is not None and attname in changes:
+            value = changes[attname][0]
+        else:
+            value = getattr(issue, attname)
+        values.append(value)
+    values[3] = values[3] or 0
+    return tuple(values)
+
+
+def apply_stat_deltas(deltas):
+    """
+    Add {bucket: delta} to the stored counts with one UPDATE per bucket.
+
+    Missing buckets are inserted; a concurrent insert of the same bucket is
+    caught by the unique constraint and retried as an update.
+    """
+    for bucket in sorted(bucket for bucket, delta in deltas.items() if delta and bucket[0] is not None):
+        delta = deltas[bucket]
+        project_id, status, priority, assignee = bucket
+        key = {'project_id': project_id, 'status': status, 'priority': priority, 'assignee': assignee}
+        if ProjectIssueStat.objects.filter(**key).update(count=F('count') + delta) or delta < 0:
+            continue
+        try:
+            with transaction.atomic():
+                ProjectIssueStat.objects.create(count=delta, **key)
+        except IntegrityError:
+            ProjectIssueStat.objects.filter(**key).update(count=F('count') + delta)
+
+
+def move_issue_stats(issue, previous_bucket):
+    """
+    Move one issue from previous_bucket (None when new) to its current bucket.
+    """
+    current = bucket_of(issue)
+    if previous_bucket != current:
+        deltas = Counter({current: 1})
+        if previous_bucket is not None:
+            deltas[previous_bucket] -= 1
+        apply_stat_deltas(deltas)
+
+
+def unassign_user_stats(user_id):
+    """
+    Fold a deleted user's buckets into the unassigned ones.
+
+    Deleting a user nulls ``Issue.assignee`` with a plain UPDATE, without signals.
+    """
+    rows = list(ProjectIssueStat.objects.filter(assignee=user_id))
+    deltas = Counter()
+    for row in rows:
+        deltas[(row.project_id, row.status, row.priority, 0)] += row.count
+    with transaction.atomic():
+        ProjectIssueStat.objects.filter(pk__in=[row.pk for row in rows]).delete()
+        apply_stat_deltas(deltas)
+
+
+def rebuild_project_stats(project_ids=None):
+    """
+    Recompute the buckets from the issue table and return how many were wrong.
+    """
+    issues = Issue.objects.order_by()
+    stats = ProjectIssueStat.objects.all()
+    if project_ids is not None:
+        issues = issues.filter(project_id__in=project_ids)
+        stats = stats.filter(project_id__in=project_ids)
+    fresh = Counter()
+    grouped = issues.values_list(*BUCKET_ATTNAMES).annotate(total=Count('id'))
+    for project_id, status, priority, assignee_id, total in grouped.iterator():
+        fresh[(project_id, status, priority, assignee_id or 0)] += total
+
+    with transaction.atomic():
+        stored = {
+            (row.project_id, row.status, row.priority, row.assignee): row.count
+            for row in stats.select_for_update()
+        }
+        drifted = sum(1 for bucket in set(fresh) | set(stored) if fresh.get(bucket, 0) != stored.get(bucket, 0))
+        stats.delete()
+        ProjectIssueStat.objects.bulk_create([
+            ProjectIssueStat(project_id=project_id, status=status, priority=priority, assignee=assignee, count=total)
+            for (project_id, status, priority, assignee), total in fresh.items()
+        ], batch_size=1000)
+    return drifted
+
+
+def summarize(rows, assignee_names):
+    """
+    Turn (status, priority, assignee, count) rows into the stats payload.
+    """
+    by_status = {choice: 0 for choice, label in Issue.STATUS_CHOICES}
+    by_priority = {choice: 0 for choice, label in Issue.PRIORITY_CHOICES}
+    by_assignee = Counter()
+    total = 0
+    for status, priority, assignee, count in rows:
+        total += count
+        by_status[status] = by_status.get(status, 0) + count
+        by_priority[priority] = by_priority.get(priority, 0) + count
+        by_assignee[assignee] += count
+    return {
+        'total': total,
+        'by_status': by_status,
+        'by_priority': by_priority,
+        'by_assignee': [
+            {
+                'assignee': assignee or None,
+                'assignee_name': assignee_names.get(assignee) if assignee else None,
+                'count': count,
+            }
+            for assignee, count in sorted(by_assignee.items(), key=lambda item: (-item[1], item[0]))
+            if count
+        ],
+    }
+
+
+def _assignee_names(user_ids):
+    users = User.objects.filter(pk__in=[pk for pk in user_ids if pk]).values_list('id', 'first_name', 'last_name')
+    return {pk: full_name(first_name, last_name) for pk, first_name, last_name in users}
+
+
+def _bucket_rows(queryset):
+    return list(queryset.filter(count__gt=0).values_list('project_id', 'status', 'priority', 'assignee', 'count'))
+
+
+def project_stats(project_id):
+    """
+    Return issue counts by status, priority and assignee for one project.
+    """
+    rows = _bucket_rows(ProjectIssueStat.objects.filter(project_id=project_id))
+    names = _assignee_names({row[3] for row in rows})
+    return summarize([row[1:] for row in rows], names)
+
+
+def all_project_stats(projects):
+    """
+    Return totals across projects plus per-project status and priority counts.
+
+    projects maps the pks of the projects to include to their names.
+    """
+    rows = _bucket_rows(ProjectIssueStat.objects.filter(project_id__in=list(projects)))
+    names = _assignee_names({row[3] for row in rows})
+    per_project = defaultdict(list)
+    for row in rows:
+        per_project[row[0]].append(row[1:])
+    data = summarize([row[1:] for row in rows], names)
+    data['projects'] = []
+    for project_id, project_name in projects.items():
+        summary = summarize(per_project.get(project_id, []), names)
+        del summary['by_assignee']
+        data['projects'].append({'project': project_id, 'project_name': project_name, **summary})
+    return data
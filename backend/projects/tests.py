@@ -136,6 +136,17 @@ class TestProjectEndpoints:
         assert len(response.data) == 1
         assert response.data[0]['status'] == 'open'
 
+    def test_project_issue_count(self, authenticated_client, project):
+        """
+        Test that issue_count reflects issues created through the API.
+        """
+        api_client, user = authenticated_client
+        for title in ('Issue 1', 'Issue 2'):
+            api_client.post('/api/issues/', {'title': title, 'description': 'Desc', 'project': project.id})
+        response = api_client.get(f'/api/projects/{project.id}/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['issue_count'] == 2
+
     def test_create_project_unauthenticated(self, api_client):
         """
         Test creating a project without authentication.
@@ -146,3 +157,121 @@ class TestProjectEndpoints:
         }
         response = api_client.post('/api/projects/', data)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestProjectStats:
+    """
+    Test the materialized per-project issue statistics.
+    """
+
+    def stored(self):
+        from .models import ProjectIssueStat
+        return sorted(
+            ProjectIssueStat.objects.filter(count__gt=0).values_list('project_id', 'status', 'priority', 'assignee', 'count')
+        )
+
+    def assert_consistent(self):
+        from .stats import rebuild_project_stats
+        before = self.stored()
+        assert rebuild_project_stats() == 0
+        assert self.stored() == before
+
+    def test_stats_follow_issue_writes(self, authenticated_client, project, user, another_user):
+        """
+        Test that creates, status changes, assignment, moves, deletes and bulk writes keep the buckets exact.
+        """
+        from issues.models import Issue
+        api_client, _ = authenticated_client
+        other = Project.objects.create(name='Other', description='', created_by=user)
+        for title in ('One', 'Two', 'Three'):
+            api_client.post('/api/issues/', {'title': title, 'description': 'Desc', 'project': project.id})
+        first, second, third = Issue.objects.filter(project=project).order_by('id')
+        api_client.patch(f'/api/issues/{first.id}/update_status/', {'status': 'closed'}, format='json')
+        api_client.patch(f'/api/issues/{second.id}/assign/', {'assignee_id': another_user.id}, format='json')
+        api_client.patch(f'/api/issues/{third.id}/', {'project': other.id, 'priority': 'high'}, format='json')
+        self.assert_consistent()
+
+        payload = {
+            'create': [{'title': 'Bulk', 'description': 'Desc', 'project': other.id, 'assignee': user.id}],
+            'update': [{'id': second.id, 'priority': 'critical', 'project': other.id}],
+            'delete': [first.id],
+        }
+        assert api_client.post('/api/issues/bulk/', payload, format='json').status_code == status.HTTP_200_OK
+        self.assert_consistent()
+
+        response = api_client.get(f'/api/projects/{other.id}/stats/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total'] == 3
+        assert response.data['by_status'] == {'open': 3, 'in_progress': 0, 'closed': 0}
+        assert response.data['by_priority'] == {'low': 0, 'medium': 1, 'high': 1, 'critical': 1}
+        assert response.data['by_assignee'] == [
+            {'assignee': None, 'assignee_name': None, 'count': 1},
+            {'assignee': user.id, 'assignee_name': 'Test User', 'count': 1},
+            {'assignee': another_user.id, 'assignee_name': another_user.get_full_name(), 'count': 1},
+        ]
+
+        api_client.delete(f'/api/issues/{third.id}/')
+        another_user.delete()
+        self.assert_consistent()
+        project.delete()
+        self.assert_consistent()
+
+    def test_all_project_stats(self, authenticated_client, project, user):
+        """
+        Test the cross-project totals and per-project breakdowns.
+        """
+        from issues.models import Issue
+        api_client, _ = authenticated_client
+        other = Project.objects.create(name='Other', description='', created_by=user)
+        Issue.objects.create(title='A', description='', project=project, reporter=user, status='in_progress')
+        Issue.objects.create(title='B', description='', project=other, reporter=user, assignee=user)
+        response = api_client.get('/api/projects/stats/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total'] == 2
+        assert response.data['by_status']['in_progress'] == 1
+        assert [(row['project_name'], row['total']) for row in response.data['projects']] == [
+            ('Other', 1), ('Test Project', 1),
+        ]
+        assert 'by_assignee' not in response.data['projects'][0]
+        assert api_client.get('/api/projects/999999/stats/').status_code == status.HTTP_404_NOT_FOUND
+
+    def test_stats_read_does_not_scale_with_issues(self, authenticated_client, project, user, another_user):
+        """
+        Test that reading statistics costs the same number of queries for 5 or 200 issues.
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from issues.models import Issue
+        api_client, _ = authenticated_client
+
+        def measure(count):
+            Issue.objects.bulk_create([
+                Issue(title=f'Issue {index}', description='', project=project, reporter=user,
+                      assignee=(user, another_user, None)[index % 3], status=('open', 'closed')[index % 2])
+                for index in range(count)
+            ])
+            from .stats import rebuild_project_stats
+            rebuild_project_stats()
+            with CaptureQueriesContext(connection) as captured:
+                response = api_client.get(f'/api/projects/{project.id}/stats/')
+            assert response.data['total'] == Issue.objects.filter(project=project).count()
+            return len(captured)
+
+        assert measure(5) == measure(195)
+
+    def test_rebuild_command_repairs_drift(self, project, user):
+        """
+        Test that rebuild_project_stats reports and fixes out-of-date buckets.
+        """
+        from io import StringIO
+        from django.core.management import call_command
+        from issues.models import Issue
+        from .models import ProjectIssueStat
+        Issue.objects.create(title='A', description='', project=project, reporter=user)
+        ProjectIssueStat.objects.filter(project=project).update(count=7)
+        ProjectIssueStat.objects.create(project=project, status='closed', priority='low', assignee=user.id, count=2)
+        out = StringIO()
+        call_command('rebuild_project_stats', project_ids=[project.id], stdout=out)
+        assert '2 buckets were out of date' in out.getvalue()
+        assert self.stored() == [(project.id, 'open', 'medium', 0, 1)]
@@ -1,28 +1,79 @@
 """
 Views for projects app.
 """
+from django.conf import settings
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from django.db.models import Prefetch
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from activity.models import Activity
+from activity.serializers import ActivitySerializer
+from bug_tracking.pagination import IdKeysetPagination, KeysetPagination
+from bug_tracking.renderers import CSVRenderer, EventStreamRenderer, NDJSONRenderer
+from bug_tracking.sparse import SparseFieldsMixin, restrict_fields
+from bug_tracking.streaming import StreamingListMixin, streaming_http_response
+from bug_tracking.values import ValuesReadMixin
+from caching.conditional import ConditionalRequestMixin
+from caching.mixins import CachedResponseMixin
+from caching.store import USERS_SCOPE, project_scope
+from events.broker import project_topic
+from events.stream import event_stream_response
+from issues.analytics import parse_window, project_analytics
+from issues.export import IssueExport, parse_export_filters
+from issues.importer import IMPORT_FORMATS, IssueImporter, guess_format
+from issues.includes import IssueIncludes
+from issues.models import Issue
+from search.backends import annotate_search_rows, search_issues
 from .models import Project
-from .serializers import ProjectSerializer
+from .stats import all_project_stats, project_stats
+from .serializers import ProjectSerializer, ProjectValuesSerializer
 
+# Rejected records listed in an import response; the totals count all of them.
+MAX_REPORTED_REJECTS = 100
 
-class ProjectViewSet(viewsets.ModelViewSet):
+
+class ProjectViewSet(
+    ConditionalRequestMixin, StreamingListMixin, CachedResponseMixin, SparseFieldsMixin, ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet for Project model.
     Provides CRUD operations for projects.
     """
     serializer_class = ProjectSerializer
+    values_serializer_class = ProjectValuesSerializer
     permission_classes = [IsAuthenticated]
+    conditional_timestamp_fields = ('updated_at', 'created_by__updated_at')
+    conditional_counter_fields = ('issue_count',)
 
     def get_queryset(self):
         """
-        Optimize queries using select_related and prefetch_related.
+        Optimize queries using select_related.
+        """
+        return Project.objects.select_related('created_by')
+
+    def get_cache_scopes(self):
+        """
+        Key a project's issue list on that project's version only.
+        """
+        if self.action == 'issues':
+            return [project_scope(self.kwargs['pk']), USERS_SCOPE]
+        if self.action == 'analytics':
+            return [project_scope(self.kwargs['pk'])]
+        return super().get_cache_scopes()
+
+    def get_conditional_queryset(self):
+        """
+        Validate a project's issue list against the project's cache scope.
+
+        Search results also depend on comment text, so searches are not validated.
         """
-        return Project.objects.select_related('created_by').prefetch_related('issues')
+        if self.action == 'issues':
+            if self.request.query_params.get('search'):
+                return None
+            return Issue.objects.filter(project_id=self.kwargs['pk'])
+        return super().get_conditional_queryset()
 
     def perform_create(self, serializer):
         """
@@ -30,11 +81,142 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
         serializer.save(created_by=self.request.user)
 
+    @action(detail=True, methods=['get'], renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request, pk=None):
+        """
+        Stream the project's issues as CSV, or NDJSON with ``?format=ndjson``.
+
+        Filters: ``status``, ``priority``, ``created_after`` and ``created_before``
+        (ISO dates or datetimes); ``comments=1`` adds each issue's comments.
+        """
+        project = self.get_object()
+        try:
+            filters = parse_export_filters(request.query_params)
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        export = IssueExport(
+            project.id, filters, include_comments=request.query_params.get('comments') in ('1', 'true')
+        )
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        export_format = renderer.format
+        response = streaming_http_response(export.stream(export_format), request, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="project-{project.id}-issues.{export_format}"'
+        return response
+
+    @action(
+        detail=True, methods=['post'], url_path='import', url_name='import',
+        permission_classes=[IsAdminUser], parser_classes=[MultiPartParser],
+    )
+    def import_issues(self, request, pk=None):
+        """
+        Import an uploaded CSV or NDJSON ``file`` of issues into this project.
+
+        Staff only, since records name their reporters and comment authors.
+        The form may set ``format`` (guessed from the file name otherwise) and
+        ``offset`` to skip already imported records. The response reports the
+        totals and the first rejected records.
+        """
+        project = self.get_object()
+        upload = request.data.get('file')
+        if upload is None or isinstance(upload, str):
+            return Response({'error': 'Upload the records as a file field named file.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        import_format = request.data.get('format') or guess_format(upload.name)
+        try:
+            offset = int(request.data.get('offset') or 0)
+        except ValueError:
+            offset = -1
+        if import_format not in IMPORT_FORMATS or offset < 0:
+            return Response({'error': 'format must be csv or ndjson and offset a non-negative integer.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        rejects = []
+
+        def reject(position, errors, record):
+            if len(rejects) < MAX_REPORTED_REJECTS:
+                rejects.append({'offset': position, 'errors': errors})
+
+        importer = IssueImporter(
+            project_id=project.id, reporter_id=request.user.id, lock_project=True, on_reject=reject
+        )
+        stats = importer.run(upload, import_format, offset=offset)
+        return Response({**stats.as_dict(), 'rejects': rejects})
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """
+        Issue counts by status, priority and assignee for one project.
+
+        Read from the incrementally maintained ``ProjectIssueStat`` buckets,
+        so the cost does not grow with the number of issues.
+        """
+        project = self.get_object()
+        return Response(project_stats(project.id))
+
+    @action(detail=False, methods=['get'], url_path='stats', url_name='all-stats')
+    def all_stats(self, request):
+        """
+        Issue counts across all projects, with a status and priority breakdown per project.
+        """
+        projects = dict(self.filter_queryset(self.get_queryset()).order_by('name', 'id').values_list('id', 'name'))
+        return Response(all_project_stats(projects))
+
+    @action(detail=True, methods=['get'])
+    def analytics(self, request, pk=None):
+        """
+        Lead time, cycle time and time-in-status of issues closed between ``start`` and ``end``.
+
+        Windows default to the last 30 days. Results are cached per window
+        until the project's issues change.
+        """
+        project = self.get_object()
+        try:
+            start, end = parse_window(request.query_params)
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return self.cached_response(lambda request: Response(project_analytics(project.id, start, end)), request)
+
+    @action(detail=True, methods=['get'])
+    def activity(self, request, pk=None):
+        """
+        The project's activity feed, newest first, in keyset pages.
+
+        Follow ``next`` links; each page is an index range scan on
+        ``(project, id)`` however deep it is.
+        """
+        project = self.get_object()
+        paginator = IdKeysetPagination()
+        page = paginator.paginate_queryset(Activity.objects.filter(project_id=project.id), request, view=self)
+        return paginator.get_paginated_response(ActivitySerializer(page, many=True).data)
+
+    @action(detail=True, methods=['get'], renderer_classes=[EventStreamRenderer])
+    def events(self, request, pk=None):
+        """
+        Stream created/updated/deleted events for the project's issues and comments as Server-Sent Events.
+        """
+        project = self.get_object()
+        return event_stream_response([project_topic(project.pk)], request)
+
     @action(detail=True, methods=['get'])
     def issues(self, request, pk=None):
         """
         Get all issues for a specific project.
+
+        Unpaginated unless the client passes ``cursor`` for keyset pages;
+        ``stream=1`` streams the whole list instead of building it in memory.
+        ``search`` keeps only the ``SEARCH_RESULT_LIMIT`` best-ranked matches.
         """
+        return self.conditional_response(self.cached_project_issues, request, pk=pk)
+
+    def cached_project_issues(self, request, pk=None):
+        if self.is_streaming_requested():
+            return self.list_project_issues(request, pk=pk)
+        return self.cached_response(self.list_project_issues, request, pk=pk)
+
+    def list_project_issues(self, request, pk=None):
         project = self.get_object()
         issues = project.issues.all()
         
@@ -47,12 +229,62 @@ class ProjectViewSet(viewsets.ModelViewSet):
             issues = issues.filter(status=status_filter)
         if priority_filter:
             issues = issues.filter(priority=priority_filter)
+        hits = None
         if search:
-            issues = issues.filter(title__icontains=search) | issues.filter(description__icontains=search)
+            hits = search_issues(search, project_id=project.id)
+            issues = issues.filter(pk__in=[hit.issue_id for hit in hits])
 
         # Optimize queries
-        issues = issues.select_related('reporter', 'assignee').prefetch_related('comments')
+        issues = issues.select_related('project', 'reporter', 'assignee')
+
+        from issues.serializers import IssueSerializer, IssueValuesSerializer
+        fields = self.parse_sparse_fields(IssueSerializer)
+        if fields is not None and hits is not None and 'id' not in fields:
+            # Search annotations are matched to rows by id.
+            fields = ['id'] + fields
+        includes = IssueIncludes.from_request(request)
+        if fields is not None and includes is not None:
+            fields = fields + [name for name in includes.required_fields() if name not in fields]
+        values_serializer = IssueValuesSerializer(fields=fields)
+        if fields is not None:
+            issues = self.narrow_queryset(issues, values_serializer)
+
+        paginator = KeysetPagination()
+        if hits is None and not paginator.is_requested(request) and self.is_streaming_requested():
+            if settings.FAST_READ_SERIALIZATION:
+                return self.streaming_response(issues, values_serializer=values_serializer)
+            serializer = IssueSerializer()
+            if fields is not None:
+                restrict_fields(serializer, fields)
+            return self.streaming_response(issues, serializer=serializer)
+
+        if settings.FAST_READ_SERIALIZATION:
+            issues = values_serializer.prepare(issues)
+            serialize = values_serializer.serialize
+        else:
+            def serialize(rows):
+                serializer = IssueSerializer(rows, many=True)
+                if fields is not None:
+                    restrict_fields(serializer, fields)
+                return serializer.data
+
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(issues, request, view=self)
+            data = serialize(page)
+            if hits is not None:
+                annotate_search_rows(data, hits)
+            response = paginator.get_paginated_response(data)
+            if includes is not None:
+                response.data['included'] = includes.build(data)
+            return response
 
-        from issues.serializers import IssueSerializer
-        serializer = IssueSerializer(issues, many=True)
-        return Response(serializer.data)
+        if hits is not None:
+            # Search results are returned in relevance order.
+            position = {hit.issue_id: index for index, hit in enumerate(hits)}
+            issues = sorted(issues, key=lambda issue: position[issue.id])
+        data = serialize(issues)
+        if hits is not None:
+            annotate_search_rows(data, hits)
+        if includes is not None:
+            return Response({'results': data, 'included': includes.build(data)})
+        return Response(data)
@@ -0,0 +1,54 @@
+"""
+Pluggable full-text search backends for issues.
+
+``SEARCH_BACKEND`` may name a backend class by dotted path; when empty the
+backend is chosen from the database vendor.
+"""
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+from .base import BaseSearchBackend, SearchHit  # noqa: F401
+
+VENDOR_BACKENDS = {
+    'postgresql': 'search.backends.postgres.PostgresSearchBackend',
+    'sqlite': 'search.backends.sqlite.SqliteSearchBackend',
+}
+DEFAULT_BACKEND = 'search.backends.database.DatabaseSearchBackend'
+
+
+def get_backend_class(conn=None):
+    """
+    Resolve the configured backend class for a database connection.
+    """
+    conn = conn or connection
+    path = getattr(settings, 'SEARCH_BACKEND', '') or VENDOR_BACKENDS.get(conn.vendor, DEFAULT_BACKEND)
+    return import_string(path)
+
+
+def get_search_backend(conn=None):
+    """
+    Return a search backend instance bound to a database connection.
+    """
+    conn = conn or connection
+    return get_backend_class(conn)(conn)
+
+
+def search_issues(query, project_id=None, limit=None):
+    """
+    Run a ranked search with the configured backend.
+    """
+    if limit is None:
+        limit = settings.SEARCH_RESULT_LIMIT
+    return get_search_backend().search(query, project_id=project_id, limit=limit)
+
+
+def annotate_search_rows(rows, hits):
+    """
+    Attach rank and snippet from search hits to serialized issue rows.
+    """
+    hit_map = {hit.issue_id: hit for hit in hits}
+    for row in rows:
+        hit = hit_map.get(row['id'])
+        row['search_rank'] = hit.rank if hit else None
+        row['search_snippet'] = hit.snippet if hit else ''
+    return rows
@@ -0,0 +1,94 @@
+"""
+Base class for issue search backends.
+"""
+import re
+from collections import namedtuple
+
+SearchHit = namedtuple('SearchHit', ['issue_id', 'rank', 'snippet'])
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class BaseSearchBackend:
+    """
+    Index issue titles, descriptions and comment contents for ranked search.
+
+    Subclasses implement storage and querying; loading the documents to index
+    is shared so every backend sees the same text.
+    """
+    highlight_start = '<mark>'
+    highlight_stop = '</mark>'
+    max_terms = 16
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install(self, schema_editor):
+        """
+        Create backend-specific index structures.
+        """
+
+    def uninstall(self, schema_editor):
+        """
+        Drop backend-specific index structures.
+        """
+
+    def tokenize(self, query):
+        """
+        Split user input into plain search terms, dropping query syntax.
+        """
+        return TOKEN_RE.findall(query.lower())[:self.max_terms]
+
+    def load_documents(self, issue_ids):
+        """
+        Return (issue_id, project_id, title, description, comments) tuples.
+        """
+        from comments.models import Comment
+        from issues.models import Issue
+        comments = {}
+        rows = (
+            Comment.objects.filter(issue_id__in=issue_ids)
+            .order_by('issue_id', 'id')
+            .values_list('issue_id', 'content')
+        )
+        for issue_id, content in rows:
+            comments.setdefault(issue_id, []).append(content)
+        issues = (
+            Issue.objects.filter(pk__in=issue_ids)
+            .order_by()
+            .values_list('id', 'project_id', 'title', 'description')
+        )
+        return [
+            (pk, project_id, title, description, '\n'.join(comments.get(pk, ())))
+            for pk, project_id, title, description in issues
+        ]
+
+    def index_issues(self, issue_ids):
+        """
+        Add or refresh the index entries for the given issues.
+        """
+        issue_ids = list(issue_ids)
+        if not issue_ids:
+            return
+        documents = self.load_documents(issue_ids)
+        found = {document[0] for document in documents}
+        missing = [pk for pk in issue_ids if pk not in found]
+        if missing:
+            self.remove_issues(missing)
+        if documents:
+            self.write_documents(documents)
+
+    def write_documents(self, documents):
+        raise NotImplementedError
+
+    def remove_issues(self, issue_ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, query, project_id=None, limit=100):
+        """
+        Return SearchHit tuples ordered by descending relevance.
+        """
+        raise NotImplementedError
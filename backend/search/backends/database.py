@@ -0,0 +1,58 @@
+"""
+Portable fallback search backend for databases without full-text support.
+"""
+from django.db.models import Q
+from .base import BaseSearchBackend, SearchHit
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Match terms with ``icontains`` against the live tables; keeps no index.
+    """
+    snippet_chars = 60
+
+    def write_documents(self, documents):
+        pass
+
+    def index_issues(self, issue_ids):
+        pass
+
+    def remove_issues(self, issue_ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def highlight(self, text, terms):
+        """
+        Cut a window of text around the first matching term and mark it.
+        """
+        lowered = text.lower()
+        for term in terms:
+            start = lowered.find(term)
+            if start != -1:
+                left = max(start - self.snippet_chars // 2, 0)
+                end = start + len(term)
+                return (
+                    text[left:start] + self.highlight_start + text[start:end]
+                    + self.highlight_stop + text[end:end + self.snippet_chars // 2]
+                )
+        return text[:self.snippet_chars]
+
+    def search(self, query, project_id=None, limit=100):
+        from issues.models import Issue
+        terms = self.tokenize(query)
+        if not terms:
+            return []
+        issues = Issue.objects.all()
+        if project_id is not None:
+            issues = issues.filter(project_id=project_id)
+        for term in terms:
+            issues = issues.filter(
+                Q(title__icontains=term) | Q(description__icontains=term) | Q(comments__content__icontains=term)
+            )
+        rows = issues.distinct().values_list('id', 'title', 'description')[:limit]
+        return [
+            SearchHit(pk, 0.0, self.highlight(f'{title} {description}', terms))
+            for pk, title, description in rows
+        ]
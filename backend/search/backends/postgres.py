@@ -0,0 +1,88 @@
+"""
+PostgreSQL tsvector search backend.
+"""
+from .base import BaseSearchBackend, SearchHit
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Store weighted tsvector documents in a side table with a GIN index.
+
+    Ranking uses ``ts_rank_cd`` and only the top rows are passed to
+    ``ts_headline``, which is the expensive part of a search.
+    """
+    table = 'search_issue_document'
+    config = 'english'
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} ('
+            'issue_id bigint PRIMARY KEY REFERENCES issues_issue (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'project_id bigint NOT NULL, '
+            'title text NOT NULL, '
+            'description text NOT NULL, '
+            'comments text NOT NULL, '
+            'document tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {self.table}_document_gin ON {self.table} USING gin (document)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {self.table}_project ON {self.table} (project_id)'
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def write_documents(self, documents):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (issue_id, project_id, title, description, comments, document) '
+                'VALUES (%s, %s, %s, %s, %s, '
+                f"setweight(to_tsvector('{self.config}', %s), 'A') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'B') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'C')) "
+                'ON CONFLICT (issue_id) DO UPDATE SET project_id = EXCLUDED.project_id, '
+                'title = EXCLUDED.title, description = EXCLUDED.description, '
+                'comments = EXCLUDED.comments, document = EXCLUDED.document',
+                [document + document[2:] for document in documents],
+            )
+
+    def remove_issues(self, issue_ids):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE issue_id = ANY(%s)', [list(issue_ids)])
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {self.table}')
+
+    def build_tsquery(self, query):
+        """
+        Turn search terms into a prefix tsquery with AND semantics.
+        """
+        return ' & '.join(f'{term}:*' for term in self.tokenize(query))
+
+    def search(self, query, project_id=None, limit=100):
+        tsquery = self.build_tsquery(query)
+        if not tsquery:
+            return []
+        where = ''
+        params = [tsquery]
+        if project_id is not None:
+            where = 'AND d.project_id = %s'
+            params.append(int(project_id))
+        params.append(limit)
+        options = f'StartSel={self.highlight_start}, StopSel={self.highlight_stop}, MaxFragments=2'
+        sql = (
+            'SELECT top.issue_id, top.rank, '
+            f"ts_headline('{self.config}', top.title || ' ' || top.description || ' ' || top.comments, top.q, %s) "
+            'FROM ('
+            '  SELECT d.issue_id, d.title, d.description, d.comments, q, ts_rank_cd(d.document, q) AS rank '
+            f"  FROM {self.table} d, to_tsquery('{self.config}', %s) q "
+            f'  WHERE d.document @@ q {where} '
+            '  ORDER BY rank DESC LIMIT %s'
+            ') top ORDER BY top.rank DESC'
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [options] + params)
+            return [SearchHit(pk, float(rank), snippet) for pk, rank, snippet in cursor.fetchall()]
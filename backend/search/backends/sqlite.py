@@ -0,0 +1,76 @@
+"""
+SQLite FTS5 search backend.
+"""
+from .base import BaseSearchBackend, SearchHit
+
+
+class SqliteSearchBackend(BaseSearchBackend):
+    """
+    Store issue documents in an FTS5 virtual table keyed by issue id.
+
+    Results are ranked with bm25, weighting title over description over
+    comments, and highlighted with FTS5's ``snippet()``.
+    """
+    table = 'search_issue_fts'
+    weights = (10.0, 4.0, 1.0)
+    snippet_tokens = 16
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5('
+            'title, description, comments, project_id UNINDEXED, '
+            "tokenize = 'porter unicode61')"
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def write_documents(self, documents):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [(document[0],) for document in documents],
+            )
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, project_id, title, description, comments) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                documents,
+            )
+
+    def remove_issues(self, issue_ids):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [(pk,) for pk in issue_ids],
+            )
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+
+    def build_match(self, query):
+        """
+        Turn search terms into an FTS5 prefix query with implicit AND.
+        """
+        return ' '.join(f'"{term}"*' for term in self.tokenize(query))
+
+    def search(self, query, project_id=None, limit=100):
+        match = self.build_match(query)
+        if not match:
+            return []
+        weights = ', '.join(str(weight) for weight in self.weights)
+        sql = (
+            f'SELECT rowid, bm25({self.table}, {weights}) AS score, '
+            f'snippet({self.table}, -1, %s, %s, %s, %s) '
+            f'FROM {self.table} WHERE {self.table} MATCH %s'
+        )
+        params = [self.highlight_start, self.highlight_stop, '…', self.snippet_tokens, match]
+        if project_id is not None:
+            sql += ' AND project_id = %s'
+            params.append(int(project_id))
+        sql += ' ORDER BY score LIMIT %s'
+        params.append(limit)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            # bm25 scores are negative, lower is better; flip them for callers.
+            return [SearchHit(pk, -score, snippet) for pk, score, snippet in cursor.fetchall()]
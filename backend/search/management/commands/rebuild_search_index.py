@@ -0,0 +1,55 @@
+"""
+Rebuild the issue full-text search index in bulk.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from issues.models import Issue
+from search.backends import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    Clear and repopulate the search index from issues and comments.
+    """
+    help = 'Rebuild the full-text search index for issues and comments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of issues indexed per batch.',
+        )
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='project_ids',
+            help='Only reindex issues of this project id (repeatable).',
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        batch_size = options['batch_size']
+        issues = Issue.objects.order_by('pk')
+        if options['project_ids']:
+            issues = issues.filter(project_id__in=options['project_ids'])
+        else:
+            backend.clear()
+
+        total = 0
+        batch = []
+        for pk in issues.values_list('pk', flat=True).iterator(chunk_size=batch_size):
+            batch.append(pk)
+            if len(batch) >= batch_size:
+                total += self.index_batch(backend, batch)
+                batch = []
+        if batch:
+            total += self.index_batch(backend, batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} issues with {backend.__class__.__name__}.'))
+
+    def index_batch(self, backend, issue_ids):
+        with transaction.atomic():
+            backend.index_issues(issue_ids)
+        return len(issue_ids)
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from search.backends import get_search_backend
+    get_search_backend(schema_editor.connection).install(schema_editor)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from search.backends import get_search_backend
+    get_search_backend(schema_editor.connection).uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('issues', '0004_alter_issue_options_and_more'),
+        ('comments', '0003_alter_comment_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,79 @@
+"""
+Signal handlers that keep the search index in step with issues and comments.
+"""
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from comments.models import Comment
+from issues.models import Issue
+from issues.signals import TEXT_FIELDS, is_bulk_deleting, issues_bulk_written
+from projects.models import Project
+from .backends import get_search_backend
+
+
+@receiver(post_save, sender=Issue)
+def index_saved_issue(sender, instance, created, raw=False, **kwargs):
+    """
+    Reindex an issue after it is created or its indexed text or project changes.
+    """
+    if raw:
+        return
+    changed = any(
+        instance.get_loaded_value(name) != getattr(instance, name)
+        for name in TEXT_FIELDS
+    )
+    if created or changed:
+        get_search_backend().index_issues([instance.pk])
+
+
+@receiver(post_delete, sender=Issue)
+def unindex_deleted_issue(sender, instance, **kwargs):
+    """
+    Drop a deleted issue from the index.
+    """
+    if is_bulk_deleting():
+        return
+    get_search_backend().remove_issues([instance.pk])
+
+
+@receiver(issues_bulk_written)
+def index_bulk_written_issues(sender, created, updated, deleted=(), **kwargs):
+    """
+    Reindex a batch of created or edited issues, and drop its deleted ones, at once.
+    """
+    if deleted:
+        get_search_backend().remove_issues([issue.pk for issue in deleted])
+    issue_ids = [issue.pk for issue in created] + [
+        issue.pk for issue, changes in updated if any(name in changes for name in TEXT_FIELDS)
+    ]
+    if issue_ids:
+        get_search_backend().index_issues(issue_ids)
+
+
+@receiver(post_save, sender=Comment)
+def index_commented_issue(sender, instance, created, raw=False, **kwargs):
+    """
+    Reindex the issue a comment belongs to, and the one it moved from, when its content or issue changes.
+    """
+    if raw:
+        return
+    changed = any(
+        instance.get_loaded_value(name) != getattr(instance, name)
+        for name in Comment.TRACKED_FIELDS
+    )
+    if not (created or changed):
+        return
+    issue_ids = {instance.issue_id, instance.get_loaded_value('issue_id')}
+    get_search_backend().index_issues(issue_ids - {None})
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_deleted_comment(sender, instance, origin=None, **kwargs):
+    """
+    Reindex an issue after one of its comments is deleted on its own.
+    """
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if isinstance(origin, (Issue, Project)) or origin in (Issue, Project):
+        return
+    get_search_backend().index_issues([instance.issue_id])
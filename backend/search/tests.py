@@ -0,0 +1,161 @@
+"""
+Tests for search app.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+from comments.models import Comment
+from issues.models import Issue
+from projects.models import Project
+from .backends import get_search_backend
+
+
+@pytest.mark.django_db
+class TestSearchIndex:
+    """
+    Test incremental indexing and ranked search.
+    """
+
+    @pytest.fixture
+    def issues(self, project, user):
+        """
+        Create a few issues with distinct vocabulary.
+        """
+        crash = Issue.objects.create(
+            title='Crash on login', description='The app crashes after submitting credentials.',
+            project=project, reporter=user,
+        )
+        slow = Issue.objects.create(
+            title='Slow dashboard', description='Rendering the dashboard takes ages.',
+            project=project, reporter=user,
+        )
+        return crash, slow
+
+    def _ids(self, query, **kwargs):
+        return [hit.issue_id for hit in get_search_backend().search(query, **kwargs)]
+
+    def test_index_follows_issue_writes(self, issues):
+        """
+        Test that creates, edits and deletes are reflected in results.
+        """
+        crash, slow = issues
+        assert self._ids('crash') == [crash.id]
+
+        slow.title = 'Crash when dashboard loads'
+        slow.save()
+        assert set(self._ids('crash')) == {crash.id, slow.id}
+
+        crash.delete()
+        assert self._ids('crash') == [slow.id]
+
+    def test_untracked_edits_skip_reindex(self, issues, monkeypatch):
+        """
+        Test that issue and comment saves leaving the indexed text alone are not reindexed.
+        """
+        from .backends import get_backend_class
+        crash, _ = issues
+        indexed = []
+        monkeypatch.setattr(get_backend_class(), 'index_issues', lambda backend, issue_ids: indexed.append(issue_ids))
+        crash.status = 'in_progress'
+        crash.save()
+        assert indexed == []
+        crash.description = 'It crashes on logout too.'
+        crash.save()
+        assert indexed == [[crash.id]]
+
+        comment = Comment.objects.create(content='Seen on logout', issue=crash, author=crash.reporter)
+        indexed.clear()
+        comment.save()
+        assert indexed == []
+        comment.content = 'Seen on logout and login'
+        comment.save()
+        assert indexed == [{crash.id}]
+
+    def test_comments_are_indexed(self, issues, user):
+        """
+        Test that comment content is searchable and removed with the comment.
+        """
+        crash, slow = issues
+        comment = Comment.objects.create(content='Reproduced with a stacktrace', issue=slow, author=user)
+        assert self._ids('stacktrace') == [slow.id]
+        comment.delete()
+        assert self._ids('stacktrace') == []
+
+    def test_ranking_prefers_title_and_highlights(self, issues, project, user):
+        """
+        Test that title matches rank first and snippets mark the match.
+        """
+        crash, _ = issues
+        mention = Issue.objects.create(
+            title='Profile page', description='Unrelated, but it mentioned a crash once.',
+            project=project, reporter=user,
+        )
+        hits = get_search_backend().search('crash')
+        assert [hit.issue_id for hit in hits] == [crash.id, mention.id]
+        assert '<mark>' in hits[0].snippet
+
+    def test_prefix_and_project_filter(self, issues, user):
+        """
+        Test prefix matching and restricting results to a project.
+        """
+        crash, _ = issues
+        other = Project.objects.create(name='Other', description='Other project', created_by=user)
+        Issue.objects.create(title='Crash elsewhere', description='Desc', project=other, reporter=user)
+        assert self._ids('cra', project_id=crash.project_id) == [crash.id]
+
+    def test_query_syntax_is_ignored(self, issues):
+        """
+        Test that quotes and operators in user input cannot break the query.
+        """
+        assert self._ids('"crash" (login* -') == [issues[0].id]
+        assert self._ids('***') == []
+
+    def test_rebuild_search_index_command(self, issues):
+        """
+        Test that the rebuild command repopulates a cleared index.
+        """
+        backend = get_search_backend()
+        backend.clear()
+        assert self._ids('dashboard') == []
+        call_command('rebuild_search_index', batch_size=1, stdout=StringIO())
+        assert self._ids('dashboard') == [issues[1].id]
+
+    def test_search_endpoint(self, authenticated_client, issues):
+        """
+        Test the ranked issue search endpoint.
+        """
+        api_client, _ = authenticated_client
+        response = api_client.get('/api/issues/search/', {'q': 'dashboard'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['id'] for row in response.data] == [issues[1].id]
+        assert '<mark>' in response.data[0]['search_snippet']
+
+        response = api_client.get('/api/issues/search/')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_project_issues_search(self, authenticated_client, issues, project):
+        """
+        Test that the project issues search uses the index.
+        """
+        api_client, _ = authenticated_client
+        response = api_client.get(f'/api/projects/{project.id}/issues/', {'search': 'credentials'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['id'] for row in response.data] == [issues[0].id]
+
+    def test_project_issues_search_is_capped(self, authenticated_client, issues, project, settings):
+        """
+        Test that a project search keeps only the SEARCH_RESULT_LIMIT best-ranked matches.
+        """
+        api_client, _ = authenticated_client
+        settings.RESPONSE_CACHE_ENABLED = False
+        crash, slow = issues
+        slow.description = 'The dashboard crashes now and then.'
+        slow.save()
+        response = api_client.get(f'/api/projects/{project.id}/issues/', {'search': 'crash'})
+        assert [row['id'] for row in response.data] == [crash.id, slow.id]
+
+        settings.SEARCH_RESULT_LIMIT = 1
+        response = api_client.get(f'/api/projects/{project.id}/issues/', {'search': 'crash'})
+        assert [row['id'] for row in response.data] == [crash.id]
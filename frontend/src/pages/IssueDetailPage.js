@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { issuesAPI, commentsAPI } from '../services/api';
+import { issuesAPI, commentsAPI, batchAPI, subscribeEvents } from '../services/api';
 import { useAuth } from '../contexts/AuthContext';
 import { toast } from 'react-toastify';
 import { ArrowLeft, MessageSquare, Send } from 'lucide-react';
@@ -16,14 +16,19 @@ const IssueDetailPage = () => {
   const [commentText, setCommentText] = useState('');
   const [submitting, setSubmitting] = useState(false);
 
-  const fetchIssueAndComments = useCallback(async () => {
+  const fetchIssueAndComments = useCallback(async (quiet = false) => {
     try {
-      setLoading(true);
-      const issueRes = await issuesAPI.retrieve(issueId);
-      setIssue(issueRes.data);
-
-      const commentsRes = await commentsAPI.list({ issue_id: issueId });
-      setComments(commentsRes.data);
+      if (!quiet) setLoading(true);
+      const batchRes = await batchAPI.run([
+        { method: 'GET', path: `/api/issues/${issueId}/` },
+        { method: 'GET', path: `/api/comments/?issue_id=${issueId}` },
+      ]);
+      const [issueRes, commentsRes] = batchRes.data.responses;
+      if (issueRes.status !== 200 || commentsRes.status !== 200) {
+        throw new Error('Failed to fetch issue');
+      }
+      setIssue(issueRes.body);
+      setComments(commentsRes.body);
     } catch (error) {
       toast.error('Failed to fetch issue');
       navigate('/dashboard');
@@ -36,6 +41,37 @@ const IssueDetailPage = () => {
     fetchIssueAndComments();
   }, [fetchIssueAndComments]);
 
+  // Apply live changes from other viewers instead of refetching
+  useEffect(() => {
+    const upsert = (list, comment) =>
+      list.some((item) => item.id === comment.id)
+        ? list.map((item) => (item.id === comment.id ? comment : item))
+        : [comment, ...list];
+
+    return subscribeEvents(`/issues/${issueId}/events/`, (event) => {
+      switch (event.type) {
+        case 'issue.updated':
+          setIssue(event.data);
+          break;
+        case 'issue.deleted':
+          toast.info('This issue was deleted');
+          navigate('/dashboard');
+          break;
+        case 'comment.created':
+        case 'comment.updated':
+          setComments((list) => upsert(list, event.data));
+          break;
+        case 'comment.deleted':
+          setComments((list) => list.filter((item) => item.id !== event.comment));
+          break;
+        case 'reset':
+          fetchIssueAndComments(true);
+          break;
+        default:
+      }
+    });
+  }, [issueId, navigate, fetchIssueAndComments]);
+
   const handleStatusChange = async (newStatus) => {
     try {
       const response = await issuesAPI.updateStatus(issueId, newStatus);
@@ -52,10 +88,10 @@ const IssueDetailPage = () => {
 
     try {
       setSubmitting(true);
-      await commentsAPI.createForIssue(issueId, { content: commentText });
+      const response = await commentsAPI.createForIssue(issueId, { content: commentText });
+      setComments((list) => (list.some((item) => item.id === response.data.id) ? list : [response.data, ...list]));
       toast.success('Comment added successfully!');
       setCommentText('');
-      fetchIssueAndComments();
     } catch (error) {
       toast.error('Failed to add comment');
     } finally {
@@ -34,6 +34,25 @@ api.interceptors.response.use(
   }
 );
 
+// Expand a ?format=columnar table (or a page whose results are one) into records
+export const fromColumnar = (data) => {
+  if (data && data.results && data.results.rows) {
+    return { ...data, results: fromColumnar(data.results) };
+  }
+  if (!data || !Array.isArray(data.rows)) {
+    return data;
+  }
+  const { fields, rows, constants, dictionaries } = data;
+  return rows.map((row) => {
+    const record = { ...constants };
+    fields.forEach((name, index) => {
+      const value = row[index];
+      record[name] = dictionaries[name] && value !== null ? dictionaries[name][value] : value;
+    });
+    return record;
+  });
+};
+
 // Auth API calls
 export const authAPI = {
   register: (data) => api.post('/auth/register/', data),
@@ -49,7 +68,10 @@ export const projectsAPI = {
   retrieve: (id) => api.get(`/projects/${id}/`),
   update: (id, data) => api.patch(`/projects/${id}/`, data),
   delete: (id) => api.delete(`/projects/${id}/`),
-  getIssues: (id, params = {}) => api.get(`/projects/${id}/issues/`, { params }),
+  getIssues: (id, params = {}) =>
+    api
+      .get(`/projects/${id}/issues/`, { params: { ...params, format: 'columnar' } })
+      .then((response) => ({ ...response, data: fromColumnar(response.data) })),
 };
 
 // Issues API calls
@@ -78,4 +100,53 @@ export const commentsAPI = {
     api.post(`/comments/create-for-issue/${issueId}/`, data),
 };
 
+// Batch API calls: run several API requests in one round trip
+export const batchAPI = {
+  run: (requests, atomic = false) => api.post('/batch/', { requests, atomic }),
+};
+
+// Live updates: read a Server-Sent Events endpoint with the JWT header
+// (EventSource cannot send one) and call onEvent with each parsed event.
+// Reconnects when the server ends the stream; returns an unsubscribe function.
+export const subscribeEvents = (path, onEvent) => {
+  const controller = new AbortController();
+  let retry = 3000;
+
+  const connect = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const token = localStorage.getItem('access_token');
+        const response = await fetch(`${API_BASE_URL}${path}`, {
+          headers: { Accept: 'text/event-stream', ...(token ? { Authorization: `Bearer ${token}` } : {}) },
+          signal: controller.signal,
+        });
+        if (!response.ok) return;
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          const frames = buffer.split('\n\n');
+          buffer = frames.pop();
+          frames.forEach((frame) => {
+            frame.split('\n').forEach((line) => {
+              if (line.startsWith('data: ')) onEvent(JSON.parse(line.slice(6)));
+              else if (line.startsWith('retry: ')) retry = Number(line.slice(7)) || retry;
+            });
+          });
+        }
+        // Events may have been missed while reconnecting.
+        onEvent({ type: 'reset' });
+      } catch (error) {
+        if (controller.signal.aborted) return;
+      }
+      await new Promise((resolve) => setTimeout(resolve, retry));
+    }
+  };
+
+  connect();
+  return () => controller.abort();
+};
+
 export default api;